@@ -0,0 +1,171 @@
+"""Load test of the webhook with several uvicorn worker counts.
+
+Starts a local Opsgenie API stub, then for each worker count runs the app
+with `uvicorn --workers N` against it and sends unique events from several
+client processes. Throughput should grow close to linearly with workers as
+long as the host has a free core per worker (the stub and the clients need
+cores too).
+
+Run from `src/`:
+
+    python -m benchmarks.load_bench --workers 1 2 4
+
+Use `--state-backend redis` (with `REDIS_URL` pointing at a running Redis,
+e.g. from docker-compose) to include the shared state round trips.
+"""
+import argparse
+import asyncio
+import multiprocessing
+import os
+import statistics
+import subprocess
+import sys
+import time
+import uuid
+from typing import Any
+
+import httpx
+
+from benchmarks.stubs import free_port, opsgenie_response, serve
+
+API_KEY = "load-test-key"
+
+
+def run_opsgenie_stub(port: int) -> None:
+    """Run the Opsgenie API stub until terminated."""
+    asyncio.run(serve(port, opsgenie_response))
+
+
+def make_event(alert_id: str) -> dict[str, Any]:
+    """Build a webhook payload handled by the stub handler."""
+    return {
+        "action": "Create",
+        "integrationId": "load-test",
+        "integrationName": "Load Test",
+        "source": {"name": "load-test", "type": "API"},
+        "alert": {
+            "alertId": alert_id,
+            "message": "Load test alert",
+            "tags": [],
+            "tinyId": "1",
+            "alias": alert_id,
+            "createdAt": 0,
+            "updatedAt": 0,
+            "username": "load-test",
+            "userId": "load-test",
+            "entity": "load-test",
+        },
+    }
+
+
+async def _send(url: str, requests: int, concurrency: int) -> list[float]:
+    """Send unique events with bounded concurrency, returning latencies."""
+    latencies: list[float] = []
+    prefix = uuid.uuid4().hex
+    counter = iter(range(requests))
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+
+    async with httpx.AsyncClient(base_url=url, limits=limits, timeout=30) as client:
+        async def worker() -> None:
+            for i in counter:
+                started = time.perf_counter()
+                response = await client.post(
+                    "/api/v1/webhook",
+                    json=make_event(f"{prefix}-{i}"),
+                    headers={"X-Actions-Auth": API_KEY},
+                )
+                response.raise_for_status()
+                latencies.append(time.perf_counter() - started)
+
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return latencies
+
+
+def run_client(args: tuple[str, int, int]) -> list[float]:
+    """Run one client process."""
+    return asyncio.run(_send(*args))
+
+
+def start_app(port: int, workers: int, opsgenie_url: str, state_backend: str) -> subprocess.Popen[bytes]:
+    """Start the app with uvicorn and wait until it serves requests."""
+    env = {
+        **os.environ,
+        "API_KEY": API_KEY,
+        "OPSGENIE_API_URL": opsgenie_url,
+        "OPSGENIE_NOTE_WINDOW": "0",
+        "RATE_LIMIT": "0",
+        "STATE_BACKEND": state_backend,
+    }
+    process = subprocess.Popen(
+        [
+            sys.executable, "-m", "uvicorn", "main:app",
+            "--port", str(port),
+            "--workers", str(workers),
+            "--log-level", "warning",
+            "--no-access-log",
+        ],
+        env=env,
+        stdout=subprocess.DEVNULL,
+    )
+
+    deadline = time.monotonic() + 30
+    while time.monotonic() < deadline:
+        try:
+            httpx.get(f"http://127.0.0.1:{port}/openapi.json", timeout=1).raise_for_status()
+            return process
+        except httpx.HTTPError:
+            time.sleep(0.2)
+    process.terminate()
+    raise RuntimeError("App did not start")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4], help="Worker counts")
+    parser.add_argument("--requests", type=int, default=5000, help="Requests per run")
+    parser.add_argument("--concurrency", type=int, default=64, help="Requests in flight")
+    parser.add_argument("--clients", type=int, default=2, help="Client processes")
+    parser.add_argument("--state-backend", default="memory", choices=["memory", "redis"])
+    args = parser.parse_args()
+
+    stub_port = free_port()
+    stub = multiprocessing.Process(target=run_opsgenie_stub, args=(stub_port,), daemon=True)
+    stub.start()
+
+    print(f"{os.cpu_count()} CPUs, {args.requests} requests, concurrency {args.concurrency}")
+    print(f"{'workers':>8} {'req/s':>10} {'speedup':>8} {'p50 ms':>8} {'p99 ms':>8}")
+    baseline = None
+    try:
+        for workers in args.workers:
+            port = free_port()
+            app = start_app(port, workers, f"http://127.0.0.1:{stub_port}", args.state_backend)
+            try:
+                client_args = [
+                    (
+                        f"http://127.0.0.1:{port}",
+                        args.requests // args.clients,
+                        max(1, args.concurrency // args.clients),
+                    )
+                    for _ in range(args.clients)
+                ]
+                started = time.perf_counter()
+                with multiprocessing.Pool(args.clients) as pool:
+                    latencies = [lat for part in pool.map(run_client, client_args) for lat in part]
+                elapsed = time.perf_counter() - started
+            finally:
+                app.terminate()
+                app.wait()
+
+            throughput = len(latencies) / elapsed
+            baseline = baseline or throughput
+            quantiles = statistics.quantiles(latencies, n=100)
+            print(
+                f"{workers:>8} {throughput:>10.0f} {throughput / baseline:>8.2f} "
+                f"{quantiles[49] * 1000:>8.1f} {quantiles[98] * 1000:>8.1f}"
+            )
+    finally:
+        stub.terminate()
+
+
+if __name__ == "__main__":
+    main()
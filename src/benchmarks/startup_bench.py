@@ -0,0 +1,206 @@
+"""Benchmark of app startup: import time of `main` and time until ready.
+
+Import time is read from `python -X importtime -c "import main"`, the
+report lists the slowest top level packages and modules. Time to ready is
+measured from starting uvicorn until `/health` answers. Both run in fresh
+processes and the median of `--runs` is reported.
+
+Run from `src/`:
+
+    python -m benchmarks.startup_bench
+    python -m benchmarks.startup_bench --save-baseline   # update startup_baseline.json
+    python -m benchmarks.startup_bench --check           # exit 1 on regression
+
+Baselines are only comparable on the same hardware, regenerate them on the
+CI runner with `--save-baseline`.
+"""
+import argparse
+import json
+import os
+import platform
+import re
+import statistics
+import subprocess
+import sys
+import time
+from collections import defaultdict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+import httpx
+
+from benchmarks.stubs import free_port
+
+HERE = Path(__file__).parent
+SRC = HERE.parent
+BASELINE = HERE / "startup_baseline.json"
+
+# Only imported by the handler needing them, `--check` fails if main loads one
+LAZY_PACKAGES = ("kubernetes", "opsgenie_sdk", "github")
+
+_IMPORT_LINE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \| (\s*)(\S+)$", re.MULTILINE)
+
+
+@dataclass(frozen=True)
+class ImportEntry:
+    """One line of `-X importtime` output."""
+
+    module: str
+    self_us: int
+    cumulative_us: int
+    depth: int
+
+
+def parse_importtime(output: str) -> list[ImportEntry]:
+    """Parse `-X importtime` output.
+
+    Args:
+        output: stderr of the interpreter
+
+    Returns:
+        Imported modules in output order, children before their parent
+    """
+    return [
+        ImportEntry(module, int(self_us), int(cumulative_us), len(indent) // 2)
+        for self_us, cumulative_us, indent, module in _IMPORT_LINE.findall(output)
+    ]
+
+
+def package_totals(entries: list[ImportEntry]) -> dict[str, int]:
+    """Sum own import time by top level package, slowest first.
+
+    Args:
+        entries: Parsed import lines
+
+    Returns:
+        Microseconds by package name
+    """
+    totals: dict[str, int] = defaultdict(int)
+    for entry in entries:
+        totals[entry.module.partition(".")[0]] += entry.self_us
+    return dict(sorted(totals.items(), key=lambda item: item[1], reverse=True))
+
+
+def measure_import(module: str = "main") -> list[ImportEntry]:
+    """Import a module in a fresh interpreter with `-X importtime`."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=SRC,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return parse_importtime(result.stderr)
+
+
+def measure_ready(env: dict[str, str]) -> float:
+    """Start the app with uvicorn and time until `/health` answers.
+
+    Returns:
+        Seconds from process start to the first successful response
+    """
+    port = free_port()
+    started = time.perf_counter()
+    process = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "main:app", "--port", str(port), "--log-level", "warning"],
+        cwd=SRC,
+        env={**os.environ, **env},
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    try:
+        deadline = started + 30
+        while time.perf_counter() < deadline:
+            try:
+                httpx.get(f"http://127.0.0.1:{port}/health", timeout=1).raise_for_status()
+                return time.perf_counter() - started
+            except httpx.HTTPError:
+                time.sleep(0.01)
+        raise RuntimeError("App did not start")
+    finally:
+        process.terminate()
+        process.wait()
+
+
+def find_regressions(result: dict[str, Any], baseline: dict[str, Any], tolerance: float) -> list[str]:
+    """Compare a result with a baseline.
+
+    Args:
+        result: Startup result
+        baseline: Baseline result
+        tolerance: Allowed relative change, e.g. 0.2 for 20%
+
+    Returns:
+        Description of every regression
+    """
+    regressions = [
+        f"{package} is imported at startup"
+        for package in result["lazy_packages_imported"]
+    ]
+    for key in ("import_ms", "ready_ms"):
+        # Absolute slack of 20 ms keeps process start noise from failing the check
+        ceiling = baseline[key] * (1 + tolerance) + 20
+        if result[key] > ceiling:
+            regressions.append(f"{key} {result[key]}, baseline {baseline[key]}")
+    return regressions
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5, help="Processes started per measurement")
+    parser.add_argument("--top", type=int, default=10, help="Packages and modules listed")
+    parser.add_argument("--warm-up", action="store_true", help="Start with WARM_UP_ON_STARTUP=true")
+    parser.add_argument("--baseline", type=Path, default=BASELINE)
+    parser.add_argument("--save-baseline", action="store_true", help="Store results as baseline")
+    parser.add_argument("--check", action="store_true", help="Exit 1 on regression")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="Allowed relative change")
+    args = parser.parse_args()
+
+    imports = sorted(
+        (measure_import() for _ in range(args.runs)),
+        key=lambda entries: entries[-1].cumulative_us,
+    )
+    entries = imports[len(imports) // 2]
+    env = {"API_KEY": "benchmark-key", "WARM_UP_ON_STARTUP": str(args.warm_up).lower()}
+    ready = statistics.median(measure_ready(env) for _ in range(args.runs))
+
+    imported = {entry.module.partition(".")[0] for entry in entries}
+    result = {
+        "import_ms": round(entries[-1].cumulative_us / 1000, 1),
+        "ready_ms": round(ready * 1000, 1),
+        "lazy_packages_imported": sorted(imported & set(LAZY_PACKAGES)),
+        "top_packages_ms": {
+            package: round(us / 1000, 1)
+            for package, us in list(package_totals(entries).items())[:args.top]
+        },
+    }
+
+    print(f"{os.cpu_count()} CPUs, median of {args.runs} runs")
+    print(f"import main: {result['import_ms']:.1f} ms, ready: {result['ready_ms']:.1f} ms")
+    print(f"\n{'package':<24} {'self ms':>8}")
+    for package, ms in result["top_packages_ms"].items():
+        print(f"{package:<24} {ms:>8.1f}")
+    print(f"\n{'module':<48} {'cumulative ms':>14}")
+    slowest = sorted(entries, key=lambda entry: entry.cumulative_us, reverse=True)[:args.top]
+    for entry in slowest:
+        print(f"{'  ' * entry.depth + entry.module:<48} {entry.cumulative_us / 1000:>14.1f}")
+
+    if args.save_baseline:
+        args.baseline.write_text(json.dumps({
+            "host": {"cpus": os.cpu_count(), "python": platform.python_version()},
+            **result,
+        }, indent=2) + "\n")
+        print(f"Baseline saved to {args.baseline}")
+
+    if args.check:
+        regressions = find_regressions(result, json.loads(args.baseline.read_text()), args.tolerance)
+        for regression in regressions:
+            print(f"REGRESSION {regression}")
+        if regressions:
+            sys.exit(1)
+        print("No regressions")
+
+
+if __name__ == "__main__":
+    main()
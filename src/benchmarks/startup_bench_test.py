@@ -0,0 +1,30 @@
+from benchmarks.startup_bench import ImportEntry, find_regressions, package_totals, parse_importtime
+
+IMPORTTIME = """\
+import time: self [us] | cumulative | imported package
+import time:       120 |        120 |     fastapi.params
+import time:       300 |        420 |   fastapi
+import time:        80 |         80 |   core.config
+import time:        50 |        550 | main
+"""
+
+
+def test_parse_importtime() -> None:
+    """Test that import lines are parsed with their nesting depth."""
+    entries = parse_importtime(IMPORTTIME)
+
+    assert entries[0] == ImportEntry("fastapi.params", 120, 120, 2)
+    assert entries[-1] == ImportEntry("main", 50, 550, 0)
+    assert package_totals(entries) == {"fastapi": 420, "core": 80, "main": 50}
+
+
+def test_find_regressions() -> None:
+    """Test that slower startup and eagerly imported SDKs are regressions."""
+    baseline = {"import_ms": 500.0, "ready_ms": 1000.0}
+
+    assert find_regressions(
+        {"import_ms": 510.0, "ready_ms": 1100.0, "lazy_packages_imported": []}, baseline, 0.2
+    ) == []
+    assert find_regressions(
+        {"import_ms": 900.0, "ready_ms": 1000.0, "lazy_packages_imported": ["kubernetes"]}, baseline, 0.2
+    ) == ["kubernetes is imported at startup", "import_ms 900.0, baseline 500.0"]
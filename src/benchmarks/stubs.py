@@ -0,0 +1,100 @@
+"""Local stub servers of the Opsgenie and GitHub APIs for benchmarks.
+
+Both answer every request with a canned response after an optional injected
+latency and keep connections alive, so the app's outbound pools are
+exercised the way they are in production.
+"""
+import asyncio
+import json
+import re
+import socket
+from typing import Callable
+
+NOTE_RESPONSE = (
+    b'{"result": "Request will be processed", "took": 0.01, "requestId": "benchmark"}'
+)
+
+_COMMITS_PATH = re.compile(rb"^GET /repos/([^/]+)/([^/]+)/commits")
+
+
+def free_port() -> int:
+    """Get a free local TCP port."""
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _http_response(status: bytes, body: bytes, headers: bytes = b"") -> bytes:
+    return (
+        b"HTTP/1.1 " + status + b"\r\nContent-Type: application/json\r\n" + headers
+        + b"Content-Length: " + str(len(body)).encode() + b"\r\n\r\n" + body
+    )
+
+
+def opsgenie_response(head: bytes) -> bytes:
+    """Accept every note."""
+    return _http_response(b"202 Accepted", NOTE_RESPONSE)
+
+
+def github_response(head: bytes) -> bytes:
+    """Answer commit listings with one commit and a `last` page link of 7."""
+    match = _COMMITS_PATH.match(head)
+    if match is None:
+        return _http_response(b"404 Not Found", b'{"message": "Not Found"}')
+    org, repo = match.group(1).decode(), match.group(2).decode()
+    body = json.dumps([{
+        "sha": "0" * 40,
+        "html_url": f"https://github.com/{org}/{repo}/commit/{'0' * 40}",
+        "commit": {"message": f"Deploy {repo}"},
+    }]).encode()
+    link = f'<https://api.github.com/repos/{org}/{repo}/commits?per_page=1&page=7>; rel="last"'
+    return _http_response(b"200 OK", body, b"Link: " + link.encode() + b"\r\n")
+
+
+async def serve(port: int, respond: Callable[[bytes], bytes], latency: float = 0.0) -> None:
+    """Serve canned responses on a port until cancelled.
+
+    Args:
+        port: Local port
+        respond: Builds the response from the request head
+        latency: Seconds every response is delayed
+    """
+    async def handle(reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            while True:
+                head = await reader.readuntil(b"\r\n\r\n")
+                for line in head.split(b"\r\n"):
+                    if line.lower().startswith(b"content-length:"):
+                        await reader.readexactly(int(line.split(b":", 1)[1]))
+                if latency > 0:
+                    await asyncio.sleep(latency)
+                writer.write(respond(head))
+        except (asyncio.IncompleteReadError, ConnectionError):
+            writer.close()
+
+    server = await asyncio.start_server(handle, "127.0.0.1", port, backlog=1024)
+    async with server:
+        await server.serve_forever()
+
+
+def run_stubs(
+    opsgenie_port: int,
+    github_port: int,
+    opsgenie_latency: float = 0.0,
+    github_latency: float = 0.0,
+) -> None:
+    """Run both stubs until terminated, meant to be a separate process.
+
+    Args:
+        opsgenie_port: Port of the Opsgenie stub
+        github_port: Port of the GitHub stub
+        opsgenie_latency: Seconds every Opsgenie response is delayed
+        github_latency: Seconds every GitHub response is delayed
+    """
+    async def serve_all() -> None:
+        await asyncio.gather(
+            serve(opsgenie_port, opsgenie_response, opsgenie_latency),
+            serve(github_port, github_response, github_latency),
+        )
+
+    asyncio.run(serve_all())
@@ -0,0 +1,337 @@
+"""Benchmark of webhook throughput, latency percentiles and event loop lag.
+
+Starts Opsgenie and GitHub API stubs with injected latency, runs the app
+with uvicorn against them and replays the event corpus (`corpus.jsonl`,
+events repeated by weight with unique alert ids) at each concurrency. The
+event loop lag is read from the app's `/metrics`.
+
+Run from `src/`:
+
+    python -m benchmarks.webhook_bench --concurrency 8 32
+    python -m benchmarks.webhook_bench --save-baseline   # update baseline.json
+    python -m benchmarks.webhook_bench --check           # exit 1 on regression
+
+Baselines are only comparable on the same hardware, regenerate them on the
+CI runner with `--save-baseline`.
+"""
+import argparse
+import asyncio
+import json
+import math
+import multiprocessing
+import os
+import platform
+import re
+import subprocess
+import sys
+import time
+import uuid
+from pathlib import Path
+from typing import Any, Iterator
+
+import httpx
+
+from benchmarks.stubs import free_port, run_stubs
+
+API_KEY = "benchmark-key"
+HERE = Path(__file__).parent
+CORPUS = HERE / "corpus.jsonl"
+BASELINE = HERE / "baseline.json"
+
+_LAG_BUCKET = re.compile(r'^event_loop_lag_seconds_bucket\{le="([^"]+)"\} (\d+)$', re.MULTILINE)
+
+
+def load_corpus(path: Path = CORPUS) -> list[dict[str, Any]]:
+    """Load corpus events, each repeated by its weight.
+
+    Args:
+        path: JSON lines file with "name", "weight" and "event" per line
+
+    Returns:
+        Webhook payloads in replay order
+    """
+    events = []
+    with path.open() as corpus:
+        for line in corpus:
+            if line.strip():
+                entry = json.loads(line)
+                events.extend([entry["event"]] * entry.get("weight", 1))
+    return events
+
+
+def unique_events(corpus: list[dict[str, Any]], count: int) -> Iterator[dict[str, Any]]:
+    """Cycle through the corpus, giving every event a fresh alert id.
+
+    Fresh ids keep the deduplicator from answering repeated events.
+    """
+    prefix = uuid.uuid4().hex
+    for i in range(count):
+        event = corpus[i % len(corpus)]
+        alert_id = f"{prefix}-{i}"
+        yield {**event, "alert": {**event["alert"], "alertId": alert_id, "alias": alert_id}}
+
+
+def percentile(values: list[float], q: float) -> float:
+    """Nearest-rank percentile.
+
+    Args:
+        values: Samples
+        q: Percentile, 0 to 100
+
+    Returns:
+        The percentile, 0 without samples
+    """
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[max(0, math.ceil(q / 100 * len(ordered)) - 1)]
+
+
+def read_lag_buckets(metrics: str) -> dict[float, int]:
+    """Read cumulative event loop lag buckets from `/metrics` output."""
+    return {
+        math.inf if bound == "+Inf" else float(bound): int(count)
+        for bound, count in _LAG_BUCKET.findall(metrics)
+    }
+
+
+def bucket_quantile(before: dict[float, int], after: dict[float, int], q: float) -> float:
+    """Estimate a quantile of observations made between two bucket readings.
+
+    The upper bound of the bucket holding the quantile is returned, like
+    Prometheus `histogram_quantile` without interpolation.
+
+    Args:
+        before: Cumulative buckets at the start
+        after: Cumulative buckets at the end
+        q: Quantile, 0 to 1
+
+    Returns:
+        Upper bound of the bucket, 0 without observations
+    """
+    bounds = sorted(after)
+    counts = [after[bound] - before.get(bound, 0) for bound in bounds]
+    if not counts or counts[-1] == 0:
+        return 0.0
+    rank = q * counts[-1]
+    for bound, count in zip(bounds, counts):
+        if count >= rank:
+            return bound
+    return bounds[-1]
+
+
+async def _send(url: str, events: list[dict[str, Any]], concurrency: int) -> tuple[list[float], int]:
+    """Post events with bounded concurrency, returning latencies and error count."""
+    latencies: list[float] = []
+    errors = 0
+    pending = iter(events)
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+
+    async with httpx.AsyncClient(base_url=url, limits=limits, timeout=60) as client:
+        async def worker() -> None:
+            nonlocal errors
+            for event in pending:
+                started = time.perf_counter()
+                response = await client.post(
+                    "/api/v1/webhook", json=event, headers={"X-Actions-Auth": API_KEY}
+                )
+                latencies.append(time.perf_counter() - started)
+                if response.status_code >= 400:
+                    errors += 1
+
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return latencies, errors
+
+
+def run_client(args: tuple[str, list[dict[str, Any]], int]) -> tuple[list[float], int]:
+    """Run one client process."""
+    return asyncio.run(_send(*args))
+
+
+def start_app(port: int, env: dict[str, str]) -> subprocess.Popen[bytes]:
+    """Start the app with uvicorn and wait until it serves requests."""
+    process = subprocess.Popen(
+        [
+            sys.executable, "-m", "uvicorn", "main:app",
+            "--port", str(port),
+            "--log-level", "warning",
+            "--no-access-log",
+        ],
+        env={**os.environ, **env},
+        stdout=subprocess.DEVNULL,
+    )
+
+    deadline = time.monotonic() + 30
+    while time.monotonic() < deadline:
+        try:
+            httpx.get(f"http://127.0.0.1:{port}/metrics", timeout=1).raise_for_status()
+            return process
+        except httpx.HTTPError:
+            time.sleep(0.2)
+    process.terminate()
+    raise RuntimeError("App did not start")
+
+
+def run_scenario(
+    url: str,
+    corpus: list[dict[str, Any]],
+    requests: int,
+    concurrency: int,
+    clients: int,
+) -> dict[str, float]:
+    """Replay the corpus once at a concurrency.
+
+    Returns:
+        Throughput, latency percentiles in ms, loop lag in ms and error count
+    """
+    events = list(unique_events(corpus, requests))
+    per_client = math.ceil(len(events) / clients)
+    client_args = [
+        (url, events[i:i + per_client], max(1, concurrency // clients))
+        for i in range(0, len(events), per_client)
+    ]
+
+    lag_before = read_lag_buckets(httpx.get(f"{url}/metrics").text)
+    started = time.perf_counter()
+    with multiprocessing.Pool(len(client_args)) as pool:
+        parts = pool.map(run_client, client_args)
+    elapsed = time.perf_counter() - started
+    lag_after = read_lag_buckets(httpx.get(f"{url}/metrics").text)
+
+    latencies = [latency for part, _ in parts for latency in part]
+    return {
+        "requests_per_second": round(len(latencies) / elapsed, 1),
+        "p50_ms": round(percentile(latencies, 50) * 1000, 2),
+        "p95_ms": round(percentile(latencies, 95) * 1000, 2),
+        "p99_ms": round(percentile(latencies, 99) * 1000, 2),
+        "loop_lag_p99_ms": round(bucket_quantile(lag_before, lag_after, 0.99) * 1000, 2),
+        "errors": sum(errors for _, errors in parts),
+    }
+
+
+def find_regressions(
+    results: dict[str, dict[str, float]],
+    baseline: dict[str, dict[str, float]],
+    tolerance: float,
+) -> list[str]:
+    """Compare results with a baseline.
+
+    Args:
+        results: Results by scenario
+        baseline: Baseline results by scenario
+        tolerance: Allowed relative change, e.g. 0.2 for 20%
+
+    Returns:
+        Description of every regression
+    """
+    regressions = []
+    for scenario, result in results.items():
+        base = baseline.get(scenario)
+        if base is None:
+            continue
+        floor = base["requests_per_second"] * (1 - tolerance)
+        if result["requests_per_second"] < floor:
+            regressions.append(
+                f"{scenario}: {result['requests_per_second']} req/s, "
+                f"baseline {base['requests_per_second']}"
+            )
+        for key in ("p99_ms", "loop_lag_p99_ms"):
+            # Absolute slack of 1 ms keeps sub-millisecond noise from failing the check
+            ceiling = base[key] * (1 + tolerance) + 1.0
+            if result[key] > ceiling:
+                regressions.append(f"{scenario}: {key} {result[key]}, baseline {base[key]}")
+        if result["errors"] > base.get("errors", 0):
+            regressions.append(f"{scenario}: {result['errors']} errors")
+    return regressions
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[8, 32], help="Requests in flight")
+    parser.add_argument("--requests", type=int, default=2000, help="Requests per scenario")
+    parser.add_argument("--clients", type=int, default=1, help="Client processes")
+    parser.add_argument("--opsgenie-latency", type=float, default=0.02, help="Seconds")
+    parser.add_argument("--github-latency", type=float, default=0.05, help="Seconds")
+    parser.add_argument(
+        "--note-window", type=float, default=0.0,
+        help="Seconds notes of an alert are merged, the app default adds its full length to every request",
+    )
+    parser.add_argument("--corpus", type=Path, default=CORPUS)
+    parser.add_argument("--baseline", type=Path, default=BASELINE)
+    parser.add_argument("--save-baseline", action="store_true", help="Store results as baseline")
+    parser.add_argument("--check", action="store_true", help="Exit 1 on regression")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="Allowed relative change")
+    args = parser.parse_args()
+
+    opsgenie_port, github_port, app_port = free_port(), free_port(), free_port()
+    stubs = multiprocessing.Process(
+        target=run_stubs,
+        args=(opsgenie_port, github_port, args.opsgenie_latency, args.github_latency),
+        daemon=True,
+    )
+    stubs.start()
+    app = start_app(app_port, {
+        "API_KEY": API_KEY,
+        "OPSGENIE_API_URL": f"http://127.0.0.1:{opsgenie_port}",
+        "GITHUB_BACKEND": "httpx",
+        "GITHUB_API_URL": f"http://127.0.0.1:{github_port}",
+        "GITHUB_TOKEN": "benchmark-token",
+        "GITHUB_HTTP2": "false",
+        "OPSGENIE_NOTE_WINDOW": str(args.note_window),
+        "RATE_LIMIT": "0",
+    })
+
+    url = f"http://127.0.0.1:{app_port}"
+    corpus = load_corpus(args.corpus)
+    results: dict[str, dict[str, float]] = {}
+    print(
+        f"{os.cpu_count()} CPUs, {args.requests} requests, "
+        f"Opsgenie {args.opsgenie_latency * 1000:.0f} ms, GitHub {args.github_latency * 1000:.0f} ms"
+    )
+    print(f"{'scenario':>16} {'req/s':>8} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'lag p99':>8} {'errors':>6}")
+    try:
+        # Warm connection pools and caches
+        run_scenario(url, corpus, min(200, args.requests), max(args.concurrency), args.clients)
+        for concurrency in args.concurrency:
+            scenario = f"concurrency-{concurrency}"
+            result = results[scenario] = run_scenario(
+                url, corpus, args.requests, concurrency, args.clients
+            )
+            print(
+                f"{scenario:>16} {result['requests_per_second']:>8.0f} {result['p50_ms']:>8.1f} "
+                f"{result['p95_ms']:>8.1f} {result['p99_ms']:>8.1f} "
+                f"{result['loop_lag_p99_ms']:>8.1f} {result['errors']:>6}"
+            )
+    finally:
+        app.terminate()
+        app.wait()
+        stubs.terminate()
+
+    options = {
+        "requests": args.requests,
+        "opsgenie_latency": args.opsgenie_latency,
+        "github_latency": args.github_latency,
+        "note_window": args.note_window,
+    }
+    if args.save_baseline:
+        args.baseline.write_text(json.dumps({
+            "host": {"cpus": os.cpu_count(), "python": platform.python_version()},
+            "options": options,
+            "scenarios": results,
+        }, indent=2) + "\n")
+        print(f"Baseline saved to {args.baseline}")
+
+    if args.check:
+        baseline = json.loads(args.baseline.read_text())
+        if baseline.get("options") != options:
+            print(f"WARNING baseline was measured with {baseline.get('options')}")
+        regressions = find_regressions(results, baseline["scenarios"], args.tolerance)
+        for regression in regressions:
+            print(f"REGRESSION {regression}")
+        if regressions:
+            sys.exit(1)
+        print("No regressions")
+
+
+if __name__ == "__main__":
+    main()
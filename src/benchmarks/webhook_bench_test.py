@@ -0,0 +1,55 @@
+import math
+
+from benchmarks.webhook_bench import (
+    bucket_quantile,
+    find_regressions,
+    load_corpus,
+    percentile,
+    read_lag_buckets,
+    unique_events,
+)
+from models.events import OpsgenieEvent
+
+
+def test_corpus_is_valid() -> None:
+    """Test that every corpus event is a valid webhook payload with a fresh id."""
+    corpus = load_corpus()
+    events = list(unique_events(corpus, len(corpus)))
+
+    for event in events:
+        OpsgenieEvent.model_validate(event)
+    assert len({event["alert"]["alertId"] for event in events}) == len(events)
+
+
+def test_percentile() -> None:
+    """Test nearest-rank percentiles."""
+    values = [float(i) for i in range(1, 101)]
+
+    assert percentile(values, 50) == 50
+    assert percentile(values, 99) == 99
+    assert percentile([], 99) == 0
+
+
+def test_bucket_quantile() -> None:
+    """Test that quantiles use only observations between two readings."""
+    before = read_lag_buckets(
+        'event_loop_lag_seconds_bucket{le="0.001"} 10\n'
+        'event_loop_lag_seconds_bucket{le="0.1"} 10\n'
+        'event_loop_lag_seconds_bucket{le="+Inf"} 10\n'
+    )
+    after = {0.001: 108, 0.1: 109, math.inf: 110}
+
+    assert bucket_quantile(before, after, 0.5) == 0.001
+    assert bucket_quantile(before, after, 0.99) == 0.1
+    assert bucket_quantile(after, after, 0.99) == 0
+
+
+def test_find_regressions() -> None:
+    """Test that throughput drops and latency increases beyond tolerance are flagged."""
+    baseline = {"c8": {"requests_per_second": 100, "p99_ms": 50, "loop_lag_p99_ms": 5, "errors": 0}}
+
+    ok = {"c8": {"requests_per_second": 90, "p99_ms": 55, "loop_lag_p99_ms": 5, "errors": 0}}
+    slow = {"c8": {"requests_per_second": 70, "p99_ms": 80, "loop_lag_p99_ms": 5, "errors": 2}}
+
+    assert find_regressions(ok, baseline, tolerance=0.2) == []
+    assert len(find_regressions(slow, baseline, tolerance=0.2)) == 3
@@ -0,0 +1,147 @@
+import asyncio
+import json
+from typing import Any, AsyncIterable, AsyncIterator, Awaitable, Callable, Optional, Union
+
+from pydantic import ValidationError
+from starlette.requests import ClientDisconnect
+from starlette.responses import StreamingResponse
+from starlette.types import Receive, Scope, Send
+import structlog
+
+from core.registry import NoHandlerError
+from models.events import OpsgenieEvent, decode_event, validate_event
+from utils.event_stream import StreamFormatError
+
+logger = structlog.get_logger()
+
+ProcessEvent = Callable[[OpsgenieEvent], Awaitable[dict[str, Any]]]
+AdmitEvent = Callable[[OpsgenieEvent], Awaitable[Optional[dict[str, Any]]]]
+
+
+def _validate(document: Union[bytes, Any]) -> OpsgenieEvent:
+    """Validate a raw NDJSON line or a decoded array item like a webhook body."""
+    if isinstance(document, bytes):
+        return decode_event(document)
+    return validate_event(document)
+
+
+def _encode(line: dict[str, Any]) -> bytes:
+    """Encode a result line of the NDJSON response."""
+    return json.dumps(line, default=str).encode() + b"\n"
+
+
+async def process_batch(
+    documents: AsyncIterable[Union[bytes, Any]],
+    process: ProcessEvent,
+    parallelism: int,
+    admit: Optional[AdmitEvent] = None,
+) -> AsyncIterator[bytes]:
+    """Validate and process events as they arrive, streaming results back.
+
+    Documents are read only while fewer than `parallelism` events are being
+    processed, so a large batch backs up on the client instead of in memory.
+    Results are yielded in completion order, each carrying the position of
+    its event in the batch.
+
+    Args:
+        documents: Documents of the batch, see `iter_json_documents`
+        process: Coroutine processing one event
+        parallelism: Maximum number of events processed at once
+        admit: Coroutine checking an event before it is processed, returning
+            a result to report instead, e.g. when rate limited, or None
+
+    Yields:
+        NDJSON result lines, followed by a summary line
+    """
+    results: asyncio.Queue[Optional[bytes]] = asyncio.Queue()
+    semaphore = asyncio.Semaphore(parallelism)
+    tasks: set[asyncio.Task[None]] = set()
+    summary = {"status": "done", "total": 0, "processed": 0, "failed": 0}
+
+    async def run(index: int, event: OpsgenieEvent) -> None:
+        line: dict[str, Any] = {"index": index, "alert_id": event.alert.alert_id}
+        try:
+            line.update(await process(event))
+        except NoHandlerError as e:
+            line.update({"status": "error", "error": str(e)})
+        except Exception as e:
+            logger.exception(
+                "batch.processing_error",
+                index=index,
+                action=event.action,
+                alert_id=event.alert.alert_id,
+                error=str(e),
+            )
+            line.update({"status": "error", "error": f"Error processing event: {str(e)}"})
+        finally:
+            semaphore.release()
+
+        summary["failed" if line.get("status") == "error" else "processed"] += 1
+        results.put_nowait(_encode(line))
+
+    async def produce() -> None:
+        index = 0
+        try:
+            async for document in documents:
+                try:
+                    event = _validate(document)
+                except ValidationError as e:
+                    summary["failed"] += 1
+                    results.put_nowait(_encode({
+                        "index": index,
+                        "status": "invalid",
+                        "error": e.errors(include_url=False, include_context=False),
+                    }))
+                else:
+                    rejected = await admit(event) if admit is not None else None
+                    if rejected is not None:
+                        summary["failed"] += 1
+                        results.put_nowait(_encode(
+                            {"index": index, "alert_id": event.alert.alert_id, **rejected}
+                        ))
+                        index += 1
+                        continue
+                    await semaphore.acquire()
+                    task = asyncio.create_task(run(index, event))
+                    tasks.add(task)
+                    task.add_done_callback(tasks.discard)
+                index += 1
+        except StreamFormatError as e:
+            logger.warning("batch.malformed_stream", index=index, error=str(e))
+            summary.update({"status": "error", "error": str(e)})
+        finally:
+            summary["total"] = index
+            if tasks:
+                await asyncio.gather(*list(tasks), return_exceptions=True)
+            results.put_nowait(None)
+
+    producer = asyncio.create_task(produce())
+    try:
+        while (line := await results.get()) is not None:
+            yield line
+        await producer
+        yield _encode(summary)
+    finally:
+        # No-op when done, stops the rest of the batch if the client went away
+        producer.cancel()
+        for task in list(tasks):
+            task.cancel()
+
+
+class NDJSONStreamingResponse(StreamingResponse):
+    """Streaming response that leaves the request body to the generator.
+
+    `StreamingResponse` listens for a disconnect on ASGI servers older than
+    spec 2.4, which consumes body messages the batch is still reading. A
+    disconnect is noticed anyway when sending the next line fails.
+    """
+
+    media_type = "application/x-ndjson"
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        try:
+            await self.stream_response(send)
+        except OSError:
+            raise ClientDisconnect()
+        if self.background is not None:
+            await self.background()
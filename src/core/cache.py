@@ -0,0 +1,160 @@
+import asyncio
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Generic, Hashable, Iterator, Optional, TypeVar
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+
+class TTLCache(Generic[K, V]):
+    """In-process LRU cache with per-entry expiration.
+
+    Concurrent misses for the same key share a single load instead of
+    stampeding the backend.
+    """
+
+    def __init__(
+        self,
+        max_size: int = 1024,
+        ttl: float = 60.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """Initialize cache.
+
+        Args:
+            max_size: Maximum number of entries, least recently used are evicted
+            ttl: Entry lifetime in seconds
+            clock: Monotonic time source
+        """
+        self._max_size = max_size
+        self._ttl = ttl
+        self._clock = clock
+        self._entries: OrderedDict[K, tuple[float, V]] = OrderedDict()
+        self._inflight: dict[K, asyncio.Task[V]] = {}
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.coalesced = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def keys(self) -> Iterator[K]:
+        """Iterate over cached keys, expired ones included."""
+        return iter(list(self._entries))
+
+    def get(self, key: K) -> Optional[V]:
+        """Get a fresh value from the cache.
+
+        Args:
+            key: Cache key
+
+        Returns:
+            Cached value, None if missing or expired
+        """
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+
+        expires_at, value = entry
+        if expires_at <= self._clock():
+            del self._entries[key]
+            self.misses += 1
+            return None
+
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def set(self, key: K, value: V) -> None:
+        """Store a value, evicting least recently used entries over the limit.
+
+        Args:
+            key: Cache key
+            value: Value to store
+        """
+        self._entries[key] = (self._clock() + self._ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self._max_size:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def invalidate(self, key: Optional[K] = None) -> None:
+        """Drop one entry or, without a key, the whole cache.
+
+        Loads already in progress for dropped keys are not stored.
+
+        Args:
+            key: Cache key to drop
+        """
+        if key is None:
+            self._entries.clear()
+            self._inflight.clear()
+        else:
+            self._entries.pop(key, None)
+            self._inflight.pop(key, None)
+
+    async def get_or_load(
+        self,
+        key: K,
+        loader: Callable[[], Awaitable[V]],
+        cache_if: Optional[Callable[[V], bool]] = None,
+    ) -> V:
+        """Get a cached value or load it, sharing the load between concurrent callers.
+
+        Args:
+            key: Cache key
+            loader: Coroutine function producing the value
+            cache_if: Predicate deciding whether a loaded value is cached
+
+        Returns:
+            Cached or freshly loaded value
+        """
+        value = self.get(key)
+        if value is not None:
+            return value
+
+        task = self._inflight.get(key)
+        if task is not None:
+            self.coalesced += 1
+        else:
+            task = asyncio.ensure_future(self._load(key, loader, cache_if))
+            self._inflight[key] = task
+
+        # Shield the shared load so one cancelled caller does not cancel the others
+        return await asyncio.shield(task)
+
+    async def _load(
+        self,
+        key: K,
+        loader: Callable[[], Awaitable[V]],
+        cache_if: Optional[Callable[[V], bool]],
+    ) -> V:
+        task = asyncio.current_task()
+        try:
+            value = await loader()
+            if (
+                self._inflight.get(key) is task
+                and value is not None
+                and (cache_if is None or cache_if(value))
+            ):
+                self.set(key, value)
+            return value
+        finally:
+            if self._inflight.get(key) is task:
+                del self._inflight[key]
+
+    def stats(self) -> dict[str, Any]:
+        """Get cache statistics."""
+        return {
+            "size": len(self._entries),
+            "max_size": self._max_size,
+            "ttl": self._ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "coalesced": self.coalesced,
+            "loading": len(self._inflight),
+        }
@@ -0,0 +1,125 @@
+import asyncio
+
+import pytest
+
+from core.cache import TTLCache
+
+
+class FakeClock:
+    """Manually advanced clock."""
+
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock() -> FakeClock:
+    return FakeClock()
+
+
+def test_get_set(clock: FakeClock) -> None:
+    """Test basic hit and miss accounting."""
+    cache: TTLCache[str, int] = TTLCache(max_size=10, ttl=5, clock=clock)
+
+    assert cache.get("a") is None
+    cache.set("a", 1)
+    assert cache.get("a") == 1
+    assert cache.hits == 1
+    assert cache.misses == 1
+
+
+def test_expiration(clock: FakeClock) -> None:
+    """Test that entries expire after TTL."""
+    cache: TTLCache[str, int] = TTLCache(max_size=10, ttl=5, clock=clock)
+    cache.set("a", 1)
+
+    clock.now = 4.9
+    assert cache.get("a") == 1
+    clock.now = 5.0
+    assert cache.get("a") is None
+    assert len(cache) == 0
+
+
+def test_lru_eviction(clock: FakeClock) -> None:
+    """Test that least recently used entry is evicted."""
+    cache: TTLCache[str, int] = TTLCache(max_size=2, ttl=5, clock=clock)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+    assert cache.evictions == 1
+
+
+def test_invalidate(clock: FakeClock) -> None:
+    """Test explicit invalidation of one key and of all keys."""
+    cache: TTLCache[str, int] = TTLCache(max_size=10, ttl=5, clock=clock)
+    cache.set("a", 1)
+    cache.set("b", 2)
+
+    cache.invalidate("a")
+    assert cache.get("a") is None
+    assert cache.get("b") == 2
+
+    cache.invalidate()
+    assert len(cache) == 0
+
+
+@pytest.mark.asyncio
+async def test_get_or_load_coalesces_concurrent_misses() -> None:
+    """Test that concurrent misses share one load."""
+    cache: TTLCache[str, int] = TTLCache(max_size=10, ttl=5)
+    calls = 0
+
+    async def loader() -> int:
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        return 42
+
+    results = await asyncio.gather(*(cache.get_or_load("a", loader) for _ in range(5)))
+
+    assert results == [42] * 5
+    assert calls == 1
+    assert cache.coalesced == 4
+    assert await cache.get_or_load("a", loader) == 42
+    assert calls == 1
+
+
+@pytest.mark.asyncio
+async def test_get_or_load_skips_uncacheable() -> None:
+    """Test that values rejected by the predicate are not stored."""
+    cache: TTLCache[str, dict[str, str]] = TTLCache(max_size=10, ttl=5)
+
+    async def loader() -> dict[str, str]:
+        return {"status": "error"}
+
+    await cache.get_or_load("a", loader, cache_if=lambda v: v["status"] == "success")
+
+    assert len(cache) == 0
+
+
+@pytest.mark.asyncio
+async def test_get_or_load_propagates_errors() -> None:
+    """Test that loader errors reach every waiter and are not cached."""
+    cache: TTLCache[str, int] = TTLCache(max_size=10, ttl=5)
+
+    async def loader() -> int:
+        await asyncio.sleep(0.01)
+        raise RuntimeError("boom")
+
+    results = await asyncio.gather(
+        cache.get_or_load("a", loader),
+        cache.get_or_load("a", loader),
+        return_exceptions=True,
+    )
+
+    assert all(isinstance(r, RuntimeError) for r in results)
+    assert len(cache) == 0
+    assert cache.stats()["loading"] == 0
@@ -1,3 +1,5 @@
+from typing import Literal
+
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
@@ -6,11 +8,45 @@ class Settings(BaseSettings):
     
     # API settings
     api_key: str = "default-key"  # Should be overridden in production
-    rate_limit: int = 1000  # Requests per minute
+    api_keys: list[str] = []  # More accepted keys, e.g. the next one during rotation
+    max_request_size: int = 1024 * 1024  # Bytes of a request body, batches are limited per event
+    rate_limit: int = 1000  # Requests per minute per integration, 0 disables limiting
+    rate_limit_burst: int | None = None  # Bucket capacity, defaults to rate_limit
     
     # GitHub settings
     github_token: str | None = None
     github_org: str = "tekliner"
+    github_backend: Literal["pygithub", "httpx"] = "pygithub"
+    github_api_url: str = "https://api.github.com"
+    github_http2: bool = True
+    github_max_connections: int = 20
+    github_max_keepalive_connections: int = 10
+    github_timeout: float = 10.0  # Seconds
+    github_cache_max_size: int = 1024  # Entries per cache
+    github_repo_cache_ttl: float = 3600.0  # Seconds
+    github_changes_cache_ttl: float = 60.0  # Seconds
+    github_index_enabled: bool = False  # Index pushes, merged PRs and deployments of the org
+    github_index_interval: float = 300.0  # Seconds between index refreshes
+    github_index_lookback_hours: int = 72  # Hours of changes indexed and kept
+    github_index_concurrency: int = 4  # Repositories fetched at once
+    github_index_alert_hours: float = 24.0  # Hours of indexed changes attached to an alert
+    repo_map_file: str | None = None  # JSON rules mapping services to repositories, e.g. a ConfigMap
+    repo_map_reload_interval: float = 10.0  # Seconds between checks of the file, 0 disables reloads
+    repo_map_prepopulate: bool = False  # List org repositories at startup, unknown ones are not fetched
+    repo_map_list_interval: float = 600.0  # Seconds between listings of org repositories, 0 lists once
+    
+    # Kubernetes settings
+    kubernetes_config_file: str | None = None  # Kubeconfig path, in-cluster config is used in a pod
+    kubernetes_cluster_contexts: dict[str, str] = {}  # k8s_cluster_name label to kubeconfig context
+    kubernetes_in_cluster_name: str | None = None  # k8s_cluster_name of the cluster the app runs in
+    kubernetes_idle_timeout: float = 600.0  # Seconds before an unused cluster client is closed
+    kubernetes_pool_maxsize: int = 8  # Match executor limit for "kubernetes"
+    kubernetes_connect_timeout: float = 5.0  # Seconds
+    kubernetes_read_timeout: float = 15.0  # Seconds
+    kubernetes_resize_increment: str = "10Gi"  # Added to a PVC per low disk alert
+    kubernetes_resize_window: float = 1.0  # Seconds to batch resizes of a namespace
+    kubernetes_resize_concurrency: int = 4  # Concurrent PVC patches
+    kubernetes_resize_cooldown: float = 300.0  # Seconds a resized PVC is not grown again
     
     # Logging
     log_level: str = "INFO"
@@ -20,7 +56,77 @@ class Settings(BaseSettings):
     
     # Opsgenie API key for alert management
     opsgenie_api_key: str = "opsgenie-api-key"
+    opsgenie_api_url: str = "https://api.opsgenie.com"
+    opsgenie_pool_maxsize: int = 8  # Match executor limit for "opsgenie"
+    opsgenie_pool_block: bool = True  # Wait for a pooled connection instead of opening a new one
+    opsgenie_connect_timeout: float = 5.0  # Seconds
+    opsgenie_read_timeout: float = 15.0  # Seconds
+    opsgenie_tcp_keepalive: bool = True
+    opsgenie_sdk_retries: int = 0  # Retries are done by the note writer
+    opsgenie_note_user: str = "opsgenie-actions"
+    opsgenie_note_window: float = 0.5  # Seconds notes following a write to an alert are merged
+    opsgenie_note_concurrency: int = 4
+    opsgenie_note_max_retries: int = 3
+    opsgenie_note_backoff_base: float = 0.5  # Seconds
+    opsgenie_note_backoff_max: float = 10.0  # Seconds
+    
+    # Background processing
+    webhook_async: bool = False  # Acknowledge webhooks with 202 and process in background
+    webhook_fast_decode: bool = True  # Without a fallback handler, build the full event only for routable requests
+    job_queue_size: int = 1000
+    job_workers: int = 4
+    job_ttl: float = 3600.0  # Seconds job status is kept for lookups
+    job_retry_after: int = 5  # Seconds suggested to clients when the queue is full
+    job_shutdown_timeout: float = 10.0
+    
+    # Durable journal of accepted events, replayed after a crash
+    journal_path: str | None = None  # SQLite database path on a persistent volume, None disables
+    journal_lease: float = 30.0  # Seconds without heartbeat before events of a process are replayed
+    journal_commit_interval: float = 0.002  # Seconds to gather writes into one fsync
+    journal_max_batch: int = 512
     
+    # State shared by workers and replicas (idempotency, rate limits, job status)
+    state_backend: Literal["memory", "redis"] = "memory"  # Use redis with several workers
+    state_max_keys: int = 100000  # Keys kept by the memory backend
+    redis_url: str = "redis://localhost:6379/0"
+    
+    # Deduplication of redelivered events
+    dedup_window: float = 60.0  # Seconds, 0 disables replay detection
+
+    # Bulk ingestion
+    batch_parallelism: int = 8  # Events of one batch processed at once
+    batch_max_event_size: int = 1024 * 1024  # Bytes
+
+    # Import handler SDKs and build API clients in the background at startup,
+    # the app serves requests meanwhile; off, they are built by the first event
+    warm_up_on_startup: bool = False
+
+    # Event loop lag measurement for /metrics
+    loop_lag_interval: float = 0.1  # Seconds between wakeups, 0 disables
+
+    # Sampling profiler of slow or signed webhook requests, off by default
+    profiling_enabled: bool = False
+    profiling_threshold: float | None = 2.0  # Seconds, None profiles signed requests only
+    profiling_interval: float = 0.005  # Seconds between samples
+    profiling_dir: str = "/tmp/opsgenie-actions-profiles"
+    profiling_max_profiles: int = 50
+    profiling_header_max_age: float = 300.0  # Seconds a signed X-Actions-Profile header is valid
+
+    # Tracing spans of webhooks, handlers and outbound calls
+    tracing_exporter: Literal["none", "memory", "file"] = "none"
+    tracing_file: str | None = None  # JSON lines file of the "file" exporter
+    tracing_schedule_delay: float = 1.0  # Seconds between span exports
+
+    # Thread pool for blocking SDK calls
+    executor_max_workers: int = 32
+    executor_default_limit: int = 8  # Per-service concurrency limit
+    executor_service_limits: dict[str, int] = {"github": 8, "opsgenie": 8, "kubernetes": 8}
+    
+    @property
+    def active_api_keys(self) -> list[str]:
+        """Keys requests are authenticated with."""
+        return [key for key in (self.api_key, *self.api_keys) if key]
+
     model_config = SettingsConfigDict(
         env_file=".env",
         env_file_encoding="utf-8",
@@ -0,0 +1,142 @@
+import asyncio
+import json
+from typing import Any, Awaitable, Callable
+
+import structlog
+
+from core.state import StateBackend
+from models.events import OpsgenieEvent
+
+logger = structlog.get_logger()
+
+
+EventProcessor = Callable[[OpsgenieEvent], Awaitable[dict[str, Any]]]
+
+
+def replay_key(event: OpsgenieEvent) -> str:
+    """Key identifying a delivery: alert id, action and `updatedAt`."""
+    return f"{event.alert.alert_id}:{event.action}:{event.alert.updated_at}"
+
+
+class EventDeduplicator:
+    """Single-flight layer in front of event processing.
+
+    Concurrent identical events (same alert id, action and `updatedAt`)
+    attach to the running execution, and replays of an already processed one
+    get the stored result during the idempotency window.
+
+    Results and processing claims live in the state backend, so with a shared
+    backend a replay delivered to another worker or replica is not processed
+    again either.
+    """
+
+    def __init__(self, state: StateBackend, window: float = 60.0) -> None:
+        """Initialize deduplicator.
+
+        Args:
+            state: State backend keeping claims and results
+            window: Idempotency window in seconds, 0 disables replay detection
+        """
+        self._state = state
+        self._window = window
+        self._inflight: dict[str, asyncio.Task[dict[str, Any]]] = {}
+        self.coalesced = 0
+        self.replayed = 0
+        self.claimed_elsewhere = 0
+
+    async def run(self, event: OpsgenieEvent, process: EventProcessor) -> dict[str, Any]:
+        """Process the event unless an identical one is running or was just processed.
+
+        Args:
+            event: The Opsgenie event to process
+            process: Coroutine function doing the actual processing
+
+        Returns:
+            Processing result, marked with `deduplicated` when it was shared
+        """
+        alert = event.alert
+        key = replay_key(event)
+        if self._window > 0:
+            stored = await self._state.get(f"dedup:result:{key}")
+            if stored is not None:
+                self.replayed += 1
+                logger.info(
+                    "dedup.replayed_event",
+                    action=event.action,
+                    alert_id=alert.alert_id,
+                )
+                return {**json.loads(stored), "deduplicated": True}
+
+        task = self._inflight.get(key)
+        if task is not None:
+            self.coalesced += 1
+            logger.info(
+                "dedup.coalesced_event",
+                action=event.action,
+                alert_id=alert.alert_id,
+            )
+            return {**await asyncio.shield(task), "deduplicated": True}
+
+        task = asyncio.ensure_future(self._process_once(event, key, process))
+        self._inflight[key] = task
+        try:
+            return await asyncio.shield(task)
+        finally:
+            if self._inflight.get(key) is task:
+                del self._inflight[key]
+
+    async def release(self, event: OpsgenieEvent) -> None:
+        """Drop the processing claim of an event, so it is processed again.
+
+        For events replayed from the journal: the process that claimed them
+        died, and its claim would outlive it by up to the window.
+
+        Args:
+            event: The Opsgenie event to release
+        """
+        if self._window > 0:
+            await self._state.delete(f"dedup:claim:{replay_key(event)}")
+
+    async def _process_once(
+        self,
+        event: OpsgenieEvent,
+        key: str,
+        process: EventProcessor,
+    ) -> dict[str, Any]:
+        """Claim the event, process it and store the result."""
+        if self._window <= 0:
+            return await process(event)
+
+        claim_key = f"dedup:claim:{key}"
+        if not await self._state.add(claim_key, "1", ttl=self._window):
+            # Another worker is processing the same delivery right now
+            self.claimed_elsewhere += 1
+            logger.info(
+                "dedup.claimed_elsewhere",
+                action=event.action,
+                alert_id=event.alert.alert_id,
+            )
+            return {"status": "duplicate", "handler": None, "deduplicated": True}
+
+        try:
+            result = await process(event)
+        except BaseException:
+            # Release the claim so a redelivery is processed again
+            await self._state.delete(claim_key)
+            raise
+
+        await self._state.set(
+            f"dedup:result:{key}",
+            json.dumps(result, default=str),
+            ttl=self._window,
+        )
+        return result
+
+    def stats(self) -> dict[str, Any]:
+        """Get deduplication statistics."""
+        return {
+            "in_flight": len(self._inflight),
+            "coalesced": self.coalesced,
+            "replayed": self.replayed,
+            "claimed_elsewhere": self.claimed_elsewhere,
+        }
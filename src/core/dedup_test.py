@@ -0,0 +1,151 @@
+import asyncio
+from typing import Any
+
+import pytest
+
+from core.dedup import EventDeduplicator
+from core.state import InMemoryStateBackend
+from models.events import Alert, OpsgenieEvent, Source
+
+
+def make_event(action: str = "Create", updated_at: int = 0) -> OpsgenieEvent:
+    """Build an Opsgenie event."""
+    return OpsgenieEvent(
+        action=action,
+        integrationId="test-integration",
+        integrationName="Test Integration",
+        source=Source(name="Test Source", type="API"),
+        alert=Alert(
+            alertId="test-alert-id",
+            message="Test Alert",
+            tags=["test"],
+            tinyId="1234",
+            alias="test-alias",
+            createdAt=0,
+            updatedAt=updated_at,
+            username="test-user",
+            userId="test-user-id",
+            entity="test-entity",
+        ),
+    )
+
+
+class CountingProcessor:
+    """Event processor counting its calls."""
+
+    def __init__(self, delay: float = 0.0) -> None:
+        self.calls = 0
+        self.delay = delay
+
+    async def __call__(self, event: OpsgenieEvent) -> dict[str, Any]:
+        self.calls += 1
+        await asyncio.sleep(self.delay)
+        return {"status": "processed", "call": self.calls}
+
+
+@pytest.mark.asyncio
+async def test_concurrent_duplicates_share_execution() -> None:
+    """Test that concurrent identical events run the handler once."""
+    dedup = EventDeduplicator(InMemoryStateBackend(), window=60)
+    process = CountingProcessor(delay=0.01)
+
+    results = await asyncio.gather(
+        dedup.run(make_event(updated_at=1), process),
+        dedup.run(make_event(updated_at=1), process),
+        dedup.run(make_event(updated_at=1), process),
+    )
+
+    assert process.calls == 1
+    assert results[0] == {"status": "processed", "call": 1}
+    assert results[1] == {"status": "processed", "call": 1, "deduplicated": True}
+    assert dedup.stats()["coalesced"] == 2
+
+
+@pytest.mark.asyncio
+async def test_concurrent_updates_run_separately() -> None:
+    """Test that concurrent events of one alert with different updates are not merged."""
+    dedup = EventDeduplicator(InMemoryStateBackend(), window=60)
+    process = CountingProcessor(delay=0.01)
+
+    first, second = await asyncio.gather(
+        dedup.run(make_event(action="AddNote", updated_at=1), process),
+        dedup.run(make_event(action="AddNote", updated_at=2), process),
+    )
+
+    assert process.calls == 2
+    assert "deduplicated" not in first and "deduplicated" not in second
+    assert dedup.stats()["coalesced"] == 0
+
+
+@pytest.mark.asyncio
+async def test_replay_returns_stored_result() -> None:
+    """Test that a redelivered event is answered from the idempotency window."""
+    dedup = EventDeduplicator(InMemoryStateBackend(), window=60)
+    process = CountingProcessor()
+
+    await dedup.run(make_event(updated_at=1), process)
+    replay = await dedup.run(make_event(updated_at=1), process)
+
+    assert process.calls == 1
+    assert replay["deduplicated"] is True
+    assert dedup.stats()["replayed"] == 1
+
+
+@pytest.mark.asyncio
+async def test_new_update_is_processed() -> None:
+    """Test that a later update of the same alert is processed again."""
+    dedup = EventDeduplicator(InMemoryStateBackend(), window=60)
+    process = CountingProcessor()
+
+    await dedup.run(make_event(updated_at=1), process)
+    await dedup.run(make_event(updated_at=2), process)
+    await dedup.run(make_event(action="Close", updated_at=1), process)
+
+    assert process.calls == 3
+
+
+@pytest.mark.asyncio
+async def test_window_disabled() -> None:
+    """Test that replays are processed when the window is disabled."""
+    dedup = EventDeduplicator(InMemoryStateBackend(), window=0)
+    process = CountingProcessor()
+
+    await dedup.run(make_event(updated_at=1), process)
+    await dedup.run(make_event(updated_at=1), process)
+
+    assert process.calls == 2
+
+
+@pytest.mark.asyncio
+async def test_errors_are_not_stored() -> None:
+    """Test that failed processing is retried on redelivery."""
+    dedup = EventDeduplicator(InMemoryStateBackend(), window=60)
+
+    async def fail(event: OpsgenieEvent) -> dict[str, Any]:
+        raise RuntimeError("boom")
+
+    with pytest.raises(RuntimeError):
+        await dedup.run(make_event(updated_at=1), fail)
+
+    process = CountingProcessor()
+    await dedup.run(make_event(updated_at=1), process)
+    assert process.calls == 1
+
+
+@pytest.mark.asyncio
+async def test_replay_across_workers() -> None:
+    """Test that workers sharing state process a delivery once."""
+    state = InMemoryStateBackend()
+    first, second = EventDeduplicator(state, window=60), EventDeduplicator(state, window=60)
+    process = CountingProcessor(delay=0.01)
+
+    running, duplicate = await asyncio.gather(
+        first.run(make_event(updated_at=1), process),
+        second.run(make_event(updated_at=1), process),
+    )
+    replay = await second.run(make_event(updated_at=1), process)
+
+    assert process.calls == 1
+    assert running == {"status": "processed", "call": 1}
+    assert duplicate["status"] == "duplicate"
+    assert replay == {"status": "processed", "call": 1, "deduplicated": True}
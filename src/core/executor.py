@@ -0,0 +1,158 @@
+import asyncio
+import contextvars
+import functools
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Optional, TypeVar
+
+import structlog
+
+from core.config import settings
+
+logger = structlog.get_logger()
+
+T = TypeVar("T")
+
+
+class _ServiceLimiter:
+    """Concurrency limit and counters for a single service."""
+
+    def __init__(self, limit: int) -> None:
+        self.limit = limit
+        self.in_flight = 0
+        self.waiting = 0
+        self.completed = 0
+        self.failed = 0
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def semaphore(self) -> asyncio.Semaphore:
+        """Get semaphore bound to the running event loop."""
+        loop = asyncio.get_running_loop()
+        if self._semaphore is None or self._loop is not loop:
+            self._semaphore = asyncio.Semaphore(self.limit)
+            self._loop = loop
+        return self._semaphore
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "limit": self.limit,
+            "in_flight": self.in_flight,
+            "waiting": self.waiting,
+            "completed": self.completed,
+            "failed": self.failed,
+        }
+
+
+class BlockingExecutor:
+    """Shared thread pool for blocking SDK calls with per-service limits.
+
+    Every service gets its own concurrency limit, so a slow backend can hold
+    at most `limit` pool threads and cannot starve the others.
+    """
+
+    def __init__(
+        self,
+        max_workers: int = 32,
+        default_limit: int = 8,
+        service_limits: Optional[dict[str, int]] = None,
+    ) -> None:
+        """Initialize executor.
+
+        Args:
+            max_workers: Size of the shared thread pool
+            default_limit: Concurrency limit for services without explicit one
+            service_limits: Concurrency limits by service name
+        """
+        self._max_workers = max_workers
+        self._default_limit = default_limit
+        self._service_limits = dict(service_limits or {})
+        self._limiters: dict[str, _ServiceLimiter] = {}
+        self._pool: Optional[ThreadPoolExecutor] = None
+
+    def _get_pool(self) -> ThreadPoolExecutor:
+        """Create thread pool on first use."""
+        if self._pool is None:
+            self._pool = ThreadPoolExecutor(
+                max_workers=self._max_workers,
+                thread_name_prefix="blocking",
+            )
+        return self._pool
+
+    def _get_limiter(self, service: str) -> _ServiceLimiter:
+        limiter = self._limiters.get(service)
+        if limiter is None:
+            limit = self._service_limits.get(service, self._default_limit)
+            limiter = self._limiters[service] = _ServiceLimiter(limit)
+        return limiter
+
+    async def run(
+        self,
+        service: str,
+        func: Callable[..., T],
+        *args: Any,
+        **kwargs: Any,
+    ) -> T:
+        """Run a blocking call in the thread pool.
+
+        Args:
+            service: Name of the service the call belongs to
+            func: Blocking callable
+            *args: Positional arguments for the callable
+            **kwargs: Keyword arguments for the callable
+
+        Returns:
+            Result of the callable
+        """
+        limiter = self._get_limiter(service)
+        limiter.waiting += 1
+        try:
+            await limiter.semaphore().acquire()
+        finally:
+            limiter.waiting -= 1
+
+        limiter.in_flight += 1
+        try:
+            loop = asyncio.get_running_loop()
+            context = contextvars.copy_context()
+            call = functools.partial(context.run, func, *args, **kwargs)
+            result = await loop.run_in_executor(self._get_pool(), call)
+        except BaseException:
+            limiter.failed += 1
+            raise
+        finally:
+            limiter.in_flight -= 1
+            limiter.semaphore().release()
+
+        limiter.completed += 1
+        return result
+
+    def stats(self) -> dict[str, Any]:
+        """Get pool and per-service statistics."""
+        services = {name: limiter.stats() for name, limiter in self._limiters.items()}
+        in_flight = sum(s["in_flight"] for s in services.values())
+        return {
+            "max_workers": self._max_workers,
+            "in_flight": in_flight,
+            "pool_backlog": max(0, in_flight - self._max_workers),
+            "services": services,
+        }
+
+    def shutdown(self, wait: bool = True) -> None:
+        """Shut down the thread pool.
+
+        The pool is recreated on the next call, so the executor stays usable.
+
+        Args:
+            wait: Wait for running calls to finish
+        """
+        if self._pool is not None:
+            self._pool.shutdown(wait=wait, cancel_futures=True)
+            self._pool = None
+            logger.info("executor.shutdown")
+
+
+executor = BlockingExecutor(
+    max_workers=settings.executor_max_workers,
+    default_limit=settings.executor_default_limit,
+    service_limits=settings.executor_service_limits,
+)
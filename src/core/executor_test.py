@@ -0,0 +1,67 @@
+import asyncio
+import threading
+
+import pytest
+
+from core.executor import BlockingExecutor
+
+
+@pytest.fixture
+def executor() -> BlockingExecutor:
+    """Executor with a small pool for testing."""
+    executor = BlockingExecutor(max_workers=4, default_limit=2, service_limits={"slow": 1})
+    yield executor
+    executor.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_run_returns_result(executor: BlockingExecutor) -> None:
+    """Test that blocking call result is returned."""
+    result = await executor.run("github", lambda a, b=0: a + b, 1, b=2)
+
+    assert result == 3
+    assert executor.stats()["services"]["github"]["completed"] == 1
+
+
+@pytest.mark.asyncio
+async def test_run_off_event_loop_thread(executor: BlockingExecutor) -> None:
+    """Test that calls run outside of the event loop thread."""
+    thread = await executor.run("github", threading.current_thread)
+
+    assert thread is not threading.current_thread()
+
+
+@pytest.mark.asyncio
+async def test_run_propagates_errors(executor: BlockingExecutor) -> None:
+    """Test that exceptions are re-raised and counted."""
+    def fail() -> None:
+        raise ValueError("boom")
+
+    with pytest.raises(ValueError, match="boom"):
+        await executor.run("github", fail)
+
+    assert executor.stats()["services"]["github"]["failed"] == 1
+
+
+@pytest.mark.asyncio
+async def test_service_limit(executor: BlockingExecutor) -> None:
+    """Test that a service cannot exceed its concurrency limit."""
+    release = threading.Event()
+
+    tasks = [
+        asyncio.create_task(executor.run("slow", release.wait, 5))
+        for _ in range(3)
+    ]
+    await asyncio.sleep(0.05)
+
+    slow = executor.stats()["services"]["slow"]
+    assert slow["limit"] == 1
+    assert slow["in_flight"] == 1
+    assert slow["waiting"] == 2
+
+    # Other services are not blocked by the slow one
+    assert await executor.run("fast", lambda: "ok") == "ok"
+
+    release.set()
+    await asyncio.gather(*tasks)
+    assert executor.stats()["services"]["slow"]["completed"] == 3
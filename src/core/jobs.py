@@ -0,0 +1,256 @@
+import asyncio
+import time
+import uuid
+from typing import Any, Awaitable, Callable, Optional
+
+import structlog
+
+from core.journal import EventJournal
+from core.state import StateBackend
+from models.events import OpsgenieEvent
+from models.jobs import Job, JobStatus
+
+logger = structlog.get_logger()
+
+
+EventProcessor = Callable[[OpsgenieEvent], Awaitable[dict[str, Any]]]
+EventHook = Callable[[OpsgenieEvent], Awaitable[None]]
+
+
+class QueueFullError(Exception):
+    """Raised when the job queue cannot accept more events."""
+
+
+class JobQueue:
+    """Bounded in-process queue of events served by a pool of workers.
+
+    Job status is kept in the state backend, so with a shared backend it can
+    be looked up from any worker or replica. With a journal, events are
+    recorded durably before they are accepted and acknowledged once
+    processed; unfinished events of dead processes are replayed as jobs.
+    """
+
+    def __init__(
+        self,
+        process: EventProcessor,
+        state: StateBackend,
+        max_size: int = 1000,
+        workers: int = 4,
+        ttl: float = 3600.0,
+        journal: Optional[EventJournal] = None,
+        on_replay: Optional[EventHook] = None,
+    ) -> None:
+        """Initialize job queue.
+
+        Args:
+            process: Coroutine function that processes a single event
+            state: State backend keeping job status
+            max_size: Maximum number of queued (not yet started) jobs
+            workers: Number of concurrent workers
+            ttl: Seconds job status is kept for lookups
+            journal: Durable journal of accepted events, None keeps them in memory only
+            on_replay: Coroutine called with a replayed event before it is
+                queued, e.g. to release claims its dead process held
+        """
+        self._process = process
+        self._state = state
+        self._max_size = max_size
+        self._workers_count = workers
+        self._ttl = ttl
+        self._journal = journal
+        self._on_replay = on_replay
+        self._queue: Optional[asyncio.Queue[tuple[Job, OpsgenieEvent, Optional[int]]]] = None
+        self._workers: list[asyncio.Task[None]] = []
+        self._recovery: Optional[asyncio.Task[None]] = None
+        self.in_progress = 0
+        self.completed = 0
+        self.failed = 0
+
+    @property
+    def running(self) -> bool:
+        """Whether workers are started."""
+        return bool(self._workers)
+
+    async def start(self) -> None:
+        """Create the queue, start workers and replay unfinished events."""
+        if self.running:
+            return
+        self._queue = asyncio.Queue(maxsize=self._max_size)
+        self._workers = [
+            asyncio.create_task(self._worker(i), name=f"job-worker-{i}")
+            for i in range(self._workers_count)
+        ]
+        if self._journal is not None:
+            await self._journal.open()
+            self._recovery = asyncio.create_task(self._recover(), name="job-recovery")
+        logger.info("job_queue.started", workers=self._workers_count, max_size=self._max_size)
+
+    async def stop(self, timeout: float = 10.0) -> None:
+        """Wait for queued jobs to finish and stop workers.
+
+        Args:
+            timeout: Seconds to wait for the queue to drain before cancelling
+        """
+        if not self.running or self._queue is None:
+            return
+        if self._recovery is not None:
+            self._recovery.cancel()
+            await asyncio.gather(self._recovery, return_exceptions=True)
+            self._recovery = None
+        try:
+            await asyncio.wait_for(self._queue.join(), timeout=timeout)
+        except asyncio.TimeoutError:
+            logger.warning("job_queue.drain_timeout", pending=self._queue.qsize())
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+        if self._journal is not None:
+            # Jobs cut off by the timeout stay journaled and are replayed
+            await self._journal.close()
+        logger.info("job_queue.stopped")
+
+    async def submit(self, event: OpsgenieEvent) -> Job:
+        """Enqueue an event for background processing.
+
+        Args:
+            event: The Opsgenie event to process
+
+        Returns:
+            The created job
+
+        Raises:
+            QueueFullError: If the queue is full or not running
+        """
+        if self._queue is None or not self.running:
+            raise QueueFullError("Job queue is not running")
+        if self._queue.full():
+            raise QueueFullError("Job queue is full")
+
+        job = Job(
+            id=uuid.uuid4().hex,
+            action=event.action,
+            alert_id=event.alert.alert_id,
+            created_at=time.time(),
+        )
+        # Stored before it is queued, so a worker cannot overwrite a later status
+        await self._save(job)
+        entry_id = await self._journal.append(event, job.id) if self._journal else None
+        try:
+            self._queue.put_nowait((job, event, entry_id))
+        except asyncio.QueueFull:
+            await self._state.delete(f"job:{job.id}")
+            if self._journal is not None and entry_id is not None:
+                await self._journal.ack(entry_id)
+            raise QueueFullError("Job queue is full") from None
+
+        return job
+
+    async def run(self, event: OpsgenieEvent) -> dict[str, Any]:
+        """Process an event in the calling task.
+
+        With a journal the event is recorded first, so it is replayed as a
+        job if the process dies before it is processed.
+
+        Args:
+            event: The Opsgenie event to process
+
+        Returns:
+            Processing result
+        """
+        if self._journal is None:
+            return await self._process(event)
+
+        entry_id = await self._journal.append(event, uuid.uuid4().hex)
+        try:
+            return await self._process(event)
+        finally:
+            # A failed ack only means a replay, it must not replace the result
+            try:
+                await self._journal.ack(entry_id)
+            except Exception as e:
+                logger.exception("job_queue.ack_failed", entry_id=entry_id, error=str(e))
+
+    async def get(self, job_id: str) -> Optional[Job]:
+        """Get job by id.
+
+        Args:
+            job_id: Job identifier
+
+        Returns:
+            Job if it is known, None otherwise
+        """
+        stored = await self._state.get(f"job:{job_id}")
+        return Job.model_validate_json(stored) if stored is not None else None
+
+    def stats(self) -> dict[str, Any]:
+        """Get queue statistics."""
+        return {
+            "workers": len(self._workers),
+            "max_size": self._max_size,
+            "queued": self._queue.qsize() if self._queue else 0,
+            "in_progress": self.in_progress,
+            "completed": self.completed,
+            "failed": self.failed,
+            "journal": self._journal.stats() if self._journal else None,
+        }
+
+    async def _recover(self) -> None:
+        """Queue unfinished journal entries of dead processes, until cancelled."""
+        assert self._journal is not None and self._queue is not None
+        while True:
+            try:
+                for entry in await self._journal.claim_orphans():
+                    job = Job(
+                        id=entry.job_id,
+                        action=entry.event.action,
+                        alert_id=entry.event.alert.alert_id,
+                        created_at=time.time(),
+                    )
+                    await self._save(job)
+                    if self._on_replay is not None:
+                        await self._on_replay(entry.event)
+                    # Waits for free space instead of rejecting replayed events
+                    await self._queue.put((job, entry.event, entry.id))
+            except Exception as e:
+                logger.exception("job_queue.recovery_failed", error=str(e))
+            await asyncio.sleep(self._journal.lease)
+
+    async def _save(self, job: Job) -> None:
+        """Store job status for lookups."""
+        await self._state.set(f"job:{job.id}", job.model_dump_json(), ttl=self._ttl)
+
+    async def _worker(self, index: int) -> None:
+        """Process jobs from the queue until cancelled."""
+        assert self._queue is not None
+        while True:
+            job, event, entry_id = await self._queue.get()
+            job.status = JobStatus.RUNNING
+            job.started_at = time.time()
+            self.in_progress += 1
+            try:
+                await self._save(job)
+                job.result = await self._process(event)
+                job.status = JobStatus.DONE
+                self.completed += 1
+            except Exception as e:
+                logger.exception(
+                    "job_queue.job_failed",
+                    job_id=job.id,
+                    alert_id=job.alert_id,
+                    worker=index,
+                    error=str(e),
+                )
+                job.error = str(e)
+                job.status = JobStatus.FAILED
+                self.failed += 1
+            self.in_progress -= 1
+            job.finished_at = time.time()
+            try:
+                await self._save(job)
+                if self._journal is not None and entry_id is not None:
+                    await self._journal.ack(entry_id)
+            except Exception as e:
+                logger.exception("job_queue.save_failed", job_id=job.id, error=str(e))
+            finally:
+                self._queue.task_done()
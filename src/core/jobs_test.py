@@ -0,0 +1,117 @@
+import asyncio
+from typing import Any
+
+import pytest
+
+from core.jobs import JobQueue, QueueFullError
+from core.state import InMemoryStateBackend
+from models.events import Alert, OpsgenieEvent, Source
+from models.jobs import JobStatus
+
+
+@pytest.fixture
+def sample_event() -> OpsgenieEvent:
+    """Sample Opsgenie event."""
+    return OpsgenieEvent(
+        action="Create",
+        integrationId="test-integration",
+        integrationName="Test Integration",
+        source=Source(name="Test Source", type="API"),
+        alert=Alert(
+            alertId="test-alert-id",
+            message="Test Alert",
+            tags=["test"],
+            tinyId="1234",
+            alias="test-alias",
+            createdAt=0,
+            updatedAt=0,
+            username="test-user",
+            userId="test-user-id",
+            entity="test-entity",
+        ),
+    )
+
+
+@pytest.mark.asyncio
+async def test_job_processed(sample_event: OpsgenieEvent) -> None:
+    """Test that submitted job is processed by a worker."""
+    async def process(event: OpsgenieEvent) -> dict[str, Any]:
+        return {"status": "processed", "alert_id": event.alert.alert_id}
+
+    queue = JobQueue(process=process, state=InMemoryStateBackend(), max_size=10, workers=2)
+    await queue.start()
+    job = await queue.submit(sample_event)
+    assert job.status == JobStatus.QUEUED
+    await queue.stop()
+
+    stored = await queue.get(job.id)
+    assert stored is not None
+    assert stored.status == JobStatus.DONE
+    assert stored.result == {"status": "processed", "alert_id": "test-alert-id"}
+
+
+@pytest.mark.asyncio
+async def test_job_failed(sample_event: OpsgenieEvent) -> None:
+    """Test that handler exception marks job as failed."""
+    async def process(event: OpsgenieEvent) -> dict[str, Any]:
+        raise RuntimeError("boom")
+
+    queue = JobQueue(process=process, state=InMemoryStateBackend(), max_size=10, workers=1)
+    await queue.start()
+    job = await queue.submit(sample_event)
+    await queue.stop()
+
+    assert job.status == JobStatus.FAILED
+    assert job.error == "boom"
+
+
+@pytest.mark.asyncio
+async def test_queue_full(sample_event: OpsgenieEvent) -> None:
+    """Test backpressure when the queue is full."""
+    release = asyncio.Event()
+
+    async def process(event: OpsgenieEvent) -> dict[str, Any]:
+        await release.wait()
+        return {"status": "processed"}
+
+    queue = JobQueue(process=process, state=InMemoryStateBackend(), max_size=1, workers=1)
+    await queue.start()
+    await queue.submit(sample_event)
+    await asyncio.sleep(0)  # let the worker pick up the first job
+    await queue.submit(sample_event)
+
+    with pytest.raises(QueueFullError):
+        await queue.submit(sample_event)
+
+    release.set()
+    await queue.stop()
+
+
+@pytest.mark.asyncio
+async def test_submit_without_start(sample_event: OpsgenieEvent) -> None:
+    """Test that submitting to a stopped queue is rejected."""
+    async def process(event: OpsgenieEvent) -> dict[str, Any]:
+        return {}
+
+    queue = JobQueue(process=process, state=InMemoryStateBackend())
+    with pytest.raises(QueueFullError):
+        await queue.submit(sample_event)
+
+
+@pytest.mark.asyncio
+async def test_status_shared_through_state(sample_event: OpsgenieEvent) -> None:
+    """Test that job status is visible to another queue on the same state."""
+    async def process(event: OpsgenieEvent) -> dict[str, Any]:
+        return {"status": "processed"}
+
+    state = InMemoryStateBackend()
+    queue = JobQueue(process=process, state=state, max_size=10, workers=1)
+    other = JobQueue(process=process, state=state)
+    await queue.start()
+    job = await queue.submit(sample_event)
+    await queue.stop()
+
+    stored = await other.get(job.id)
+    assert stored is not None
+    assert stored.status == JobStatus.DONE
+    assert await other.get("unknown") is None
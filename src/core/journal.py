@@ -0,0 +1,313 @@
+import asyncio
+import sqlite3
+import time
+import uuid
+from dataclasses import dataclass
+from typing import Any, Callable, Optional, TypeVar
+
+import structlog
+
+from core.executor import executor
+from models.events import OpsgenieEvent
+
+logger = structlog.get_logger()
+
+T = TypeVar("T")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS events (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    owner TEXT NOT NULL,
+    job_id TEXT NOT NULL,
+    payload TEXT NOT NULL,
+    created_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS events_owner ON events (owner);
+CREATE TABLE IF NOT EXISTS owners (
+    owner TEXT PRIMARY KEY,
+    heartbeat REAL NOT NULL
+);
+"""
+
+
+@dataclass(frozen=True, slots=True)
+class JournalEntry:
+    """Unfinished event read back from the journal."""
+
+    id: int
+    job_id: str
+    event: OpsgenieEvent
+
+
+@dataclass(slots=True)
+class _Write:
+    """Append or acknowledgement waiting for the next group commit."""
+
+    future: asyncio.Future[Optional[int]]
+    entry_id: Optional[int] = None  # Set for acknowledgements
+    job_id: str = ""
+    payload: str = ""
+
+
+class EventJournal:
+    """Durable journal of accepted events in a SQLite database in WAL mode.
+
+    Events are appended before they are acknowledged to the sender and
+    deleted once processed, so whatever is left belongs to a process that
+    died mid-flight. Every process owning entries keeps a heartbeat; entries
+    of an owner whose heartbeat is older than the lease are claimed and
+    replayed by a live process (at-least-once).
+
+    Appends and acknowledgements arriving within the commit interval share
+    one transaction, so a burst costs one fsync instead of one per event.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        lease: float = 30.0,
+        commit_interval: float = 0.002,
+        max_batch: int = 512,
+    ) -> None:
+        """Initialize journal.
+
+        Args:
+            path: Path of the SQLite database
+            lease: Seconds without heartbeat after which entries of a process are replayed
+            commit_interval: Seconds to gather writes into one commit
+            max_batch: Maximum number of writes per commit
+        """
+        self._path = path
+        self._lease = lease
+        self._commit_interval = commit_interval
+        self._max_batch = max_batch
+        self.owner = uuid.uuid4().hex
+        self._connection: Optional[sqlite3.Connection] = None
+        self._lock = asyncio.Lock()
+        self._pending: list[_Write] = []
+        self._wakeup = asyncio.Event()
+        self._committer: Optional[asyncio.Task[None]] = None
+        self._closing = False
+        self.appended = 0
+        self.acked = 0
+        self.commits = 0
+        self.replayed = 0
+
+    @property
+    def lease(self) -> float:
+        """Seconds without heartbeat after which entries of a process are replayed."""
+        return self._lease
+
+    async def _call(self, func: Callable[..., T], *args: Any) -> T:
+        """Run a database call in the executor, one at a time."""
+        async with self._lock:
+            return await executor.run("journal", func, *args)
+
+    async def open(self) -> None:
+        """Open the database and start the committer."""
+        if self._connection is not None:
+            return
+        # Bound to the loop opening the journal, it may differ from a previous one
+        self._lock = asyncio.Lock()
+        self._wakeup = asyncio.Event()
+        self._closing = False
+        self._connection = await self._call(self._connect)
+        await self._call(self._heartbeat)
+        self._committer = asyncio.create_task(self._commit_loop(), name="journal-committer")
+        logger.info("journal.opened", path=self._path, owner=self.owner)
+
+    def _connect(self) -> sqlite3.Connection:
+        connection = sqlite3.connect(self._path, isolation_level=None, check_same_thread=False)
+        connection.execute("PRAGMA journal_mode=WAL")
+        # FULL syncs the WAL on every commit, NORMAL would lose the last ones on power loss
+        connection.execute("PRAGMA synchronous=FULL")
+        connection.execute("PRAGMA busy_timeout=5000")
+        connection.executescript(SCHEMA)
+        return connection
+
+    async def close(self) -> None:
+        """Commit pending writes, release ownership and close the database.
+
+        Entries still unfinished become claimable by other processes right
+        away instead of after the lease.
+        """
+        if self._connection is None:
+            return
+        self._closing = True
+        self._wakeup.set()
+        if self._committer is not None:
+            await asyncio.gather(self._committer, return_exceptions=True)
+            self._committer = None
+        await self._commit_pending()
+        await self._call(self._release)
+        connection, self._connection = self._connection, None
+        await self._call(connection.close)
+        logger.info("journal.closed", owner=self.owner)
+
+    async def append(self, event: OpsgenieEvent, job_id: str) -> int:
+        """Durably record an event.
+
+        Args:
+            event: The Opsgenie event
+            job_id: Job the event is processed as
+
+        Returns:
+            Journal entry id, to be acknowledged when processed
+        """
+        entry_id = await self._enqueue(_Write(
+            future=asyncio.get_running_loop().create_future(),
+            job_id=job_id,
+            payload=event.model_dump_json(by_alias=True),
+        ))
+        assert entry_id is not None
+        self.appended += 1
+        return entry_id
+
+    async def ack(self, entry_id: int) -> None:
+        """Mark an entry as processed, removing it from the journal.
+
+        Args:
+            entry_id: Id returned by `append`
+        """
+        await self._enqueue(_Write(
+            future=asyncio.get_running_loop().create_future(),
+            entry_id=entry_id,
+        ))
+        self.acked += 1
+
+    async def _enqueue(self, write: _Write) -> Optional[int]:
+        """Queue a write for the next group commit and wait for it."""
+        if self._connection is None or self._closing:
+            raise RuntimeError("Journal is not open")
+        self._pending.append(write)
+        self._wakeup.set()
+        return await write.future
+
+    async def _commit_loop(self) -> None:
+        """Commit queued writes in batches, heartbeating when idle."""
+        while not self._closing:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self._lease / 3)
+            except asyncio.TimeoutError:
+                try:
+                    await self._call(self._heartbeat)
+                except Exception as e:
+                    logger.warning("journal.heartbeat_failed", error=str(e))
+                continue
+            if self._commit_interval > 0 and not self._closing:
+                await asyncio.sleep(self._commit_interval)
+            self._wakeup.clear()
+            await self._commit_pending()
+
+    async def _commit_pending(self) -> None:
+        """Commit queued writes, resolving their futures."""
+        while self._pending:
+            batch = self._pending[:self._max_batch]
+            del self._pending[:self._max_batch]
+            try:
+                ids = await self._call(self._commit, batch)
+            except Exception as e:
+                logger.exception("journal.commit_failed", writes=len(batch), error=str(e))
+                for write in batch:
+                    if not write.future.done():
+                        write.future.set_exception(e)
+                continue
+
+            self.commits += 1
+            for write, entry_id in zip(batch, ids):
+                if not write.future.done():
+                    write.future.set_result(entry_id)
+
+    def _commit(self, batch: list[_Write]) -> list[Optional[int]]:
+        """Write a batch in one transaction."""
+        assert self._connection is not None
+        cursor = self._connection.cursor()
+        now = time.time()
+        ids: list[Optional[int]] = []
+        cursor.execute("BEGIN IMMEDIATE")
+        try:
+            for write in batch:
+                if write.entry_id is not None:
+                    cursor.execute("DELETE FROM events WHERE id = ?", (write.entry_id,))
+                    ids.append(write.entry_id)
+                else:
+                    cursor.execute(
+                        "INSERT INTO events (owner, job_id, payload, created_at) VALUES (?, ?, ?, ?)",
+                        (self.owner, write.job_id, write.payload, now),
+                    )
+                    ids.append(cursor.lastrowid)
+            cursor.execute(
+                "INSERT OR REPLACE INTO owners (owner, heartbeat) VALUES (?, ?)",
+                (self.owner, now),
+            )
+            cursor.execute("COMMIT")
+        except BaseException:
+            cursor.execute("ROLLBACK")
+            raise
+        return ids
+
+    def _heartbeat(self) -> None:
+        assert self._connection is not None
+        self._connection.execute(
+            "INSERT OR REPLACE INTO owners (owner, heartbeat) VALUES (?, ?)",
+            (self.owner, time.time()),
+        )
+
+    def _release(self) -> None:
+        assert self._connection is not None
+        self._connection.execute("DELETE FROM owners WHERE owner = ?", (self.owner,))
+
+    async def claim_orphans(self) -> list[JournalEntry]:
+        """Take over unfinished entries of processes without a live heartbeat.
+
+        Returns:
+            Entries to replay, oldest first
+        """
+        rows = await self._call(self._claim)
+        entries = []
+        for entry_id, job_id, payload in sorted(rows):
+            try:
+                entries.append(JournalEntry(
+                    id=entry_id,
+                    job_id=job_id,
+                    event=OpsgenieEvent.model_validate_json(payload),
+                ))
+            except ValueError as e:
+                # Cannot be processed ever, drop it instead of replaying forever
+                logger.error("journal.invalid_entry", entry_id=entry_id, error=str(e))
+                await self.ack(entry_id)
+        if entries:
+            self.replayed += len(entries)
+            logger.warning("journal.replaying", entries=len(entries), owner=self.owner)
+        return entries
+
+    def _claim(self) -> list[tuple[int, str, str]]:
+        assert self._connection is not None
+        cursor = self._connection.cursor()
+        expired = time.time() - self._lease
+        cursor.execute("BEGIN IMMEDIATE")
+        try:
+            rows = cursor.execute(
+                """
+                UPDATE events SET owner = ?
+                WHERE owner != ? AND owner NOT IN (SELECT owner FROM owners WHERE heartbeat > ?)
+                RETURNING id, job_id, payload
+                """,
+                (self.owner, self.owner, expired),
+            ).fetchall()
+            cursor.execute("DELETE FROM owners WHERE heartbeat <= ?", (expired,))
+            cursor.execute("COMMIT")
+        except BaseException:
+            cursor.execute("ROLLBACK")
+            raise
+        return rows
+
+    def stats(self) -> dict[str, Any]:
+        """Get journal statistics."""
+        return {
+            "pending_writes": len(self._pending),
+            "appended": self.appended,
+            "acked": self.acked,
+            "commits": self.commits,
+            "replayed": self.replayed,
+        }
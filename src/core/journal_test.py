@@ -0,0 +1,179 @@
+import asyncio
+import sqlite3
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+from core.dedup import EventDeduplicator, replay_key
+from core.jobs import JobQueue
+from core.journal import EventJournal
+from core.state import InMemoryStateBackend
+from models.events import Alert, OpsgenieEvent, Source
+from models.jobs import JobStatus
+
+
+def make_event(alert_id: str = "test-alert-id") -> OpsgenieEvent:
+    """Build an Opsgenie event."""
+    return OpsgenieEvent(
+        action="Create",
+        integrationId="test-integration",
+        integrationName="Test Integration",
+        source=Source(name="Test Source", type="API"),
+        alert=Alert(
+            alertId=alert_id,
+            message="Test Alert",
+            tags=["test"],
+            tinyId="1234",
+            alias="test-alias",
+            createdAt=0,
+            updatedAt=0,
+            username="test-user",
+            userId="test-user-id",
+            entity="test-entity",
+        ),
+    )
+
+
+async def crash(journal: EventJournal) -> None:
+    """Stop a journal the way a killed process would, without releasing ownership."""
+    assert journal._committer is not None and journal._connection is not None
+    journal._committer.cancel()
+    await asyncio.gather(journal._committer, return_exceptions=True)
+    journal._connection.close()
+
+
+@pytest.mark.asyncio
+async def test_group_commit(tmp_path: Path) -> None:
+    """Test that concurrent appends share commits and acks remove entries."""
+    journal = EventJournal(str(tmp_path / "journal.db"), commit_interval=0.01)
+    await journal.open()
+
+    ids = await asyncio.gather(*(journal.append(make_event(f"a-{i}"), f"job-{i}") for i in range(100)))
+    await asyncio.gather(*(journal.ack(entry_id) for entry_id in ids))
+
+    assert len(set(ids)) == 100
+    assert journal.stats()["commits"] <= 4
+    await journal.close()
+
+    other = EventJournal(str(tmp_path / "journal.db"))
+    await other.open()
+    assert await other.claim_orphans() == []
+    await other.close()
+
+
+@pytest.mark.asyncio
+async def test_crashed_entries_replayed_after_lease(tmp_path: Path) -> None:
+    """Test that entries of a dead process are claimed once its lease expires."""
+    path = str(tmp_path / "journal.db")
+    dead = EventJournal(path, lease=0.2)
+    await dead.open()
+    entry_id = await dead.append(make_event("crashed"), "job-1")
+    await crash(dead)
+
+    alive = EventJournal(path, lease=0.2)
+    await alive.open()
+    assert await alive.claim_orphans() == []
+
+    await asyncio.sleep(0.25)
+    entries = await alive.claim_orphans()
+    assert [(e.id, e.job_id, e.event.alert.alert_id) for e in entries] == [(entry_id, "job-1", "crashed")]
+    assert await alive.claim_orphans() == []
+    await alive.close()
+
+
+@pytest.mark.asyncio
+async def test_job_queue_replays_unfinished_events(tmp_path: Path) -> None:
+    """Test that a restarted queue processes events accepted before shutdown."""
+    path = str(tmp_path / "journal.db")
+    previous = EventJournal(path)
+    await previous.open()
+    await previous.append(make_event("accepted"), "job-1")
+    await previous.close()
+
+    processed: list[str] = []
+
+    async def process(event: OpsgenieEvent) -> dict[str, Any]:
+        processed.append(event.alert.alert_id)
+        return {"status": "processed"}
+
+    journal = EventJournal(path)
+    queue = JobQueue(process=process, state=InMemoryStateBackend(), workers=1, journal=journal)
+    await queue.start()
+    for _ in range(100):
+        job = await queue.get("job-1")
+        if job is not None and job.status == JobStatus.DONE:
+            break
+        await asyncio.sleep(0.01)
+    job = await queue.submit(make_event("submitted"))
+    await queue.stop()
+
+    assert processed == ["accepted", "submitted"]
+    assert journal.stats()["replayed"] == 1
+
+    restarted = EventJournal(path)
+    await restarted.open()
+    assert await restarted.claim_orphans() == []
+    await restarted.close()
+
+
+@pytest.mark.asyncio
+async def test_run_keeps_result_when_ack_fails(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Test that a failed ack does not turn a processed event into an error."""
+    async def process(event: OpsgenieEvent) -> dict[str, Any]:
+        return {"status": "processed"}
+
+    async def ack(entry_id: int) -> None:
+        raise sqlite3.OperationalError("database is locked")
+
+    journal = EventJournal(str(tmp_path / "journal.db"))
+    queue = JobQueue(process=process, state=InMemoryStateBackend(), workers=1, journal=journal)
+    await queue.start()
+    monkeypatch.setattr(journal, "ack", ack)
+
+    result = await queue.run(make_event())
+    await queue.stop()
+
+    assert result == {"status": "processed"}
+
+
+@pytest.mark.asyncio
+async def test_replay_takes_over_stale_claim(tmp_path: Path) -> None:
+    """Test that a replayed event is processed although its dead process still holds the claim."""
+    path = str(tmp_path / "journal.db")
+    state = InMemoryStateBackend()
+    dedup = EventDeduplicator(state, window=60)
+    dead = EventJournal(path)
+    await dead.open()
+    event = make_event("crashed")
+    await dead.append(event, "job-1")
+    # Claimed by the process that died before finishing it
+    await state.add(f"dedup:claim:{replay_key(event)}", "1", ttl=60)
+    await dead.close()
+
+    processed: list[str] = []
+
+    async def handle(event: OpsgenieEvent) -> dict[str, Any]:
+        processed.append(event.alert.alert_id)
+        return {"status": "processed"}
+
+    journal = EventJournal(path)
+    queue = JobQueue(
+        process=lambda event: dedup.run(event, handle),
+        state=state,
+        workers=1,
+        journal=journal,
+        on_replay=dedup.release,
+    )
+    await queue.start()
+    for _ in range(100):
+        job = await queue.get("job-1")
+        if job is not None and job.status == JobStatus.DONE:
+            break
+        await asyncio.sleep(0.01)
+    await queue.stop()
+
+    assert processed == ["crashed"]
+    assert job is not None and job.result == {"status": "processed"}
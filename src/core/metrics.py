@@ -0,0 +1,412 @@
+import asyncio
+import functools
+import math
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from typing import Any, Awaitable, Callable, Iterator, Optional, TypeVar
+
+T = TypeVar("T")
+
+# Seconds, from a cached lookup to a slow GitHub search
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def _format_value(value: float) -> str:
+    if value == math.inf:
+        return "+Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: tuple[str, ...], values: tuple[str, ...], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+class _Metric:
+    """Metric family with one child per label value combination.
+
+    Children are plain objects updated with `+=` from the event loop thread,
+    so recording takes no lock; creating a child is a single dict
+    `setdefault`, which is atomic under the GIL.
+    """
+
+    type = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: tuple[str, ...] = ()) -> None:
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = labelnames
+        self._children: dict[tuple[str, ...], Any] = {}
+        if not labelnames:
+            self._children[()] = self._new_child()
+
+    def _new_child(self) -> Any:
+        raise NotImplementedError
+
+    def labels(self, *values: str) -> Any:
+        """Get the child for label values, in `labelnames` order."""
+        child = self._children.get(values)
+        if child is None:
+            if len(values) != len(self.labelnames):
+                raise ValueError(f"{self.name} expects labels {self.labelnames}")
+            child = self._children.setdefault(values, self._new_child())
+        return child
+
+    def _samples(self) -> Iterator[str]:
+        raise NotImplementedError
+
+    def render(self) -> str:
+        """Render the family in Prometheus text format."""
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.type}"]
+        lines.extend(self._samples())
+        return "\n".join(lines)
+
+
+class _CounterChild:
+    __slots__ = ("value",)
+
+    def __init__(self) -> None:
+        self.value = 0.0
+
+    def inc(self, amount: float = 1.0) -> None:
+        self.value += amount
+
+
+class Counter(_Metric):
+    """Monotonically increasing count."""
+
+    type = "counter"
+
+    def _new_child(self) -> _CounterChild:
+        return _CounterChild()
+
+    def inc(self, amount: float = 1.0) -> None:
+        """Increment the unlabelled counter."""
+        self._children[()].inc(amount)
+
+    def _samples(self) -> Iterator[str]:
+        for values, child in list(self._children.items()):
+            yield f"{self.name}{_format_labels(self.labelnames, values)} {_format_value(child.value)}"
+
+
+class Gauge(_Metric):
+    """Value read from a callback when metrics are collected.
+
+    The callback returns a value per label value tuple, so gauges such as
+    queue depth cost nothing on the request path.
+    """
+
+    type = "gauge"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        callback: Callable[[], dict[tuple[str, ...], float]],
+        labelnames: tuple[str, ...] = (),
+    ) -> None:
+        self._callback = callback
+        super().__init__(name, documentation, labelnames)
+
+    def _new_child(self) -> None:
+        return None
+
+    def _samples(self) -> Iterator[str]:
+        for values, value in self._callback().items():
+            yield f"{self.name}{_format_labels(self.labelnames, values)} {_format_value(value)}"
+
+
+class _HistogramChild:
+    __slots__ = ("buckets", "counts", "sum")
+
+    def __init__(self, buckets: tuple[float, ...]) -> None:
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+
+    def observe(self, value: float) -> None:
+        # bisect_left puts a value equal to a bound into that bound's bucket (le)
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+
+    @contextmanager
+    def time(self) -> Iterator[None]:
+        """Observe the duration of the block, also when it raises."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start)
+
+
+class Histogram(_Metric):
+    """Distribution of observed values in cumulative buckets."""
+
+    type = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: tuple[str, ...] = (),
+        buckets: tuple[float, ...] = DEFAULT_BUCKETS,
+    ) -> None:
+        self.buckets = tuple(sorted(buckets))
+        super().__init__(name, documentation, labelnames)
+
+    def _new_child(self) -> _HistogramChild:
+        return _HistogramChild(self.buckets)
+
+    def observe(self, value: float) -> None:
+        """Observe a value of the unlabelled histogram."""
+        self._children[()].observe(value)
+
+    def _samples(self) -> Iterator[str]:
+        bounds = (*self.buckets, math.inf)
+        for values, child in list(self._children.items()):
+            counts = list(child.counts)
+            cumulative = 0
+            for bound, count in zip(bounds, counts):
+                cumulative += count
+                labels = _format_labels(self.labelnames, values, f'le="{_format_value(bound)}"')
+                yield f"{self.name}_bucket{labels} {cumulative}"
+            labels = _format_labels(self.labelnames, values)
+            yield f"{self.name}_sum{labels} {_format_value(child.sum)}"
+            yield f"{self.name}_count{labels} {cumulative}"
+
+
+class MetricsRegistry:
+    """Collection of metric families rendered together."""
+
+    def __init__(self) -> None:
+        self._metrics: dict[str, _Metric] = {}
+
+    def register(self, metric: _Metric) -> None:
+        """Add a metric family, replacing one with the same name.
+
+        Args:
+            metric: Metric family
+        """
+        self._metrics[metric.name] = metric
+
+    def unregister(self, name: str) -> None:
+        """Remove a metric family if registered."""
+        self._metrics.pop(name, None)
+
+    def counter(self, name: str, documentation: str, labelnames: tuple[str, ...] = ()) -> Counter:
+        """Create and register a counter."""
+        metric = Counter(name, documentation, labelnames)
+        self.register(metric)
+        return metric
+
+    def histogram(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: tuple[str, ...] = (),
+        buckets: tuple[float, ...] = DEFAULT_BUCKETS,
+    ) -> Histogram:
+        """Create and register a histogram."""
+        metric = Histogram(name, documentation, labelnames, buckets)
+        self.register(metric)
+        return metric
+
+    def gauge(
+        self,
+        name: str,
+        documentation: str,
+        callback: Callable[[], dict[tuple[str, ...], float]],
+        labelnames: tuple[str, ...] = (),
+    ) -> Gauge:
+        """Create and register a callback gauge."""
+        metric = Gauge(name, documentation, callback, labelnames)
+        self.register(metric)
+        return metric
+
+    def render(self) -> str:
+        """Render all metric families in Prometheus text format."""
+        return "\n".join(metric.render() for metric in list(self._metrics.values())) + "\n"
+
+
+metrics = MetricsRegistry()
+
+webhook_stage_seconds = metrics.histogram(
+    "webhook_stage_seconds",
+    "Time spent in each stage of the webhook endpoint",
+    ("stage",),
+)
+handler_seconds = metrics.histogram(
+    "handler_seconds",
+    "Handler execution time",
+    ("handler", "action"),
+)
+handler_errors_total = metrics.counter(
+    "handler_errors_total",
+    "Handler runs that raised or returned an error result",
+    ("handler", "action"),
+)
+service_call_seconds = metrics.histogram(
+    "service_call_seconds",
+    "Duration of outbound service calls",
+    ("service", "method"),
+)
+event_loop_lag_seconds = metrics.histogram(
+    "event_loop_lag_seconds",
+    "Delay of periodic event loop wakeups past their deadline",
+    buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0),
+)
+service_call_errors_total = metrics.counter(
+    "service_call_errors_total",
+    "Outbound service calls that raised or returned an error result",
+    ("service", "method"),
+)
+
+
+def track_call(
+    service: str, method: str
+) -> Callable[[Callable[..., Awaitable[T]]], Callable[..., Awaitable[T]]]:
+    """Decorate an async service method to record its duration and errors.
+
+    A call counts as failed when it raises or returns a dict whose
+    "status" is "error".
+
+    Args:
+        service: Service label, e.g. "github"
+        method: Method label
+
+    Returns:
+        Decorator
+    """
+    histogram = service_call_seconds.labels(service, method)
+    errors = service_call_errors_total.labels(service, method)
+
+    def decorator(func: Callable[..., Awaitable[T]]) -> Callable[..., Awaitable[T]]:
+        @functools.wraps(func)
+        async def wrapper(*args: Any, **kwargs: Any) -> T:
+            start = time.perf_counter()
+            try:
+                result = await func(*args, **kwargs)
+            except Exception:
+                errors.inc()
+                raise
+            finally:
+                histogram.observe(time.perf_counter() - start)
+            if isinstance(result, dict) and result.get("status") == "error":
+                errors.inc()
+            return result
+        return wrapper
+    return decorator
+
+
+class LoopLagMonitor:
+    """Measures event loop lag as the lateness of a periodic sleep.
+
+    Blocking code on the loop thread delays every coroutine, and shows up
+    here even when no request is slow enough to notice.
+    """
+
+    def __init__(self, interval: float = 0.1, histogram: Histogram = event_loop_lag_seconds) -> None:
+        """Initialize monitor.
+
+        Args:
+            interval: Seconds between wakeups
+            histogram: Histogram lags are observed into
+        """
+        self._interval = interval
+        self._histogram = histogram
+        self._task: Optional[asyncio.Task[None]] = None
+        self.max_lag = 0.0
+
+    def start(self) -> None:
+        """Start measuring on the running event loop."""
+        if self._task is None:
+            self._task = asyncio.create_task(self._run(), name="loop-lag-monitor")
+
+    async def stop(self) -> None:
+        """Stop measuring."""
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            start = loop.time()
+            await asyncio.sleep(self._interval)
+            lag = max(0.0, loop.time() - start - self._interval)
+            self._histogram.observe(lag)
+            self.max_lag = max(self.max_lag, lag)
+
+
+def observe_stage(stage: str, start: float) -> float:
+    """Record a webhook stage that started at `start`.
+
+    Args:
+        stage: Stage label
+        start: `time.perf_counter()` at the start of the stage
+
+    Returns:
+        Current `time.perf_counter()`, the start of the next stage
+    """
+    now = time.perf_counter()
+    webhook_stage_seconds.labels(stage).observe(now - start)
+    return now
+
+
+def stage_start(scope: dict[str, Any]) -> Optional[float]:
+    """Get the start of the current stage of a request.
+
+    That is the end of the last stage observed with `observe_scope_stage`,
+    else the time `RequestTimingMiddleware` received the request.
+    """
+    state = scope.get("state", {})
+    return state.get("stage_started_at", state.get("received_at"))
+
+
+def observe_scope_stage(scope: dict[str, Any], stage: str) -> None:
+    """Record a stage of a request handled by middleware, starting the next one.
+
+    Args:
+        scope: ASGI scope of the request
+        stage: Stage label
+    """
+    start = stage_start(scope)
+    if start is not None:
+        scope["state"]["stage_started_at"] = observe_stage(stage, start)
+
+
+class RequestTimingMiddleware:
+    """ASGI middleware recording when a request was received.
+
+    The time is stored in the request state, so the endpoint can measure
+    body parsing and validation, which FastAPI does before calling it.
+    Requests being served are counted in `in_flight`.
+    """
+
+    in_flight = 0
+
+    def __init__(self, app: Any) -> None:
+        self.app = app
+
+    async def __call__(self, scope: dict[str, Any], receive: Any, send: Any) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        scope.setdefault("state", {})["received_at"] = time.perf_counter()
+        RequestTimingMiddleware.in_flight += 1
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            RequestTimingMiddleware.in_flight -= 1
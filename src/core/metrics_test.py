@@ -0,0 +1,84 @@
+import asyncio
+import time
+
+import pytest
+
+from core.metrics import (
+    Counter,
+    Histogram,
+    LoopLagMonitor,
+    MetricsRegistry,
+    service_call_errors_total,
+    service_call_seconds,
+    track_call,
+)
+
+
+def test_histogram_buckets() -> None:
+    """Test that buckets are cumulative and bounds are inclusive."""
+    histogram = Histogram("latency_seconds", "Latency", ("stage",), buckets=(0.1, 1.0))
+    for value in (0.05, 0.1, 0.5, 2.0):
+        histogram.labels("auth").observe(value)
+
+    lines = histogram.render().splitlines()
+
+    assert lines[:2] == ["# HELP latency_seconds Latency", "# TYPE latency_seconds histogram"]
+    assert 'latency_seconds_bucket{stage="auth",le="0.1"} 2' in lines
+    assert 'latency_seconds_bucket{stage="auth",le="1"} 3' in lines
+    assert 'latency_seconds_bucket{stage="auth",le="+Inf"} 4' in lines
+    assert 'latency_seconds_sum{stage="auth"} 2.65' in lines
+    assert 'latency_seconds_count{stage="auth"} 4' in lines
+
+
+def test_counter_labels() -> None:
+    """Test that label values are escaped and label count is checked."""
+    counter = Counter("errors_total", "Errors", ("handler",))
+    counter.labels('Say "hi"').inc()
+    counter.labels('Say "hi"').inc(2)
+
+    assert 'errors_total{handler="Say \\"hi\\""} 3' in counter.render()
+    with pytest.raises(ValueError):
+        counter.labels("a", "b")
+
+
+def test_registry_gauge() -> None:
+    """Test that gauges are read from their callback at render time."""
+    registry = MetricsRegistry()
+    depth = {"value": 1}
+    registry.gauge("queue_depth", "Queue depth", lambda: {(): depth["value"]})
+    depth["value"] = 5
+
+    assert "queue_depth 5\n" in registry.render()
+
+
+@pytest.mark.asyncio
+async def test_track_call() -> None:
+    """Test that calls are timed and error results are counted."""
+    @track_call("test", "call")
+    async def call(status: str) -> dict[str, str]:
+        if status == "raise":
+            raise RuntimeError("boom")
+        return {"status": status}
+
+    await call("success")
+    await call("error")
+    with pytest.raises(RuntimeError):
+        await call("raise")
+
+    assert sum(service_call_seconds.labels("test", "call").counts) == 3
+    assert service_call_errors_total.labels("test", "call").value == 2
+
+
+@pytest.mark.asyncio
+async def test_loop_lag_monitor() -> None:
+    """Test that blocking the loop shows up as lag."""
+    histogram = Histogram("lag_seconds", "Lag", buckets=(0.01, 0.1))
+    monitor = LoopLagMonitor(interval=0.005, histogram=histogram)
+    monitor.start()
+    await asyncio.sleep(0.01)
+    time.sleep(0.05)
+    await asyncio.sleep(0.01)
+    await monitor.stop()
+
+    assert monitor.max_lag >= 0.03
+    assert sum(histogram.labels().counts) >= 2
@@ -0,0 +1,315 @@
+import asyncio
+import hashlib
+import hmac
+import os
+import re
+import sys
+import threading
+import time
+import uuid
+from collections import Counter
+from dataclasses import dataclass, field
+from pathlib import Path
+from types import CodeType, FrameType
+from typing import Any, Optional
+
+import structlog
+
+from core.executor import executor
+
+logger = structlog.get_logger()
+
+PROFILE_HEADER = "x-actions-profile"
+
+_PROFILE_ID = re.compile(r"^[0-9a-f]{32}$")
+
+
+def sign_profile_request(secret: str, timestamp: Optional[int] = None) -> str:
+    """Build a debug header value asking to profile a request.
+
+    Args:
+        secret: Shared secret, the API key
+        timestamp: Unix time the header is issued at, now by default
+
+    Returns:
+        Header value "<timestamp>.<hex hmac-sha256>"
+    """
+    issued = str(int(time.time()) if timestamp is None else timestamp)
+    signature = hmac.new(secret.encode(), issued.encode(), hashlib.sha256).hexdigest()
+    return f"{issued}.{signature}"
+
+
+def verify_profile_request(value: str, secret: str, max_age: float = 300.0) -> bool:
+    """Check a debug header value built by `sign_profile_request`.
+
+    Args:
+        value: Header value
+        secret: Shared secret, the API key
+        max_age: Seconds a signed header stays valid
+
+    Returns:
+        Whether the signature matches and the header is recent
+    """
+    issued, _, signature = value.partition(".")
+    if not issued.isdigit():
+        return False
+    expected = sign_profile_request(secret, int(issued)).partition(".")[2]
+    if not hmac.compare_digest(signature, expected):
+        return False
+    return abs(time.time() - int(issued)) <= max_age
+
+
+@dataclass(eq=False)
+class ProfileSession:
+    """Stacks sampled while a request was running."""
+
+    id: str
+    label: str
+    started_at: float
+    stacks: Counter[str] = field(default_factory=Counter)
+    samples: int = 0
+
+
+class SamplingProfiler:
+    """Wall-clock sampling profiler of all threads of the process.
+
+    A background thread reads `sys._current_frames()` every `interval`
+    while at least one session is active, so the event loop thread and the
+    executor threads it waits on are both captured. No thread runs and
+    nothing is sampled while no session is active.
+
+    Profiles are written in the collapsed stack format ("frame;frame count"
+    per line) read by flamegraph.pl, speedscope and inferno.
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        interval: float = 0.005,
+        max_profiles: int = 50,
+    ) -> None:
+        """Initialize profiler.
+
+        Args:
+            directory: Directory profiles are written to
+            interval: Seconds between samples
+            max_profiles: Number of profiles kept, older ones are deleted
+        """
+        self._directory = Path(directory)
+        self._interval = interval
+        self._max_profiles = max_profiles
+        self._sessions: set[ProfileSession] = set()
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._frame_names: dict[CodeType, str] = {}
+        self.captured = 0
+
+    def start(self, label: str) -> ProfileSession:
+        """Start sampling for a request.
+
+        Args:
+            label: Description stored with the profile, e.g. the request path
+
+        Returns:
+            Session to pass to `stop`
+        """
+        session = ProfileSession(id=uuid.uuid4().hex, label=label, started_at=time.time())
+        with self._lock:
+            self._sessions.add(session)
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._sample_loop, name="profiler", daemon=True)
+                self._thread.start()
+        return session
+
+    def stop(self, session: ProfileSession) -> ProfileSession:
+        """Stop sampling for a request.
+
+        Args:
+            session: Session returned by `start`
+
+        Returns:
+            The session with its sampled stacks
+        """
+        with self._lock:
+            self._sessions.discard(session)
+        return session
+
+    def _sample_loop(self) -> None:
+        """Sample all threads until no session is left."""
+        own = threading.get_ident()
+        while True:
+            with self._lock:
+                if not self._sessions:
+                    self._thread = None
+                    return
+            names = {thread.ident: thread.name for thread in threading.enumerate()}
+            stacks = [
+                self._collapse(names.get(ident, str(ident)), frame)
+                for ident, frame in sys._current_frames().items()
+                if ident != own
+            ]
+            # Under the lock, so a stopped session is never updated again
+            with self._lock:
+                for session in self._sessions:
+                    session.stacks.update(stacks)
+                    session.samples += 1
+            time.sleep(self._interval)
+
+    def _collapse(self, thread: str, frame: Optional[FrameType]) -> str:
+        """Build the collapsed stack of a thread, root first."""
+        frames = []
+        while frame is not None:
+            code = frame.f_code
+            name = self._frame_names.get(code)
+            if name is None:
+                filename = os.path.basename(code.co_filename)
+                name = f"{code.co_name} ({filename}:{code.co_firstlineno})".replace(";", ":")
+                self._frame_names[code] = name
+            frames.append(name)
+            frame = frame.f_back
+        frames.append(thread.replace(";", ":"))
+        return ";".join(reversed(frames))
+
+    async def save(self, session: ProfileSession, duration: float) -> Optional[Path]:
+        """Write a session as a collapsed stack file.
+
+        Args:
+            session: Stopped session
+            duration: Seconds the request took
+
+        Returns:
+            Path of the written profile, None if nothing was sampled
+        """
+        if not session.samples:
+            return None
+        path = await executor.run("profiler", self._write, session)
+        self.captured += 1
+        logger.warning(
+            "profiling.captured",
+            profile_id=session.id,
+            label=session.label,
+            duration=round(duration, 3),
+            samples=session.samples,
+            path=str(path),
+        )
+        return path
+
+    def _write(self, session: ProfileSession) -> Path:
+        self._directory.mkdir(parents=True, exist_ok=True)
+        path = self._directory / f"{session.id}.folded"
+        lines = [f"{stack} {count}" for stack, count in session.stacks.most_common()]
+        path.write_text("\n".join(lines) + "\n")
+        (self._directory / f"{session.id}.label").write_text(session.label)
+        profiles = sorted(self._directory.glob("*.folded"), key=lambda p: p.stat().st_mtime)
+        for old in profiles[:-self._max_profiles]:
+            old.unlink(missing_ok=True)
+            old.with_suffix(".label").unlink(missing_ok=True)
+        return path
+
+    def list_profiles(self) -> list[dict[str, Any]]:
+        """List stored profiles, newest first."""
+        if not self._directory.is_dir():
+            return []
+        profiles = []
+        for path in self._directory.glob("*.folded"):
+            label = path.with_suffix(".label")
+            stat = path.stat()
+            profiles.append({
+                "id": path.stem,
+                "label": label.read_text() if label.exists() else "",
+                "created_at": stat.st_mtime,
+                "size": stat.st_size,
+            })
+        return sorted(profiles, key=lambda profile: profile["created_at"], reverse=True)
+
+    def read_profile(self, profile_id: str) -> Optional[str]:
+        """Read a stored profile.
+
+        Args:
+            profile_id: Id from `list_profiles`
+
+        Returns:
+            Collapsed stacks, None if there is no such profile
+        """
+        if not _PROFILE_ID.match(profile_id):
+            return None
+        path = self._directory / f"{profile_id}.folded"
+        return path.read_text() if path.exists() else None
+
+    def stats(self) -> dict[str, Any]:
+        """Get profiler statistics."""
+        return {
+            "active_sessions": len(self._sessions),
+            "captured": self.captured,
+        }
+
+
+class ProfilingMiddleware:
+    """ASGI middleware profiling slow or explicitly requested requests.
+
+    A request carrying a valid signed `X-Actions-Profile` header is profiled
+    from its start. Other requests are profiled once they run longer than
+    the threshold, from that moment until they finish, which costs a timer
+    per request and nothing for requests that finish in time.
+    """
+
+    def __init__(
+        self,
+        app: Any,
+        profiler: SamplingProfiler,
+        secret: str,
+        threshold: Optional[float] = None,
+        path_prefix: str = "/api/v1/webhook",
+        header_max_age: float = 300.0,
+    ) -> None:
+        """Initialize middleware.
+
+        Args:
+            app: ASGI application
+            profiler: Profiler sessions are started on
+            secret: Key debug headers are signed with
+            threshold: Seconds after which a request is profiled, None to
+                only profile signed requests
+            path_prefix: Only requests below this path are profiled
+            header_max_age: Seconds a signed debug header stays valid
+        """
+        self.app = app
+        self._profiler = profiler
+        self._secret = secret
+        self._threshold = threshold
+        self._path_prefix = path_prefix
+        self._header_max_age = header_max_age
+
+    def _requested(self, scope: dict[str, Any]) -> bool:
+        for name, value in scope.get("headers", ()):
+            if name == PROFILE_HEADER.encode():
+                return verify_profile_request(value.decode("latin-1"), self._secret, self._header_max_age)
+        return False
+
+    async def __call__(self, scope: dict[str, Any], receive: Any, send: Any) -> None:
+        if scope["type"] != "http" or not scope["path"].startswith(self._path_prefix):
+            await self.app(scope, receive, send)
+            return
+
+        label = f"{scope['method']} {scope['path']}"
+        start = time.perf_counter()
+        sessions: list[ProfileSession] = []
+        timer: Optional[asyncio.TimerHandle] = None
+        if self._requested(scope):
+            sessions.append(self._profiler.start(label))
+        elif self._threshold is not None:
+            timer = asyncio.get_running_loop().call_later(
+                self._threshold, lambda: sessions.append(self._profiler.start(f"{label} (slow)"))
+            )
+
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            if timer is not None:
+                timer.cancel()
+            if sessions:
+                session = self._profiler.stop(sessions[0])
+                try:
+                    await self._profiler.save(session, time.perf_counter() - start)
+                except Exception as e:
+                    logger.exception("profiling.save_failed", profile_id=session.id, error=str(e))
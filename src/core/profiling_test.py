@@ -0,0 +1,86 @@
+import asyncio
+import time
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+from core.profiling import (
+    ProfilingMiddleware,
+    SamplingProfiler,
+    sign_profile_request,
+    verify_profile_request,
+)
+
+SECRET = "test-api-key"
+
+
+def test_signed_header() -> None:
+    """Test that only fresh headers signed with the key are accepted."""
+    assert verify_profile_request(sign_profile_request(SECRET), SECRET)
+    assert not verify_profile_request(sign_profile_request("other-key"), SECRET)
+    assert not verify_profile_request(sign_profile_request(SECRET, int(time.time()) - 600), SECRET)
+    assert not verify_profile_request("garbage", SECRET)
+
+
+def slow_call() -> None:
+    time.sleep(0.1)
+
+
+async def slow_app(scope: dict[str, Any], receive: Any, send: Any) -> None:
+    """ASGI app blocking an executor thread for a while."""
+    await asyncio.get_running_loop().run_in_executor(None, slow_call)
+
+
+async def fast_app(scope: dict[str, Any], receive: Any, send: Any) -> None:
+    pass
+
+
+def make_scope(headers: tuple[tuple[bytes, bytes], ...] = ()) -> dict[str, Any]:
+    return {"type": "http", "method": "POST", "path": "/api/v1/webhook", "headers": headers}
+
+
+@pytest.mark.asyncio
+async def test_profiles_slow_request(tmp_path: Path) -> None:
+    """Test that a request over the threshold leaves a profile with executor stacks."""
+    profiler = SamplingProfiler(str(tmp_path), interval=0.001)
+    middleware = ProfilingMiddleware(slow_app, profiler, SECRET, threshold=0.02)
+
+    await middleware(make_scope(), None, None)
+
+    [profile] = profiler.list_profiles()
+    assert profile["label"] == "POST /api/v1/webhook (slow)"
+    stacks = profiler.read_profile(profile["id"])
+    assert stacks is not None
+    assert "slow_call (profiling_test.py" in stacks
+    assert all(line.rsplit(" ", 1)[1].isdigit() for line in stacks.splitlines())
+
+
+@pytest.mark.asyncio
+async def test_skips_fast_request(tmp_path: Path) -> None:
+    """Test that requests under the threshold are not profiled."""
+    profiler = SamplingProfiler(str(tmp_path))
+    middleware = ProfilingMiddleware(fast_app, profiler, SECRET, threshold=1.0)
+
+    await middleware(make_scope(), None, None)
+
+    assert profiler.list_profiles() == []
+    assert profiler.stats()["active_sessions"] == 0
+
+
+@pytest.mark.asyncio
+async def test_profiles_signed_request(tmp_path: Path) -> None:
+    """Test that a signed header profiles a request without a threshold."""
+    profiler = SamplingProfiler(str(tmp_path), interval=0.001)
+    middleware = ProfilingMiddleware(slow_app, profiler, SECRET)
+    headers = ((b"x-actions-profile", sign_profile_request(SECRET).encode()),)
+
+    await middleware(make_scope(headers), None, None)
+    await middleware(make_scope(((b"x-actions-profile", b"1.bad"),)), None, None)
+
+    assert len(profiler.list_profiles()) == 1
+
+
+def test_read_profile_rejects_paths(tmp_path: Path) -> None:
+    """Test that profile ids cannot point outside the directory."""
+    assert SamplingProfiler(str(tmp_path)).read_profile("../../etc/passwd") is None
@@ -0,0 +1,99 @@
+import hashlib
+import math
+from dataclasses import dataclass
+from typing import Any, Optional
+
+import structlog
+
+from core.state import StateBackend
+
+logger = structlog.get_logger()
+
+
+@dataclass(frozen=True, slots=True)
+class RateLimitResult:
+    """Outcome of a rate limit check."""
+
+    allowed: bool
+    remaining: float
+    retry_after: float  # Seconds until a token is available, 0 if allowed
+
+
+def client_key(integration_id: str, api_key: str) -> str:
+    """Build the bucket key of a client.
+
+    The API key is hashed so it is not kept in memory or a shared store.
+
+    Args:
+        integration_id: Opsgenie integration ID
+        api_key: API key the request was authenticated with
+
+    Returns:
+        Bucket key
+    """
+    digest = hashlib.blake2b(api_key.encode(), digest_size=8).hexdigest()
+    return f"{integration_id}:{digest}"
+
+
+class RateLimiter:
+    """Per-client token bucket rate limiter."""
+
+    def __init__(
+        self,
+        state: StateBackend,
+        per_minute: int,
+        burst: Optional[int] = None,
+    ) -> None:
+        """Initialize rate limiter.
+
+        Args:
+            state: State backend keeping the buckets
+            per_minute: Sustained requests per minute per client, 0 disables limiting
+            burst: Bucket capacity, defaults to `per_minute`
+        """
+        self._state = state
+        self._rate = per_minute / 60
+        self._capacity = float(burst if burst is not None else per_minute)
+        self.allowed = 0
+        self.rejected = 0
+        self.errors = 0
+
+    async def check(self, key: str) -> RateLimitResult:
+        """Take a token for a request of a client.
+
+        Requests are allowed when the backend fails, so an unavailable
+        shared store does not stop event processing.
+
+        Args:
+            key: Client key, see `client_key`
+
+        Returns:
+            Whether the request is allowed
+        """
+        if self._rate <= 0:
+            return RateLimitResult(allowed=True, remaining=math.inf, retry_after=0.0)
+
+        try:
+            allowed, remaining = await self._state.take_token(
+                f"ratelimit:{key}", self._rate, self._capacity
+            )
+        except Exception as e:
+            self.errors += 1
+            logger.warning("rate_limit.backend_error", key=key, error=str(e))
+            return RateLimitResult(allowed=True, remaining=0.0, retry_after=0.0)
+
+        if allowed:
+            self.allowed += 1
+            return RateLimitResult(allowed=True, remaining=remaining, retry_after=0.0)
+        self.rejected += 1
+        return RateLimitResult(allowed=False, remaining=remaining, retry_after=(1 - remaining) / self._rate)
+
+    def stats(self) -> dict[str, Any]:
+        """Get rate limiter statistics."""
+        return {
+            "per_minute": round(self._rate * 60),
+            "burst": self._capacity,
+            "allowed": self.allowed,
+            "rejected": self.rejected,
+            "errors": self.errors,
+        }
@@ -0,0 +1,56 @@
+import pytest
+
+from core.ratelimit import RateLimiter, client_key
+from core.state import InMemoryStateBackend
+
+
+class FakeClock:
+    """Manually advanced clock."""
+
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class FailingBackend(InMemoryStateBackend):
+    """Backend whose store is unavailable."""
+
+    async def take_token(self, key: str, rate: float, capacity: float) -> tuple[bool, float]:
+        raise ConnectionError("store is down")
+
+
+@pytest.mark.asyncio
+async def test_burst_then_refill() -> None:
+    """Test that a client gets its burst and then the sustained rate."""
+    clock = FakeClock()
+    limiter = RateLimiter(InMemoryStateBackend(clock=clock), per_minute=60, burst=3)
+
+    assert [(await limiter.check("a")).allowed for _ in range(4)] == [True, True, True, False]
+    assert (await limiter.check("a")).retry_after == pytest.approx(1.0)
+    assert (await limiter.check("b")).allowed
+
+    clock.now = 1.0
+    assert (await limiter.check("a")).allowed
+    assert not (await limiter.check("a")).allowed
+    assert limiter.stats()["rejected"] == 3
+
+
+@pytest.mark.asyncio
+async def test_disabled_and_failing() -> None:
+    """Test that a zero limit and a failing backend allow requests."""
+    assert (await RateLimiter(FailingBackend(), per_minute=0).check("a")).allowed
+
+    limiter = RateLimiter(FailingBackend(), per_minute=60)
+    assert (await limiter.check("a")).allowed
+    assert limiter.stats()["errors"] == 1
+
+
+def test_client_key_hides_api_key() -> None:
+    """Test that client keys differ per API key without containing it."""
+    key = client_key("integration", "secret")
+
+    assert key.startswith("integration:")
+    assert "secret" not in key
+    assert key != client_key("integration", "other")
@@ -0,0 +1,214 @@
+import importlib
+from typing import Any, Callable, Optional, Union
+
+import structlog
+
+from core.executor import executor
+from handlers.base import BaseHandler
+from models.events import RoutableEvent
+from utils.alert_parser import extract_labels
+
+logger = structlog.get_logger()
+
+
+HandlerFactory = Callable[[], BaseHandler]
+
+# Factory or "module:attribute" path of one, imported on first use so the
+# SDK a handler needs is only loaded once an event needs the handler
+HandlerSpec = Union[HandlerFactory, str]
+
+# Route key: (action, selector) where selector is None, "alertname:<name>" or "tag:<tag>"
+RouteKey = tuple[str, Optional[str]]
+
+
+class NoHandlerError(LookupError):
+    """Raised when no handler is registered for an event."""
+
+
+def import_factory(spec: str) -> HandlerFactory:
+    """Import a handler factory from its "module:attribute" path.
+
+    Args:
+        spec: Path, e.g. "services.kubernetes.factory:create_low_disk_space_handler"
+
+    Returns:
+        The imported factory
+
+    Raises:
+        ValueError: If the path has no attribute part
+        ImportError: If the module cannot be imported
+        AttributeError: If the module has no such attribute
+    """
+    module, _, attribute = spec.partition(":")
+    if not module or not attribute:
+        raise ValueError(f"Handler path must be 'module:attribute', got {spec!r}")
+    return getattr(importlib.import_module(module), attribute)
+
+
+def _spec_name(spec: HandlerSpec) -> str:
+    if isinstance(spec, str):
+        return spec.rpartition(":")[2]
+    return getattr(spec, "__name__", repr(spec))
+
+
+class HandlerRegistry:
+    """Registry mapping event action and alert selectors to handlers.
+
+    Routes are kept in a dict keyed by (action, selector), so resolving an
+    event costs one lookup per selector. Handlers are created on first use;
+    handlers registered by path are also imported on first use.
+    """
+
+    def __init__(self, fallback: Optional[HandlerSpec] = None) -> None:
+        """Initialize registry.
+
+        Args:
+            fallback: Handler used for events without a matching route
+        """
+        self._routes: dict[RouteKey, list[HandlerSpec]] = {}
+        self._fallback = fallback
+        self._instances: dict[HandlerSpec, BaseHandler] = {}
+
+    def register(
+        self,
+        factory: HandlerSpec,
+        action: str,
+        alertname: Optional[str] = None,
+        tag: Optional[str] = None,
+    ) -> None:
+        """Register a handler for an action.
+
+        Args:
+            factory: Handler class, a callable building the handler or the
+                "module:attribute" path of one
+            action: Opsgenie action, e.g. "Create" or a custom action name
+            alertname: Only match alerts with this `alertname` label
+            tag: Only match alerts with this tag
+
+        Raises:
+            ValueError: If both alertname and tag are given
+        """
+        if alertname is not None and tag is not None:
+            raise ValueError("Route can match either alertname or tag, not both")
+
+        if alertname is not None:
+            key: RouteKey = (action, f"alertname:{alertname}")
+        elif tag is not None:
+            key = (action, f"tag:{tag}")
+        else:
+            key = (action, None)
+
+        factories = self._routes.setdefault(key, [])
+        if factory not in factories:
+            factories.append(factory)
+        logger.info(
+            "registry.handler_registered",
+            handler=_spec_name(factory),
+            action=action,
+            selector=key[1],
+        )
+
+    def _match(self, event: RoutableEvent) -> list[HandlerSpec]:
+        """Get specs of the handlers matching the event, without the fallback."""
+        keys: list[RouteKey] = [(event.action, None)]
+        alertname = extract_labels(event.alert.description).get("alertname")
+        if alertname is not None:
+            keys.append((event.action, f"alertname:{alertname}"))
+        keys.extend((event.action, f"tag:{tag}") for tag in event.alert.tags)
+
+        factories: list[HandlerSpec] = []
+        for key in keys:
+            for factory in self._routes.get(key, ()):
+                if factory not in factories:
+                    factories.append(factory)
+        return factories
+
+    @property
+    def has_fallback(self) -> bool:
+        """Whether every event can be routed, to the fallback handler if nothing else."""
+        return self._fallback is not None
+
+    def can_route(self, event: RoutableEvent) -> bool:
+        """Check if the event has a handler, without creating any.
+
+        Args:
+            event: The Opsgenie event or its routing projection
+
+        Returns:
+            Whether `resolve` would find a handler
+        """
+        return self._fallback is not None or bool(self._match(event))
+
+    def resolve(self, event: RoutableEvent) -> list[BaseHandler]:
+        """Get handlers matching the event.
+
+        Args:
+            event: The Opsgenie event or its routing projection
+
+        Returns:
+            Matching handlers, the fallback handler if nothing matches
+
+        Raises:
+            NoHandlerError: If nothing matches and there is no fallback
+        """
+        factories = self._match(event)
+        if not factories:
+            if self._fallback is None:
+                raise NoHandlerError(f"No handler registered for action {event.action}")
+            factories.append(self._fallback)
+
+        return [self._get_instance(factory) for factory in factories]
+
+    def _get_instance(self, spec: HandlerSpec) -> BaseHandler:
+        """Get handler instance, importing and creating it on first use."""
+        handler = self._instances.get(spec)
+        if handler is None:
+            factory = import_factory(spec) if isinstance(spec, str) else spec
+            handler = self._instances[spec] = factory()
+            logger.info("registry.handler_created", handler=type(handler).__name__)
+        return handler
+
+    def get_instance(self, factory: HandlerSpec) -> Optional[BaseHandler]:
+        """Get handler instance if it was already created.
+
+        Args:
+            factory: Handler class, factory or path used for registration
+
+        Returns:
+            Handler instance, None if it was not used yet
+        """
+        return self._instances.get(factory)
+
+    def stats(self) -> dict[str, Any]:
+        """Get registry statistics."""
+        return {
+            "routes": len(self._routes),
+            "created_handlers": sorted(type(h).__name__ for h in self._instances.values()),
+        }
+
+    async def warm_up(self) -> None:
+        """Create every registered handler and warm up its clients.
+
+        Modules of handlers registered by path are imported in the executor,
+        so the event loop keeps serving requests meanwhile. A handler failing
+        to warm up is logged and left to fail on its first event instead.
+        """
+        specs: list[HandlerSpec] = []
+        for factories in self._routes.values():
+            specs.extend(spec for spec in factories if spec not in specs)
+        if self._fallback is not None and self._fallback not in specs:
+            specs.append(self._fallback)
+
+        for spec in specs:
+            try:
+                if isinstance(spec, str) and spec not in self._instances:
+                    await executor.run("startup", import_factory, spec)
+                await self._get_instance(spec).warm_up()
+            except Exception as e:
+                logger.exception("registry.warm_up_failed", handler=_spec_name(spec), error=str(e))
+
+    async def close(self) -> None:
+        """Close all created handlers."""
+        for handler in self._instances.values():
+            await handler.close()
+        self._instances.clear()
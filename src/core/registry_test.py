@@ -0,0 +1,209 @@
+from typing import Any, Optional
+
+import pytest
+
+from core.registry import HandlerRegistry, NoHandlerError
+from core.router import EventRouter
+from handlers.base import BaseHandler
+from models.events import Alert, EventRoute, OpsgenieEvent, Source
+
+
+class RecordingHandler(BaseHandler):
+    """Handler returning its name, counts instances."""
+
+    name = "recording"
+    created = 0
+
+    def __init__(self) -> None:
+        type(self).created += 1
+
+    async def handle(self, event: OpsgenieEvent) -> dict[str, Any]:
+        return {"status": "processed", "handler": self.name}
+
+
+class FirstHandler(RecordingHandler):
+    name = "first"
+
+
+class SecondHandler(RecordingHandler):
+    name = "second"
+
+
+class FailingHandler(BaseHandler):
+    async def handle(self, event: OpsgenieEvent) -> dict[str, Any]:
+        raise RuntimeError("boom")
+
+
+class WarmingHandler(RecordingHandler):
+    name = "warming"
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.warm = False
+
+    async def warm_up(self) -> None:
+        self.warm = True
+
+
+def make_event(
+    action: str = "Create",
+    tags: Optional[list[str]] = None,
+    alertname: Optional[str] = None,
+) -> OpsgenieEvent:
+    """Build an Opsgenie event."""
+    description = f"Labels:\n- alertname = {alertname}" if alertname else None
+    return OpsgenieEvent(
+        action=action,
+        integrationId="test-integration",
+        integrationName="Test Integration",
+        source=Source(name="Test Source", type="API"),
+        alert=Alert(
+            alertId="test-alert-id",
+            message="Test Alert",
+            tags=tags or [],
+            tinyId="1234",
+            alias="test-alias",
+            createdAt=0,
+            updatedAt=0,
+            username="test-user",
+            userId="test-user-id",
+            entity="test-entity",
+            description=description,
+        ),
+    )
+
+
+@pytest.fixture(autouse=True)
+def reset_counters() -> None:
+    FirstHandler.created = 0
+    SecondHandler.created = 0
+
+
+def test_resolve_by_action() -> None:
+    """Test routing by action only."""
+    registry = HandlerRegistry()
+    registry.register(FirstHandler, action="Create")
+
+    handlers = registry.resolve(make_event(action="Create"))
+
+    assert [type(h) for h in handlers] == [FirstHandler]
+
+
+def test_resolve_by_alertname_and_tag() -> None:
+    """Test routing by alertname label and by tag."""
+    registry = HandlerRegistry()
+    registry.register(FirstHandler, action="Fix", alertname="HealthCheckIsNot200")
+    registry.register(SecondHandler, action="Fix", tag="disk")
+
+    assert [type(h) for h in registry.resolve(make_event("Fix", alertname="HealthCheckIsNot200"))] == [FirstHandler]
+    assert [type(h) for h in registry.resolve(make_event("Fix", tags=["disk"]))] == [SecondHandler]
+    with pytest.raises(NoHandlerError):
+        registry.resolve(make_event("Fix", alertname="Other"))
+
+
+def test_fallback() -> None:
+    """Test that unmatched events go to the fallback handler."""
+    registry = HandlerRegistry(fallback=SecondHandler)
+    registry.register(FirstHandler, action="Create")
+
+    assert [type(h) for h in registry.resolve(make_event(action="Close"))] == [SecondHandler]
+
+
+def test_lazy_single_instance() -> None:
+    """Test that handlers are created on first use and reused."""
+    registry = HandlerRegistry()
+    registry.register(FirstHandler, action="Create")
+    registry.register(SecondHandler, action="Close")
+
+    assert FirstHandler.created == 0
+    first = registry.resolve(make_event(action="Create"))[0]
+    again = registry.resolve(make_event(action="Create"))[0]
+
+    assert first is again
+    assert FirstHandler.created == 1
+    assert SecondHandler.created == 0
+    assert registry.get_instance(SecondHandler) is None
+
+
+def test_resolve_by_path() -> None:
+    """Test that a handler registered by path is imported on first use."""
+    registry = HandlerRegistry()
+    registry.register("core.registry_test:FirstHandler", action="Create")
+
+    assert registry.get_instance("core.registry_test:FirstHandler") is None
+    handlers = registry.resolve(make_event(action="Create"))
+
+    assert [type(h) for h in handlers] == [FirstHandler]
+    assert registry.get_instance("core.registry_test:FirstHandler") is handlers[0]
+
+
+def test_resolve_bad_path() -> None:
+    """Test that a path without attribute fails on first use."""
+    registry = HandlerRegistry()
+    registry.register("core.registry_test", action="Create")
+
+    with pytest.raises(ValueError):
+        registry.resolve(make_event(action="Create"))
+
+
+@pytest.mark.asyncio
+async def test_warm_up() -> None:
+    """Test that warm-up creates every handler and skips failing ones."""
+    registry = HandlerRegistry(fallback=SecondHandler)
+    registry.register("core.registry_test:WarmingHandler", action="Create")
+    registry.register("core.registry_test:MissingHandler", action="Close")
+
+    await registry.warm_up()
+
+    handler = registry.get_instance("core.registry_test:WarmingHandler")
+    assert isinstance(handler, WarmingHandler) and handler.warm
+    assert SecondHandler.created == 1
+    assert registry.get_instance("core.registry_test:MissingHandler") is None
+
+
+def test_register_both_selectors() -> None:
+    """Test that a route cannot use both alertname and tag."""
+    registry = HandlerRegistry()
+    with pytest.raises(ValueError):
+        registry.register(FirstHandler, action="Create", alertname="a", tag="b")
+
+
+@pytest.mark.asyncio
+async def test_router_merges_results() -> None:
+    """Test that several matching handlers run and results are merged."""
+    registry = HandlerRegistry()
+    registry.register(FirstHandler, action="Fix")
+    registry.register(SecondHandler, action="Fix", tag="disk")
+    registry.register(FailingHandler, action="Fix", tag="disk")
+
+    result = await EventRouter(registry).route(make_event("Fix", tags=["disk"]))
+
+    assert result["status"] == "error"
+    assert result["handler"] == "first, second, FailingHandler"
+    assert [r["status"] for r in result["results"]] == ["processed", "processed", "error"]
+    assert result["error"] == "FailingHandler: boom"
+
+
+@pytest.mark.asyncio
+async def test_router_single_handler() -> None:
+    """Test that a single matching handler result is returned as is."""
+    registry = HandlerRegistry()
+    registry.register(FirstHandler, action="Create")
+
+    result = await EventRouter(registry).route(make_event())
+
+    assert result == {"status": "processed", "handler": "first"}
+
+
+def test_can_route_projection() -> None:
+    """Test that a routing projection is matched without creating handlers."""
+    registry = HandlerRegistry()
+    registry.register(FirstHandler, action="Fix", alertname="HealthCheckIsNot200")
+    event = make_event("Fix", alertname="HealthCheckIsNot200")
+    route = EventRoute.model_validate(event.model_dump(by_alias=True))
+
+    assert registry.can_route(route)
+    assert not registry.can_route(EventRoute.model_validate(make_event("Fix").model_dump(by_alias=True)))
+    assert FirstHandler.created == 0
+    assert [type(h) for h in registry.resolve(route)] == [FirstHandler]
+    assert HandlerRegistry(fallback=SecondHandler).can_route(route)
@@ -0,0 +1,102 @@
+import asyncio
+import time
+from typing import Any
+
+import structlog
+
+from core.metrics import handler_errors_total, handler_seconds
+from core.registry import HandlerRegistry
+from core.tracing import record_result, tracer
+from handlers.base import BaseHandler
+from models.events import OpsgenieEvent
+
+logger = structlog.get_logger()
+
+
+def merge_results(results: list[dict[str, Any]]) -> dict[str, Any]:
+    """Merge results of several handlers into one result.
+
+    Args:
+        results: Results of the handlers
+
+    Returns:
+        Combined result, processed only if every handler succeeded
+    """
+    errors = [
+        f"{result['handler']}: {result['error']}"
+        for result in results
+        if result.get("error")
+    ]
+    merged: dict[str, Any] = {
+        "status": "processed" if all(r.get("status") == "processed" for r in results) else "error",
+        "handler": ", ".join(result["handler"] for result in results),
+        "results": results,
+    }
+    if errors:
+        merged["error"] = "; ".join(errors)
+    return merged
+
+
+class EventRouter:
+    """Routes events to registered handlers."""
+
+    def __init__(self, registry: HandlerRegistry) -> None:
+        """Initialize router.
+
+        Args:
+            registry: Handler registry used for lookups
+        """
+        self._registry = registry
+
+    async def route(self, event: OpsgenieEvent) -> dict[str, Any]:
+        """Run every handler matching the event concurrently.
+
+        Args:
+            event: The Opsgenie event to process
+
+        Returns:
+            Handler result, merged when several handlers matched
+
+        Raises:
+            NoHandlerError: If no handler matches the event
+        """
+        handlers = self._registry.resolve(event)
+        if len(handlers) == 1:
+            return await self._timed(handlers[0], event)
+
+        results = await asyncio.gather(*(self._run(handler, event) for handler in handlers))
+        return merge_results(list(results))
+
+    async def _timed(self, handler: BaseHandler, event: OpsgenieEvent) -> dict[str, Any]:
+        """Run a handler as a span, recording its duration and errors."""
+        labels = (type(handler).__name__, event.action)
+        start = time.perf_counter()
+        try:
+            with tracer.span(f"handler.{labels[0]}", action=event.action) as span:
+                result = await handler.handle(event)
+                record_result(span, result)
+        except Exception:
+            handler_errors_total.labels(*labels).inc()
+            raise
+        finally:
+            handler_seconds.labels(*labels).observe(time.perf_counter() - start)
+        if result.get("status") == "error":
+            handler_errors_total.labels(*labels).inc()
+        return result
+
+    async def _run(self, handler: BaseHandler, event: OpsgenieEvent) -> dict[str, Any]:
+        """Run a handler, turning an exception into an error result."""
+        try:
+            return await self._timed(handler, event)
+        except Exception as e:
+            logger.exception(
+                "router.handler_error",
+                handler=type(handler).__name__,
+                alert_id=event.alert.alert_id,
+                error=str(e),
+            )
+            return {
+                "status": "error",
+                "handler": type(handler).__name__,
+                "error": str(e),
+            }
@@ -0,0 +1,163 @@
+import hmac
+import json
+from typing import Any, Callable, Optional, Sequence
+
+import structlog
+
+from core.metrics import observe_scope_stage
+
+logger = structlog.get_logger()
+
+API_KEY_HEADER = "x-actions-auth"
+
+
+def match_api_key(provided: Optional[bytes], keys: Sequence[str]) -> Optional[str]:
+    """Find the active key equal to a provided one in constant time.
+
+    Every key is compared, whatever matched, so response time tells nothing
+    about the keys but their count.
+
+    Args:
+        provided: Key sent by the client, None if missing
+        keys: Active keys
+
+    Returns:
+        The matching key, None if no key matches
+    """
+    if not provided:
+        return None
+    matched = None
+    for key in keys:
+        if hmac.compare_digest(provided, key.encode()) and matched is None:
+            matched = key
+    return matched
+
+
+async def send_error(send: Any, status: int, detail: str) -> None:
+    """Send a JSON error response shaped like FastAPI's `HTTPException` ones."""
+    body = json.dumps({"detail": detail}).encode()
+    await send({
+        "type": "http.response.start",
+        "status": status,
+        "headers": [
+            (b"content-type", b"application/json"),
+            (b"content-length", str(len(body)).encode()),
+        ],
+    })
+    await send({"type": "http.response.body", "body": body})
+
+
+class ApiKeyMiddleware:
+    """ASGI middleware authenticating requests by the `X-Actions-Auth` header.
+
+    Runs before the body is read, so unauthenticated requests cost no JSON
+    parsing. Any of the active keys is accepted, which lets keys be rotated
+    without downtime: add the new key, move clients over, drop the old one.
+    The matched key is stored in the request state as "api_key".
+    """
+
+    def __init__(
+        self,
+        app: Any,
+        keys: Callable[[], Sequence[str]],
+        path_prefix: str = "/api/v1/",
+        timed_paths: Sequence[str] = (),
+    ) -> None:
+        """Initialize middleware.
+
+        Args:
+            app: ASGI application
+            keys: Returns the active keys, read on every request so settings
+                changes apply at once
+            path_prefix: Only requests below this path are authenticated
+            timed_paths: Paths whose authentication is recorded as the
+                "auth" stage of the webhook latency histogram
+        """
+        self.app = app
+        self._keys = keys
+        self._path_prefix = path_prefix
+        self._timed_paths = frozenset(timed_paths)
+
+    async def __call__(self, scope: dict[str, Any], receive: Any, send: Any) -> None:
+        if scope["type"] != "http" or not scope["path"].startswith(self._path_prefix):
+            await self.app(scope, receive, send)
+            return
+
+        provided = next((value for name, value in scope["headers"] if name == API_KEY_HEADER.encode()), None)
+        key = match_api_key(provided, self._keys())
+        if key is None:
+            logger.warning("auth.rejected", path=scope["path"], missing=not provided)
+            await send_error(send, 401, "API key is missing" if not provided else "Invalid API key")
+            return
+
+        scope.setdefault("state", {})["api_key"] = key
+        if scope["path"] in self._timed_paths:
+            observe_scope_stage(scope, "auth")
+        await self.app(scope, receive, send)
+
+
+class BodyTooLargeError(Exception):
+    """Raised when a request body exceeds the size limit while being read."""
+
+
+class BodySizeLimitMiddleware:
+    """ASGI middleware rejecting request bodies over a size limit with a 413.
+
+    A declared `Content-Length` over the limit is rejected before anything
+    is read. Bodies without one, e.g. chunked ones, are counted while the
+    app reads them and rejected once they cross the limit.
+    """
+
+    def __init__(self, app: Any, max_size: int, exempt_paths: Sequence[str] = ()) -> None:
+        """Initialize middleware.
+
+        Args:
+            app: ASGI application
+            max_size: Maximum body size in bytes
+            exempt_paths: Paths not limited, e.g. streaming endpoints with
+                their own limits
+        """
+        self.app = app
+        self._max_size = max_size
+        self._exempt_paths = frozenset(exempt_paths)
+
+    async def __call__(self, scope: dict[str, Any], receive: Any, send: Any) -> None:
+        if scope["type"] != "http" or scope["path"] in self._exempt_paths:
+            await self.app(scope, receive, send)
+            return
+
+        for name, value in scope["headers"]:
+            if name == b"content-length":
+                if value.isdigit() and int(value) > self._max_size:
+                    await self._reject(scope, send)
+                    return
+                break
+
+        received = 0
+        started = False
+
+        async def limited_receive() -> dict[str, Any]:
+            nonlocal received
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > self._max_size:
+                    raise BodyTooLargeError(f"Request body is over {self._max_size} bytes")
+            return message
+
+        async def tracked_send(message: dict[str, Any]) -> None:
+            nonlocal started
+            if message["type"] == "http.response.start":
+                started = True
+            await send(message)
+
+        try:
+            await self.app(scope, limited_receive, tracked_send)
+        except BodyTooLargeError:
+            if started:
+                raise
+            await self._reject(scope, send)
+
+    async def _reject(self, scope: dict[str, Any], send: Any) -> None:
+        logger.warning("request.body_too_large", path=scope["path"], max_size=self._max_size)
+        await send_error(send, 413, f"Request body is over {self._max_size} bytes")
@@ -0,0 +1,124 @@
+import json
+import time
+from typing import Any
+
+import pytest
+
+from core.security import ApiKeyMiddleware, BodySizeLimitMiddleware, match_api_key
+
+KEYS = ["current-key", "next-key"]
+
+
+class Recorder:
+    """ASGI app reading the whole body and answering 200, records calls."""
+
+    def __init__(self) -> None:
+        self.calls = 0
+        self.body = b""
+
+    async def __call__(self, scope: dict[str, Any], receive: Any, send: Any) -> None:
+        self.calls += 1
+        while True:
+            message = await receive()
+            self.body += message.get("body", b"")
+            if not message.get("more_body"):
+                break
+        await send({"type": "http.response.start", "status": 200, "headers": []})
+        await send({"type": "http.response.body", "body": b"ok"})
+
+
+def make_scope(path: str = "/api/v1/webhook", headers: tuple[tuple[bytes, bytes], ...] = ()) -> dict[str, Any]:
+    return {"type": "http", "method": "POST", "path": path, "headers": list(headers)}
+
+
+def make_receive(*chunks: bytes) -> Any:
+    messages = [
+        {"type": "http.request", "body": chunk, "more_body": i < len(chunks) - 1}
+        for i, chunk in enumerate(chunks)
+    ]
+
+    async def receive() -> dict[str, Any]:
+        return messages.pop(0)
+    return receive
+
+
+async def call(middleware: Any, scope: dict[str, Any], receive: Any = None) -> tuple[int, Any]:
+    """Run a request, returning the status and decoded body of the response."""
+    sent: list[dict[str, Any]] = []
+
+    async def send(message: dict[str, Any]) -> None:
+        sent.append(message)
+
+    await middleware(scope, receive or make_receive(b""), send)
+    body = b"".join(message.get("body", b"") for message in sent[1:])
+    return sent[0]["status"], json.loads(body) if body != b"ok" else body
+
+
+def test_match_api_key() -> None:
+    """Test that any active key matches and nothing else does."""
+    assert match_api_key(b"current-key", KEYS) == "current-key"
+    assert match_api_key(b"next-key", KEYS) == "next-key"
+    assert match_api_key(b"next-ke", KEYS) is None
+    assert match_api_key(b"", KEYS) is None
+    assert match_api_key(None, KEYS) is None
+
+
+@pytest.mark.asyncio
+async def test_api_key_middleware() -> None:
+    """Test that requests are rejected before the app reads the body."""
+    app = Recorder()
+    middleware = ApiKeyMiddleware(app, keys=lambda: KEYS)
+
+    assert await call(middleware, make_scope()) == (401, {"detail": "API key is missing"})
+    invalid = make_scope(headers=((b"x-actions-auth", b"old-key"),))
+    assert await call(middleware, invalid) == (401, {"detail": "Invalid API key"})
+    assert app.calls == 0
+
+    scope = make_scope(headers=((b"x-actions-auth", b"next-key"),))
+    assert (await call(middleware, scope))[0] == 200
+    assert scope["state"]["api_key"] == "next-key"
+    assert (await call(middleware, make_scope("/metrics")))[0] == 200
+
+
+@pytest.mark.asyncio
+async def test_api_key_middleware_auth_stage() -> None:
+    """Test that only webhook requests record the auth stage."""
+    middleware = ApiKeyMiddleware(Recorder(), keys=lambda: KEYS, timed_paths=("/api/v1/webhook",))
+    headers = ((b"x-actions-auth", b"current-key"),)
+
+    webhook = make_scope(headers=headers)
+    webhook["state"] = {"received_at": time.perf_counter()}
+    stats = make_scope("/api/v1/stats", headers)
+    stats["state"] = {"received_at": time.perf_counter()}
+    await call(middleware, webhook)
+    await call(middleware, stats)
+
+    assert "stage_started_at" in webhook["state"]
+    assert "stage_started_at" not in stats["state"]
+
+
+@pytest.mark.asyncio
+async def test_body_size_limit_declared() -> None:
+    """Test that a declared oversized body is rejected without being read."""
+    app = Recorder()
+    middleware = BodySizeLimitMiddleware(app, max_size=10, exempt_paths=("/api/v1/webhook/batch",))
+    headers = ((b"content-length", b"11"),)
+
+    status, body = await call(middleware, make_scope(headers=headers), make_receive(b"x" * 11))
+    assert status == 413
+    assert body == {"detail": "Request body is over 10 bytes"}
+    assert app.calls == 0
+
+    batch = make_scope("/api/v1/webhook/batch", headers)
+    assert (await call(middleware, batch, make_receive(b"x" * 11)))[0] == 200
+
+
+@pytest.mark.asyncio
+async def test_body_size_limit_streamed() -> None:
+    """Test that a chunked body is rejected once it crosses the limit."""
+    app = Recorder()
+    middleware = BodySizeLimitMiddleware(app, max_size=10)
+
+    assert (await call(middleware, make_scope(), make_receive(b"x" * 6, b"x" * 6)))[0] == 413
+    assert (await call(middleware, make_scope(), make_receive(b"x" * 5, b"x" * 5)))[0] == 200
+    assert app.body == b"x" * 16
@@ -0,0 +1,273 @@
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Any, Callable, Optional
+
+import structlog
+
+logger = structlog.get_logger()
+
+
+class StateBackend(ABC):
+    """Key-value store for state shared by workers and replicas.
+
+    Used for idempotency claims and results, rate limit buckets and job
+    status. Values are strings, callers serialize them.
+    """
+
+    @abstractmethod
+    async def get(self, key: str) -> Optional[str]:
+        """Get a value.
+
+        Args:
+            key: Key
+
+        Returns:
+            Value, None if missing or expired
+        """
+
+    @abstractmethod
+    async def set(self, key: str, value: str, ttl: Optional[float] = None) -> None:
+        """Set a value.
+
+        Args:
+            key: Key
+            value: Value
+            ttl: Lifetime in seconds, None to keep until evicted
+        """
+
+    @abstractmethod
+    async def add(self, key: str, value: str, ttl: Optional[float] = None) -> bool:
+        """Set a value unless the key already exists.
+
+        Args:
+            key: Key
+            value: Value
+            ttl: Lifetime in seconds, None to keep until evicted
+
+        Returns:
+            True if the value was set
+        """
+
+    @abstractmethod
+    async def delete(self, key: str) -> None:
+        """Delete a value.
+
+        Args:
+            key: Key
+        """
+
+    @abstractmethod
+    async def take_token(self, key: str, rate: float, capacity: float) -> tuple[bool, float]:
+        """Refill a token bucket and take one token from it atomically.
+
+        Args:
+            key: Bucket key
+            rate: Refill rate in tokens per second
+            capacity: Maximum number of tokens in the bucket
+
+        Returns:
+            Whether the token was taken and the number of tokens left
+        """
+
+    async def close(self) -> None:
+        """Release backend connections."""
+
+    def stats(self) -> dict[str, Any]:
+        """Get backend statistics."""
+        return {"backend": type(self).__name__}
+
+
+class InMemoryStateBackend(StateBackend):
+    """State of this process only.
+
+    Operations are dict lookups, nothing is shared between workers. Least
+    recently used keys are evicted when there are more than `max_keys`
+    values or buckets; an evicted bucket starts full again.
+    """
+
+    def __init__(
+        self,
+        max_keys: int = 10000,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """Initialize backend.
+
+        Args:
+            max_keys: Maximum number of values and of buckets kept
+            clock: Monotonic time source
+        """
+        self._max_keys = max_keys
+        self._clock = clock
+        self._values: OrderedDict[str, tuple[Optional[float], str]] = OrderedDict()
+        self._buckets: OrderedDict[str, list[float]] = OrderedDict()
+
+    def _get_entry(self, key: str) -> Optional[str]:
+        """Get a live value, dropping it if expired."""
+        entry = self._values.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at is not None and expires_at <= self._clock():
+            del self._values[key]
+            return None
+        self._values.move_to_end(key)
+        return value
+
+    def _set_entry(self, key: str, value: str, ttl: Optional[float]) -> None:
+        """Store a value, evicting the least recently used ones."""
+        expires_at = self._clock() + ttl if ttl is not None else None
+        self._values[key] = (expires_at, value)
+        self._values.move_to_end(key)
+        while len(self._values) > self._max_keys:
+            self._values.popitem(last=False)
+
+    async def get(self, key: str) -> Optional[str]:
+        return self._get_entry(key)
+
+    async def set(self, key: str, value: str, ttl: Optional[float] = None) -> None:
+        self._set_entry(key, value, ttl)
+
+    async def add(self, key: str, value: str, ttl: Optional[float] = None) -> bool:
+        if self._get_entry(key) is not None:
+            return False
+        self._set_entry(key, value, ttl)
+        return True
+
+    async def delete(self, key: str) -> None:
+        self._values.pop(key, None)
+
+    async def take_token(self, key: str, rate: float, capacity: float) -> tuple[bool, float]:
+        now = self._clock()
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            bucket = self._buckets[key] = [capacity, now]
+            if len(self._buckets) > self._max_keys:
+                self._buckets.popitem(last=False)
+        else:
+            self._buckets.move_to_end(key)
+            bucket[0] = min(capacity, bucket[0] + (now - bucket[1]) * rate)
+            bucket[1] = now
+
+        if bucket[0] >= 1:
+            bucket[0] -= 1
+            return True, bucket[0]
+        return False, bucket[0]
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "backend": type(self).__name__,
+            "values": len(self._values),
+            "buckets": len(self._buckets),
+        }
+
+
+# Refill and take a token atomically, timed by the Redis clock so replicas
+# with skewed clocks share one bucket. Buckets expire once they would be full.
+REDIS_TOKEN_BUCKET_SCRIPT = """
+local rate = tonumber(ARGV[1])
+local capacity = tonumber(ARGV[2])
+local time = redis.call('TIME')
+local now = tonumber(time[1]) + tonumber(time[2]) / 1000000
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(state[1]) or capacity
+local ts = tonumber(state[2]) or now
+tokens = math.min(capacity, tokens + math.max(0, now - ts) * rate)
+local allowed = 0
+if tokens >= 1 then
+    tokens = tokens - 1
+    allowed = 1
+end
+redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'ts', tostring(now))
+redis.call('PEXPIRE', KEYS[1], math.ceil(capacity / rate * 1000))
+return {allowed, tostring(tokens)}
+"""
+
+
+class RedisStateBackend(StateBackend):
+    """State shared by all workers and replicas through Redis.
+
+    Any client with the `redis.asyncio` interface can be passed in, so a
+    local stand-in can replace the server in tests. Otherwise the optional
+    `redis` package is required.
+    """
+
+    def __init__(
+        self,
+        url: str = "redis://localhost:6379/0",
+        prefix: str = "opsgenie-actions:",
+        client: Any = None,
+    ) -> None:
+        """Initialize backend.
+
+        Args:
+            url: Redis connection URL, used when no client is passed
+            prefix: Prefix of all keys
+            client: Redis client to use instead of connecting to `url`
+
+        Raises:
+            RuntimeError: If no client is passed and redis is not installed
+        """
+        if client is None:
+            try:
+                import redis.asyncio as redis
+            except ImportError as e:
+                raise RuntimeError("Redis state backend requires the redis package") from e
+            client = redis.from_url(url, decode_responses=True)
+
+        self._client = client
+        self._prefix = prefix
+        self._take_token_script = client.register_script(REDIS_TOKEN_BUCKET_SCRIPT)
+
+    @staticmethod
+    def _px(ttl: Optional[float]) -> Optional[int]:
+        """Convert TTL to milliseconds, Redis rejects a zero expiry."""
+        return max(1, int(ttl * 1000)) if ttl is not None else None
+
+    async def get(self, key: str) -> Optional[str]:
+        value = await self._client.get(self._prefix + key)
+        return value.decode() if isinstance(value, bytes) else value
+
+    async def set(self, key: str, value: str, ttl: Optional[float] = None) -> None:
+        await self._client.set(self._prefix + key, value, px=self._px(ttl))
+
+    async def add(self, key: str, value: str, ttl: Optional[float] = None) -> bool:
+        return bool(await self._client.set(self._prefix + key, value, px=self._px(ttl), nx=True))
+
+    async def delete(self, key: str) -> None:
+        await self._client.delete(self._prefix + key)
+
+    async def take_token(self, key: str, rate: float, capacity: float) -> tuple[bool, float]:
+        allowed, tokens = await self._take_token_script(
+            keys=[self._prefix + key],
+            args=[rate, capacity],
+        )
+        return bool(allowed), float(tokens)
+
+    async def close(self) -> None:
+        await self._client.aclose()
+
+
+def create_state_backend(
+    backend: str,
+    redis_url: str = "redis://localhost:6379/0",
+    max_keys: int = 10000,
+) -> StateBackend:
+    """Create state backend.
+
+    Args:
+        backend: "memory" or "redis"
+        redis_url: Redis connection URL of the redis backend
+        max_keys: Maximum number of keys of the memory backend
+
+    Returns:
+        State backend
+
+    Raises:
+        ValueError: If the backend is unknown
+    """
+    if backend == "memory":
+        return InMemoryStateBackend(max_keys=max_keys)
+    if backend == "redis":
+        return RedisStateBackend(url=redis_url)
+    raise ValueError(f"Unknown state backend: {backend}")
@@ -0,0 +1,205 @@
+import math
+import os
+import uuid
+from typing import Any, Optional
+
+import pytest
+
+from core.state import REDIS_TOKEN_BUCKET_SCRIPT, InMemoryStateBackend, RedisStateBackend
+
+
+class FakeClock:
+    """Manually advanced clock."""
+
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class FakeRedis:
+    """Local stand-in for a `redis.asyncio` client with decoded responses.
+
+    Keys expire by the given clock. There is no Lua interpreter, so the
+    registered token bucket script is run by a Python port of it over the
+    same commands.
+    """
+
+    def __init__(self, clock: FakeClock) -> None:
+        self.clock = clock
+        self.data: dict[str, tuple[Any, Optional[float]]] = {}
+        self.scripts: list[str] = []
+        self.closed = False
+
+    def _live(self, key: str) -> Optional[Any]:
+        value, expires_at = self.data.get(key, (None, None))
+        if expires_at is not None and expires_at <= self.clock():
+            del self.data[key]
+            return None
+        return value
+
+    def _expires_at(self, px: Optional[int]) -> Optional[float]:
+        return self.clock() + px / 1000 if px is not None else None
+
+    async def get(self, key: str) -> Optional[str]:
+        return self._live(key)
+
+    async def set(
+        self, key: str, value: str, px: Optional[int] = None, nx: bool = False,
+    ) -> Optional[bool]:
+        if px is not None and px <= 0:
+            raise ValueError("invalid expire time in 'set' command")
+        if nx and self._live(key) is not None:
+            return None
+        self.data[key] = (value, self._expires_at(px))
+        return True
+
+    async def delete(self, key: str) -> int:
+        return int(self.data.pop(key, None) is not None)
+
+    async def aclose(self) -> None:
+        self.closed = True
+
+    def register_script(self, script: str) -> Any:
+        self.scripts.append(script)
+
+        async def run(keys: list[str], args: list[Any]) -> list[Any]:
+            assert script == REDIS_TOKEN_BUCKET_SCRIPT
+            return self._take_token(keys[0], float(args[0]), float(args[1]))
+
+        return run
+
+    def _take_token(self, key: str, rate: float, capacity: float) -> list[Any]:
+        # TIME, HMGET, HSET and PEXPIRE as in REDIS_TOKEN_BUCKET_SCRIPT
+        now = self.clock()
+        bucket = self._live(key) or {}
+        tokens = float(bucket.get("tokens", capacity))
+        ts = float(bucket.get("ts", now))
+        tokens = min(capacity, tokens + max(0.0, now - ts) * rate)
+        allowed = 0
+        if tokens >= 1:
+            tokens -= 1
+            allowed = 1
+        bucket = {"tokens": str(tokens), "ts": str(now)}
+        self.data[key] = (bucket, self._expires_at(math.ceil(capacity / rate * 1000)))
+        return [allowed, str(tokens)]
+
+
+@pytest.mark.asyncio
+async def test_values_expire() -> None:
+    """Test that values are dropped after their TTL."""
+    clock = FakeClock()
+    state = InMemoryStateBackend(clock=clock)
+
+    await state.set("a", "1", ttl=10)
+    await state.set("b", "2")
+    clock.now = 10
+
+    assert await state.get("a") is None
+    assert await state.get("b") == "2"
+
+
+@pytest.mark.asyncio
+async def test_add_only_if_absent() -> None:
+    """Test that add claims a key once until it expires or is deleted."""
+    clock = FakeClock()
+    state = InMemoryStateBackend(clock=clock)
+
+    assert await state.add("claim", "1", ttl=5)
+    assert not await state.add("claim", "2", ttl=5)
+    clock.now = 5
+    assert await state.add("claim", "3", ttl=5)
+    await state.delete("claim")
+    assert await state.add("claim", "4")
+
+
+@pytest.mark.asyncio
+async def test_eviction() -> None:
+    """Test that least recently used values and buckets are evicted."""
+    state = InMemoryStateBackend(max_keys=2)
+
+    for key in ("a", "b", "c"):
+        await state.set(key, key)
+        await state.take_token(key, rate=1.0, capacity=1.0)
+
+    assert await state.get("a") is None
+    assert state.stats()["values"] == 2
+    assert state.stats()["buckets"] == 2
+
+
+@pytest.mark.asyncio
+async def test_redis_add_only_if_absent() -> None:
+    """Test that Redis add claims a prefixed key with SET NX until it expires or is deleted."""
+    clock = FakeClock()
+    client = FakeRedis(clock)
+    state = RedisStateBackend(prefix="test:", client=client)
+
+    assert await state.add("claim", "1", ttl=5)
+    assert not await state.add("claim", "2", ttl=5)
+    assert await state.get("claim") == "1"
+    assert set(client.data) == {"test:claim"}
+    clock.now = 5
+    assert await state.add("claim", "3", ttl=5)
+    await state.delete("claim")
+    assert await state.add("claim", "4")
+    assert await state.get("claim") == "4"
+
+
+@pytest.mark.asyncio
+async def test_redis_values_expire() -> None:
+    """Test that Redis values get a millisecond TTL of at least one."""
+    clock = FakeClock()
+    state = RedisStateBackend(client=FakeRedis(clock))
+
+    await state.set("a", "1", ttl=10)
+    await state.set("b", "2")
+    await state.set("c", "3", ttl=0)
+    clock.now = 0.001
+    assert await state.get("c") is None
+    clock.now = 10
+
+    assert await state.get("a") is None
+    assert await state.get("b") == "2"
+
+
+@pytest.mark.asyncio
+async def test_redis_take_token() -> None:
+    """Test that Redis buckets are taken through the registered script and refill."""
+    clock = FakeClock()
+    client = FakeRedis(clock)
+    state = RedisStateBackend(prefix="test:", client=client)
+
+    taken = [await state.take_token("bucket", rate=0.5, capacity=2) for _ in range(3)]
+    clock.now = 2
+    refilled = await state.take_token("bucket", rate=0.5, capacity=2)
+    clock.now = 6
+    expired = await client.get("test:bucket") is None
+    await state.close()
+
+    assert client.scripts == [REDIS_TOKEN_BUCKET_SCRIPT]
+    assert taken == [(True, 1.0), (True, 0.0), (False, 0.0)]
+    assert refilled == (True, 0.0)
+    assert expired
+    assert client.closed
+
+
+@pytest.mark.asyncio
+async def test_redis_backend() -> None:
+    """Test the Redis backend against the server in TEST_REDIS_URL."""
+    url = os.environ.get("TEST_REDIS_URL")
+    if not url:
+        pytest.skip("TEST_REDIS_URL is not set")
+    state = RedisStateBackend(url=url, prefix=f"test-{uuid.uuid4().hex}:")
+
+    try:
+        assert await state.add("claim", "1", ttl=5)
+        assert not await state.add("claim", "2", ttl=5)
+        assert await state.get("claim") == "1"
+        await state.delete("claim")
+        assert await state.get("claim") is None
+
+        taken = [await state.take_token("bucket", rate=0.001, capacity=2) for _ in range(3)]
+        assert [allowed for allowed, _ in taken] == [True, True, False]
+    finally:
+        await state.close()
@@ -0,0 +1,401 @@
+import asyncio
+import functools
+import json
+import os
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Any, Callable, Iterator, Optional, TypeVar
+
+import structlog
+
+logger = structlog.get_logger()
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+# Attributes copied from a span to its children, so every span of an alert carries its id
+INHERITED_ATTRIBUTES = ("alert_id",)
+
+
+@dataclass(slots=True)
+class Span:
+    """Timed operation of a trace, in OpenTelemetry terms."""
+
+    name: str
+    trace_id: str
+    span_id: str
+    parent_id: Optional[str]
+    start_time: int  # Unix time in nanoseconds
+    end_time: int = 0
+    attributes: dict[str, Any] = field(default_factory=dict)
+    status: str = "ok"
+    error: Optional[str] = None
+
+    @property
+    def duration(self) -> float:
+        """Duration in seconds."""
+        return (self.end_time - self.start_time) / 1e9
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        """Set an attribute, e.g. a result status."""
+        self.attributes[key] = value
+
+    def to_dict(self) -> dict[str, Any]:
+        """Serialize with OTLP JSON field names."""
+        return {
+            "traceId": self.trace_id,
+            "spanId": self.span_id,
+            "parentSpanId": self.parent_id,
+            "name": self.name,
+            "startTimeUnixNano": self.start_time,
+            "endTimeUnixNano": self.end_time,
+            "attributes": self.attributes,
+            "status": {"code": self.status, "message": self.error},
+        }
+
+
+_current_span: ContextVar[Optional[Span]] = ContextVar("current_span", default=None)
+
+
+def current_span() -> Optional[Span]:
+    """Get the span of the running operation, None outside a trace."""
+    return _current_span.get()
+
+
+def record_result(span: Optional[Span], result: Any) -> None:
+    """Copy the "status" of a result dict to the span, failing it on "error"."""
+    if span is None or not isinstance(result, dict) or "status" not in result:
+        return
+    span.set_attribute("result.status", result["status"])
+    if result["status"] == "error":
+        span.status = "error"
+        span.error = str(result.get("error") or result.get("message") or "")
+
+
+class SpanExporter(ABC):
+    """Destination of finished spans, called from the export thread."""
+
+    @abstractmethod
+    def export(self, spans: list[Span]) -> None:
+        """Export a batch of spans."""
+        pass
+
+    def shutdown(self) -> None:
+        """Release resources held by the exporter."""
+        pass
+
+
+class InMemorySpanExporter(SpanExporter):
+    """Keeps exported spans in a list, for tests."""
+
+    def __init__(self) -> None:
+        self._spans: list[Span] = []
+        self._lock = threading.Lock()
+
+    def export(self, spans: list[Span]) -> None:
+        with self._lock:
+            self._spans.extend(spans)
+
+    @property
+    def spans(self) -> list[Span]:
+        """Exported spans in export order."""
+        with self._lock:
+            return list(self._spans)
+
+    def clear(self) -> None:
+        """Drop exported spans."""
+        with self._lock:
+            self._spans.clear()
+
+
+class FileSpanExporter(SpanExporter):
+    """Appends spans as JSON lines to a file, for a local collector."""
+
+    def __init__(self, path: str) -> None:
+        """Initialize exporter.
+
+        Args:
+            path: File spans are appended to
+        """
+        self._path = path
+        self._file: Optional[Any] = None
+
+    def export(self, spans: list[Span]) -> None:
+        if self._file is None:
+            directory = os.path.dirname(self._path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self._file = open(self._path, "a", encoding="utf-8")
+        self._file.write("".join(json.dumps(span.to_dict()) + "\n" for span in spans))
+        self._file.flush()
+
+    def shutdown(self) -> None:
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+
+class BatchSpanProcessor:
+    """Exports finished spans in batches from a background thread.
+
+    Ending a span only appends it to a bounded deque, so a slow or failing
+    exporter never blocks a request; spans arriving while the queue is
+    full are dropped and counted.
+    """
+
+    def __init__(
+        self,
+        exporter: SpanExporter,
+        max_queue_size: int = 2048,
+        max_batch_size: int = 512,
+        schedule_delay: float = 1.0,
+    ) -> None:
+        """Initialize processor.
+
+        Args:
+            exporter: Destination of the spans
+            max_queue_size: Maximum number of spans waiting for export
+            max_batch_size: Maximum number of spans per export call
+            schedule_delay: Seconds between exports
+        """
+        self._exporter = exporter
+        self._max_queue_size = max_queue_size
+        self._max_batch_size = max_batch_size
+        self._schedule_delay = schedule_delay
+        self._queue: deque[Span] = deque()
+        self._wakeup = threading.Event()
+        self._flushed = threading.Condition()
+        self._exporting = False
+        self._stopped = False
+        self._thread: Optional[threading.Thread] = None
+        self._thread_lock = threading.Lock()
+        self.exported = 0
+        self.dropped = 0
+
+    def on_end(self, span: Span) -> None:
+        """Queue a finished span for export."""
+        if self._stopped or len(self._queue) >= self._max_queue_size:
+            self.dropped += 1
+            return
+        self._queue.append(span)
+        if self._thread is None:
+            # Spans also end in executor threads
+            with self._thread_lock:
+                if self._thread is None:
+                    self._thread = threading.Thread(
+                        target=self._export_loop, name="span-exporter", daemon=True
+                    )
+                    self._thread.start()
+        if len(self._queue) >= self._max_batch_size:
+            self._wakeup.set()
+
+    def _export_loop(self) -> None:
+        while not self._stopped:
+            self._wakeup.wait(self._schedule_delay)
+            self._wakeup.clear()
+            self._export_queued()
+
+    def _export_queued(self) -> None:
+        """Export everything queued so far."""
+        with self._flushed:
+            self._exporting = True
+        try:
+            while self._queue:
+                batch = []
+                while self._queue and len(batch) < self._max_batch_size:
+                    batch.append(self._queue.popleft())
+                try:
+                    self._exporter.export(batch)
+                    self.exported += len(batch)
+                except Exception as e:
+                    self.dropped += len(batch)
+                    logger.warning("tracing.export_failed", spans=len(batch), error=str(e))
+        finally:
+            with self._flushed:
+                self._exporting = False
+                self._flushed.notify_all()
+
+    def force_flush(self, timeout: float = 5.0) -> bool:
+        """Export queued spans now and wait for it.
+
+        Args:
+            timeout: Seconds to wait
+
+        Returns:
+            Whether everything queued was exported in time
+        """
+        if self._thread is None:
+            return True
+        deadline = time.monotonic() + timeout
+        self._wakeup.set()
+        with self._flushed:
+            while self._queue or self._exporting:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return False
+                self._flushed.wait(min(remaining, 0.05))
+                self._wakeup.set()
+        return True
+
+    def shutdown(self, timeout: float = 5.0) -> None:
+        """Export queued spans and stop the export thread."""
+        self.force_flush(timeout)
+        self._stopped = True
+        self._wakeup.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+        self._exporter.shutdown()
+
+    def stats(self) -> dict[str, int]:
+        """Get export statistics."""
+        return {
+            "queued": len(self._queue),
+            "exported": self.exported,
+            "dropped": self.dropped,
+        }
+
+
+class Tracer:
+    """Creates spans, nested through a context variable.
+
+    The context is copied into executor threads, so spans of blocking SDK
+    calls join the trace of the request. Without a processor spans are not
+    created at all.
+    """
+
+    def __init__(self, processor: Optional[BatchSpanProcessor] = None) -> None:
+        """Initialize tracer.
+
+        Args:
+            processor: Processor receiving finished spans, None disables tracing
+        """
+        self._processor = processor
+
+    @property
+    def enabled(self) -> bool:
+        """Whether spans are recorded."""
+        return self._processor is not None
+
+    def configure(self, processor: Optional[BatchSpanProcessor]) -> Optional[BatchSpanProcessor]:
+        """Replace the span processor.
+
+        Args:
+            processor: New processor, None disables tracing
+
+        Returns:
+            The previous processor
+        """
+        previous, self._processor = self._processor, processor
+        return previous
+
+    @contextmanager
+    def span(self, name: str, **attributes: Any) -> Iterator[Optional[Span]]:
+        """Run a block as a span, child of the current one.
+
+        An exception leaving the block marks the span as failed.
+
+        Args:
+            name: Span name, e.g. "github.check_recent_changes"
+            **attributes: Span attributes
+
+        Yields:
+            The span, None when tracing is disabled
+        """
+        processor = self._processor
+        if processor is None:
+            yield None
+            return
+
+        parent = _current_span.get()
+        if parent is not None:
+            for key in INHERITED_ATTRIBUTES:
+                if key in parent.attributes and key not in attributes:
+                    attributes[key] = parent.attributes[key]
+        span = Span(
+            name=name,
+            trace_id=parent.trace_id if parent is not None else os.urandom(16).hex(),
+            span_id=os.urandom(8).hex(),
+            parent_id=parent.span_id if parent is not None else None,
+            start_time=time.time_ns(),
+            attributes=attributes,
+        )
+        token = _current_span.set(span)
+        try:
+            yield span
+        except BaseException as e:
+            span.status = "error"
+            span.error = str(e) or type(e).__name__
+            raise
+        finally:
+            _current_span.reset(token)
+            span.end_time = time.time_ns()
+            processor.on_end(span)
+
+    def traced(self, name: str) -> Callable[[F], F]:
+        """Decorate a function, sync or async, to run as a span.
+
+        Args:
+            name: Span name
+
+        Returns:
+            Decorator
+        """
+        def decorator(func: F) -> F:
+            if asyncio.iscoroutinefunction(func):
+                @functools.wraps(func)
+                async def async_wrapper(*args: Any, **kwargs: Any) -> Any:
+                    with self.span(name) as span:
+                        result = await func(*args, **kwargs)
+                        record_result(span, result)
+                        return result
+                return async_wrapper  # type: ignore[return-value]
+
+            @functools.wraps(func)
+            def wrapper(*args: Any, **kwargs: Any) -> Any:
+                with self.span(name) as span:
+                    result = func(*args, **kwargs)
+                    record_result(span, result)
+                    return result
+            return wrapper  # type: ignore[return-value]
+        return decorator
+
+    def stats(self) -> Optional[dict[str, int]]:
+        """Get processor statistics, None when tracing is disabled."""
+        return self._processor.stats() if self._processor is not None else None
+
+
+def create_span_processor(
+    exporter: str,
+    path: Optional[str] = None,
+    schedule_delay: float = 1.0,
+) -> Optional[BatchSpanProcessor]:
+    """Create a span processor from settings.
+
+    Args:
+        exporter: "none", "memory" or "file"
+        path: File of the "file" exporter
+        schedule_delay: Seconds between exports
+
+    Returns:
+        Processor, None for "none"
+
+    Raises:
+        ValueError: If the exporter is unknown or the file path is missing
+    """
+    if exporter == "none":
+        return None
+    if exporter == "memory":
+        return BatchSpanProcessor(InMemorySpanExporter(), schedule_delay=schedule_delay)
+    if exporter == "file":
+        if not path:
+            raise ValueError("File span exporter needs a path")
+        return BatchSpanProcessor(FileSpanExporter(path), schedule_delay=schedule_delay)
+    raise ValueError(f"Unknown span exporter: {exporter}")
+
+
+tracer = Tracer()
@@ -0,0 +1,131 @@
+import asyncio
+import json
+import threading
+import time
+from pathlib import Path
+from typing import Iterator
+
+import pytest
+
+from core.executor import executor
+from core.tracing import (
+    BatchSpanProcessor,
+    FileSpanExporter,
+    InMemorySpanExporter,
+    Span,
+    SpanExporter,
+    Tracer,
+)
+
+
+@pytest.fixture
+def exporter() -> InMemorySpanExporter:
+    """Exporter collecting spans in memory."""
+    return InMemorySpanExporter()
+
+
+@pytest.fixture
+def tracer(exporter: InMemorySpanExporter) -> Iterator[Tracer]:
+    """Tracer exporting to memory."""
+    processor = BatchSpanProcessor(exporter, schedule_delay=60)
+    yield Tracer(processor)
+    processor.shutdown()
+
+
+def flush(tracer: Tracer) -> None:
+    """Export spans ended so far."""
+    processor = tracer.configure(None)
+    assert processor is not None
+    assert processor.force_flush()
+    tracer.configure(processor)
+
+
+@pytest.mark.asyncio
+async def test_nested_spans(tracer: Tracer, exporter: InMemorySpanExporter) -> None:
+    """Test that spans nest across tasks and executor threads and inherit the alert id."""
+    @tracer.traced("blocking")
+    def blocking() -> dict[str, str]:
+        return {"status": "error", "error": "not found"}
+
+    @tracer.traced("child")
+    async def child() -> None:
+        await executor.run("test", blocking)
+
+    with tracer.span("root", alert_id="alert-1"):
+        await asyncio.gather(child(), child())
+    flush(tracer)
+
+    spans = {span.name: span for span in exporter.spans}
+    root = spans["root"]
+    assert [span.name for span in exporter.spans].count("blocking") == 2
+    assert {span.trace_id for span in exporter.spans} == {root.trace_id}
+    assert spans["child"].parent_id == root.span_id
+    assert spans["blocking"].parent_id != root.span_id
+    assert all(span.attributes["alert_id"] == "alert-1" for span in exporter.spans)
+    assert spans["blocking"].status == "error"
+    assert spans["blocking"].attributes["result.status"] == "error"
+
+
+def test_exception_fails_span(tracer: Tracer, exporter: InMemorySpanExporter) -> None:
+    """Test that an exception marks the span as failed."""
+    with pytest.raises(RuntimeError):
+        with tracer.span("failing"):
+            raise RuntimeError("boom")
+    flush(tracer)
+
+    [span] = exporter.spans
+    assert (span.status, span.error) == ("error", "boom")
+    assert span.duration >= 0
+
+
+def test_disabled_tracer() -> None:
+    """Test that a tracer without processor records nothing."""
+    with Tracer().span("ignored") as span:
+        assert span is None
+
+
+class BlockedExporter(SpanExporter):
+    """Exporter hanging until released."""
+
+    def __init__(self) -> None:
+        self.release = threading.Event()
+        self.spans: list[Span] = []
+
+    def export(self, spans: list[Span]) -> None:
+        self.release.wait(5)
+        self.spans.extend(spans)
+
+
+def test_export_does_not_block() -> None:
+    """Test that a stuck exporter neither blocks ending spans nor grows the queue unbounded."""
+    exporter = BlockedExporter()
+    processor = BatchSpanProcessor(exporter, max_queue_size=10, max_batch_size=2, schedule_delay=0.01)
+    tracer = Tracer(processor)
+
+    start = time.perf_counter()
+    for _ in range(50):
+        with tracer.span("request"):
+            pass
+    assert time.perf_counter() - start < 0.5
+    assert processor.stats()["dropped"] > 0
+
+    exporter.release.set()
+    processor.shutdown()
+    assert len(exporter.spans) == processor.stats()["exported"]
+
+
+def test_file_exporter(tmp_path: Path) -> None:
+    """Test that spans are appended as OTLP-style JSON lines."""
+    path = tmp_path / "traces" / "spans.jsonl"
+    processor = BatchSpanProcessor(FileSpanExporter(str(path)))
+    tracer = Tracer(processor)
+
+    with tracer.span("webhook", alert_id="alert-1"):
+        pass
+    processor.shutdown()
+
+    [line] = path.read_text().splitlines()
+    span = json.loads(line)
+    assert span["name"] == "webhook"
+    assert span["attributes"] == {"alert_id": "alert-1"}
+    assert span["parentSpanId"] is None
@@ -17,4 +17,12 @@ class BaseHandler(ABC):
         Returns:
             A dictionary containing the processing result.
         """
-        pass 
\ No newline at end of file
+        pass
+
+    async def warm_up(self) -> None:
+        """Import SDKs and build clients before the first event arrives."""
+        pass
+
+    async def close(self) -> None:
+        """Release resources held by the handler."""
+        pass
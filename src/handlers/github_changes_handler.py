@@ -3,10 +3,13 @@ from typing import Any, Optional
 import structlog
 
 from core.config import settings
+from core.executor import executor
 from handlers.base import BaseHandler
 from models.events import OpsgenieEvent
-from services.github.service import GitHubService
-from utils.alert_parser import parse_alert_info
+from services.github.base import BaseGitHubService
+from services.github.change_index import change_index
+from services.github.factory import create_github_service
+from utils.alert_parser import parse_alert
 
 
 logger = structlog.get_logger()
@@ -17,14 +20,30 @@ class GitHubChangesHandler(BaseHandler):
     
     def __init__(self) -> None:
         """Initialize handler."""
-        self.github_service: Optional[GitHubService] = None
+        self.github_service: Optional[BaseGitHubService] = None
     
     def _ensure_github_service(self) -> None:
         """Ensure GitHub service is initialized."""
         if not settings.github_token:
             raise ValueError("GitHub token is not configured")
         if self.github_service is None:
-            self.github_service = GitHubService(token=settings.github_token)
+            self.github_service = create_github_service(token=settings.github_token)
+    
+    async def warm_up(self) -> None:
+        """Build the GitHub service in a thread, importing its SDK there."""
+        if not settings.github_token or self.github_service is not None:
+            return
+        service = await executor.run("github", create_github_service, settings.github_token)
+        if self.github_service is None:
+            self.github_service = service
+        else:
+            # Built by an event while this one was importing
+            await service.close()
+    
+    async def close(self) -> None:
+        """Close GitHub service connections."""
+        if self.github_service is not None:
+            await self.github_service.close()
     
     async def handle(self, event: OpsgenieEvent) -> dict[str, Any]:
         """Handle the event by checking for recent GitHub changes.
@@ -38,26 +57,8 @@ class GitHubChangesHandler(BaseHandler):
         try:
             self._ensure_github_service()
             
-            # Extract labels from description
-            description_lines = event.alert.description.split('\n')
-            labels_section = False
-            labels: dict[str, str] = {}
-            
-            for line in description_lines:
-                if line.strip() == "Labels:":
-                    labels_section = True
-                    continue
-                if labels_section and line.startswith("- "):
-                    try:
-                        key, value = line.replace("- ", "").split(" = ")
-                        labels[key.strip()] = value.strip()
-                    except ValueError:
-                        continue
-                elif labels_section and not line.startswith("- "):
-                    break
-            
-            # Parse alert information
-            alert_info = parse_alert_info(event.alert.description, labels)
+            # Parse alert information and labels from description
+            alert_info = parse_alert(event.alert.description)
             
             logger.info(
                 "github_changes_handler.checking_changes",
@@ -71,7 +72,7 @@ class GitHubChangesHandler(BaseHandler):
                 alert_info.service_name
             )
             
-            return {
+            result = {
                 "status": "processed",
                 "handler": "github_changes",
                 "alert_info": {
@@ -84,6 +85,19 @@ class GitHubChangesHandler(BaseHandler):
                 "github_changes": changes
             }
             
+            # Pushes, merged PRs and deployments from the org index, no GitHub call
+            if change_index.ready:
+                result["indexed_changes"] = [
+                    change.to_dict()
+                    for change in change_index.query(
+                        hours=settings.github_index_alert_hours,
+                        repos=[alert_info.service_name],
+                        limit=20,
+                    )
+                ]
+            
+            return result
+            
         except Exception as e:
             logger.exception(
                 "github_changes_handler.processing_error",
@@ -1,6 +1,6 @@
 from datetime import datetime, timedelta
 from typing import Any
-from unittest.mock import MagicMock, patch
+from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
 from github import Github, GithubException
@@ -9,8 +9,10 @@ from github.Organization import Organization
 from github.Repository import Repository
 
 from core.config import settings
+from handlers import github_changes_handler
 from handlers.github_changes_handler import GitHubChangesHandler
 from models.events import Alert, OpsgenieEvent, Source
+from services.github.change_index import Change, ChangeIndex
 
 
 class MockCommitList(list):
@@ -235,4 +237,63 @@ async def test_handler_initialization_without_token(
     # Verify that trying to handle an event raises an error
     result = await handler.handle(sample_event)
     assert result["status"] == "error"
-    assert "GitHub token is not configured" in result["error"] 
\ No newline at end of file
+    assert "GitHub token is not configured" in result["error"] 
+
+
+@pytest.mark.asyncio
+async def test_handle_uses_cache(
+    handler: GitHubChangesHandler,
+    sample_event: OpsgenieEvent,
+) -> None:
+    """Test that repeated alerts for the same service reuse cached lookups."""
+    # Mock GitHub client
+    with patch("services.github.service.Github") as mock_github:
+        # Mock organization
+        mock_org = MagicMock(spec=Organization)
+        mock_github.return_value.get_organization.return_value = mock_org
+
+        # Mock repository
+        mock_repo = MagicMock(spec=Repository)
+        mock_org.get_repo.return_value = mock_repo
+
+        # Mock commit
+        mock_commit = MagicMock(spec=Commit)
+        mock_commit.commit.message = "Test commit"
+        mock_commit.html_url = "https://github.com/improvado/report-loader-db/commit/abc123"
+        mock_repo.get_commits.return_value = MockCommitList([mock_commit])
+
+        await handler.handle(sample_event)
+        await handler.handle(sample_event)
+        assert mock_org.get_repo.call_count == 1
+        assert mock_repo.get_commits.call_count == 1
+
+        # Invalidation forces a fresh lookup
+        handler.github_service.invalidate("report-loader-db")
+        result = await handler.handle(sample_event)
+
+    assert result["github_changes"]["last_commit"] == "Test commit"
+    assert mock_org.get_repo.call_count == 2
+    assert mock_repo.get_commits.call_count == 2
+
+
+@pytest.mark.asyncio
+async def test_handle_attaches_indexed_changes(
+    monkeypatch: pytest.MonkeyPatch,
+    handler: GitHubChangesHandler,
+    sample_event: OpsgenieEvent,
+) -> None:
+    """Test that changes of the service from the org index are attached."""
+    index = ChangeIndex()
+    now = datetime.now().timestamp()
+    index.add([
+        Change(now - 600, "report-loader-db", "deployment", "42", "production main", "https://example.com"),
+        Change(now - 600, "other-service", "push", "abc", "Unrelated", "https://example.com"),
+    ])
+    monkeypatch.setattr(github_changes_handler, "change_index", index)
+    handler.github_service = MagicMock()
+    handler.github_service.check_recent_changes = AsyncMock(return_value={"status": "success"})
+
+    result = await handler.handle(sample_event)
+
+    assert result["status"] == "processed"
+    assert [change["id"] for change in result["indexed_changes"]] == ["42"]
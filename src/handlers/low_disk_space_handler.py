@@ -1,67 +1,85 @@
-from typing import Any
+from typing import TYPE_CHECKING, Any
 
 import structlog
 
-from src.handlers.base import BaseHandler
-from src.models.events import OpsgenieEvent
-import kubernetes
+from handlers.base import BaseHandler
+from models.events import OpsgenieEvent
+from utils.alert_parser import extract_labels
+
+if TYPE_CHECKING:
+    from services.kubernetes.resizer import PVCResizer
 
 logger = structlog.get_logger()
 
 
 class LowDiskSpaceHandler(BaseHandler):
-    """Handler to manage low disk space events."""
+    """Handler to manage low disk space events.
+
+    Built by `services.kubernetes.factory.create_low_disk_space_handler`, so
+    the Kubernetes SDK is only imported with the handler, on warm-up or the
+    first event.
+    """
+
+    def __init__(self, resizer: "PVCResizer") -> None:
+        """Initialize handler.
+
+        Args:
+            resizer: Shared resizer batching claims of a namespace, owned by
+                the handler and closed with it
+        """
+        self.resizer = resizer
+
+    async def close(self) -> None:
+        """Write pending resizes and close cluster clients of the resizer."""
+        await self.resizer.flush()
+        self.resizer.clusters.close()
 
     async def handle(self, event: OpsgenieEvent) -> dict[str, Any]:
-        """Increase PVC disk space by an additional 10Gi based on Opsgenie event."""
-
-        # Extract namespace and PVC name from the event
-        namespace = event.alert.namespace  # Assuming these attributes exist
-        pvc_name = event.alert.pvc_name
-
-        # Load Kubernetes configuration
-        config.load_kube_config()
-
-        # Initialize the Kubernetes API client
-        v1 = client.CoreV1Api()
-
-        try:
-            # Get the current PVC
-            pvc = v1.read_namespaced_persistent_volume_claim(name=pvc_name, namespace=namespace)
-            current_size = pvc.spec.resources.requests['storage']
-
-            # Calculate new size by adding 10Gi
-            new_size = f"{int(current_size[:-2]) + 10}Gi"
-
-            # Create a patch to update the PVC size
-            patch = {
-                "spec": {
-                    "resources": {
-                        "requests": {
-                            "storage": new_size
-                        }
-                    }
-                }
+        """Increase PVC disk space by the resize increment based on Opsgenie event.
+
+        The claim is taken from the `namespace` and `persistentvolumeclaim`
+        labels of the alert, its cluster from the `k8s_cluster_name` label.
+
+        Args:
+            event: The Opsgenie event to handle
+
+        Returns:
+            Dictionary containing processing results
+        """
+        labels = extract_labels(event.alert.description)
+        namespace = labels.get("namespace")
+        pvc_name = labels.get("persistentvolumeclaim")
+        if not namespace or not pvc_name:
+            return {
+                "status": "error",
+                "handler": "low_disk_space",
+                "error": "Alert has no namespace or persistentvolumeclaim label",
             }
 
-            # Patch the PVC to increase its size
-            v1.patch_namespaced_persistent_volume_claim(
-                name=pvc_name,
+        cluster = labels.get("k8s_cluster_name")
+        result = await self.resizer.resize(cluster, namespace, pvc_name)
+        if result["status"] != "resized":
+            logger.error(
+                "low_disk_space_handler.resize_failed",
+                cluster=cluster,
+                pvc_name=pvc_name,
                 namespace=namespace,
-                body=patch
+                error=result["error"],
             )
-            logger.info("PVC size increased", pvc_name=pvc_name, namespace=namespace, new_size=new_size)
-        except client.exceptions.ApiException as e:
-            logger.error("Failed to increase PVC size", error=str(e))
             return {
-                "status": "failed",
-                "handler": "LowDiskSpaceHandler",
-                "error": str(e)
+                "status": "error",
+                "handler": "low_disk_space",
+                "error": result["error"],
             }
 
         return {
             "status": "processed",
-            "handler": "LowDiskSpaceHandler",
+            "handler": "low_disk_space",
             "event_action": event.action,
             "alert_id": event.alert.alert_id,
+            "cluster": cluster,
+            "pvc": f"{namespace}/{pvc_name}",
+            "old_size": result["old_size"],
+            "new_size": result["new_size"],
+            "deduplicated": result.get("deduplicated", False),
         }
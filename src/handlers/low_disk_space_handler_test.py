@@ -0,0 +1,103 @@
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from handlers.low_disk_space_handler import LowDiskSpaceHandler
+from models.events import Alert, OpsgenieEvent, Source
+
+
+def make_event(labels: str) -> OpsgenieEvent:
+    """Build a low disk space event with the given label lines."""
+    return OpsgenieEvent(
+        action="IncreaseDiskSpace",
+        integrationId="test-integration",
+        integrationName="Test Integration",
+        source=Source(name="Test Source", type="API"),
+        alert=Alert(
+            alertId="test-alert-id",
+            message="Low disk space",
+            tags=[],
+            tinyId="1234",
+            alias="test-alias",
+            createdAt=0,
+            updatedAt=0,
+            username="test-user",
+            userId="test-user-id",
+            entity="test-entity",
+            description=f"Alerts Firing:\n\nLabels:\n- alertname = LowDiskSpace\n{labels}\n",
+        ),
+    )
+
+
+@pytest.fixture
+def resizer() -> MagicMock:
+    """Resizer growing every claim from 20Gi to 30Gi."""
+    resizer = MagicMock()
+    resizer.resize = AsyncMock(return_value={
+        "status": "resized", "old_size": "20Gi", "new_size": "30Gi",
+    })
+    return resizer
+
+
+@pytest.mark.asyncio
+async def test_resizes_pvc_from_labels(resizer: MagicMock) -> None:
+    """Test that the claim named by the labels is resized in its cluster."""
+    handler = LowDiskSpaceHandler(resizer)
+
+    result = await handler.handle(make_event(
+        "- k8s_cluster_name = lisbon\n- namespace = data\n- persistentvolumeclaim = pvc-0"
+    ))
+
+    assert result["status"] == "processed"
+    assert result["cluster"] == "lisbon"
+    assert result["new_size"] == "30Gi"
+    assert result["deduplicated"] is False
+    resizer.resize.assert_awaited_once_with("lisbon", "data", "pvc-0")
+
+
+@pytest.mark.asyncio
+async def test_missing_labels(resizer: MagicMock) -> None:
+    """Test that alerts without claim labels are rejected."""
+    result = await LowDiskSpaceHandler(resizer).handle(make_event("- namespace = data"))
+
+    assert result["status"] == "error"
+    resizer.resize.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_resize_error(resizer: MagicMock) -> None:
+    """Test that a failed resize is reported as an error."""
+    resizer.resize.return_value = {
+        "status": "error", "error": "Failed to increase PVC size: 403 Forbidden",
+    }
+
+    result = await LowDiskSpaceHandler(resizer).handle(make_event(
+        "- k8s_cluster_name = lisbon\n- namespace = data\n- persistentvolumeclaim = pvc-0"
+    ))
+
+    assert result["status"] == "error"
+    assert "403 Forbidden" in result["error"]
+
+
+@pytest.mark.asyncio
+async def test_factory_injects_resizer(
+    resizer: MagicMock, monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Test that the factory builds the handler around a resizer closed with it."""
+    from services.kubernetes import factory
+
+    resizer.flush = AsyncMock()
+    create = MagicMock(return_value=resizer)
+    monkeypatch.setattr(factory, "create_pvc_resizer", create)
+    handler = factory.create_low_disk_space_handler()
+    event = make_event("- namespace = data\n- persistentvolumeclaim = pvc-0")
+
+    await handler.handle(event)
+    await handler.handle(event)
+    await handler.close()
+
+    create.assert_called_once_with()
+    assert handler.resizer is resizer
+    assert resizer.resize.await_count == 2
+    resizer.flush.assert_awaited_once()
+    resizer.clusters.close.assert_called_once_with()
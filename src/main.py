@@ -1,24 +1,289 @@
-from fastapi import FastAPI, HTTPException, Header, Request
+import asyncio
+import math
+import time
+from contextlib import asynccontextmanager
+from typing import TYPE_CHECKING, Any, AsyncIterator, Callable, Literal, Optional, TypeVar
+
+from fastapi import FastAPI, HTTPException, Query, Request
+from fastapi.exceptions import RequestValidationError
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, Response
+from pydantic import ValidationError
 import structlog
 
+from core.batch import NDJSONStreamingResponse, process_batch
 from core.config import settings
+from core.dedup import EventDeduplicator
+from core.executor import executor
+from core.jobs import JobQueue, QueueFullError
+from core.journal import EventJournal
+from core.metrics import (
+    CONTENT_TYPE as METRICS_CONTENT_TYPE,
+    LoopLagMonitor,
+    RequestTimingMiddleware,
+    metrics,
+    observe_stage,
+    stage_start,
+)
+from core.profiling import ProfilingMiddleware, SamplingProfiler
+from core.ratelimit import RateLimiter, client_key
+from core.registry import HandlerRegistry, NoHandlerError
+from core.router import EventRouter
+from core.security import ApiKeyMiddleware, BodySizeLimitMiddleware
+from core.state import create_state_backend
+from core.tracing import create_span_processor, tracer
 from handlers.stub_handler import StubHandler
-from models.events import OpsgenieEvent
-from handlers.github_changes_handler import GitHubChangesHandler
+from models.events import OpsgenieEvent, decode_event, decode_route
+from services.github.change_index import change_index
+from services.github.repo_map import repo_map
+from services.opsgenie.note_writer import NoteWriter
 from services.opsgenie.service import OpsgenieService
+from utils.event_stream import iter_json_documents
+
+if TYPE_CHECKING:
+    from services.github.indexer import ChangeIndexer
 
 
 # Configure structured logging
 logger = structlog.get_logger()
 
+T = TypeVar("T")
+
+tracer.configure(create_span_processor(
+    exporter=settings.tracing_exporter,
+    path=settings.tracing_file,
+    schedule_delay=settings.tracing_schedule_delay,
+))
+
+# Initialize services, API clients are created on warm-up or first use
+opsgenie_service = OpsgenieService(
+    api_key=settings.opsgenie_api_key,
+    host=settings.opsgenie_api_url,
+    pool_maxsize=settings.opsgenie_pool_maxsize,
+    pool_block=settings.opsgenie_pool_block,
+    connect_timeout=settings.opsgenie_connect_timeout,
+    read_timeout=settings.opsgenie_read_timeout,
+    tcp_keepalive=settings.opsgenie_tcp_keepalive,
+    sdk_retries=settings.opsgenie_sdk_retries,
+)
+note_writer = NoteWriter(
+    service=opsgenie_service,
+    user=settings.opsgenie_note_user,
+    window=settings.opsgenie_note_window,
+    max_concurrency=settings.opsgenie_note_concurrency,
+    max_retries=settings.opsgenie_note_max_retries,
+    backoff_base=settings.opsgenie_note_backoff_base,
+    backoff_max=settings.opsgenie_note_backoff_max,
+)
+state = create_state_backend(
+    backend=settings.state_backend,
+    redis_url=settings.redis_url,
+    max_keys=settings.state_max_keys,
+)
+rate_limiter = RateLimiter(
+    state=state,
+    per_minute=settings.rate_limit,
+    burst=settings.rate_limit_burst,
+)
+deduplicator = EventDeduplicator(state=state, window=settings.dedup_window)
+
+# Register handlers by path, they are imported and created on first matching
+# event so their SDKs do not slow down startup
+GITHUB_CHANGES_HANDLER = "handlers.github_changes_handler:GitHubChangesHandler"
+LOW_DISK_SPACE_HANDLER = "services.kubernetes.factory:create_low_disk_space_handler"
+registry = HandlerRegistry(fallback=StubHandler)
+registry.register(GITHUB_CHANGES_HANDLER, action="CheckGitHubChanges")
+registry.register(LOW_DISK_SPACE_HANDLER, action="IncreaseDiskSpace")
+router = EventRouter(registry)
+
+
+async def process_event(event: OpsgenieEvent) -> dict[str, Any]:
+    """Process the event once, sharing the result with duplicate deliveries.
+
+    Args:
+        event: The Opsgenie event to process.
+
+    Returns:
+        Handler result with the note result attached.
+    """
+    with tracer.span("process_event", alert_id=event.alert.alert_id, action=event.action):
+        return await deduplicator.run(event, handle_event)
+
+
+async def handle_event(event: OpsgenieEvent) -> dict[str, Any]:
+    """Run the handler for the event and report the result to Opsgenie.
+
+    Args:
+        event: The Opsgenie event to process.
+
+    Returns:
+        Handler result with the note result attached.
+    """
+    result = await router.route(event)
+
+    # Add a note to the alert with the processing result
+    note = f"Event processed by {result['handler']} handler with status: {result['status']}"
+    if result.get('error'):
+        note += f"\nError: {result['error']}"
+
+    note_result = await note_writer.add_note(
+        alert_id=event.alert.alert_id,
+        note=note,
+    )
+
+    # Include note result in the response
+    result['note_result'] = note_result
+    return result
+
+
+journal = EventJournal(
+    path=settings.journal_path,
+    lease=settings.journal_lease,
+    commit_interval=settings.journal_commit_interval,
+    max_batch=settings.journal_max_batch,
+) if settings.journal_path else None
+loop_lag_monitor = LoopLagMonitor(interval=settings.loop_lag_interval)
+job_queue = JobQueue(
+    process=process_event,
+    state=state,
+    max_size=settings.job_queue_size,
+    workers=settings.job_workers,
+    ttl=settings.job_ttl,
+    journal=journal,
+    # A replayed event's dead process may still hold its dedup claim
+    on_replay=lambda event: deduplicator.release(event),
+)
+
+
+warm_up_task: Optional[asyncio.Task[None]] = None
+repo_listing_task: Optional[asyncio.Task[None]] = None
+cluster_sweep_task: Optional[asyncio.Task[None]] = None
+change_indexer: Optional["ChangeIndexer"] = None
+
+
+async def warm_up() -> None:
+    """Create the Opsgenie client and every handler ahead of the first event."""
+    start = time.perf_counter()
+    try:
+        await executor.run("opsgenie", opsgenie_service.start)
+    except Exception as e:
+        logger.exception("startup.opsgenie_warm_up_failed", error=str(e))
+    await registry.warm_up()
+    logger.info("startup.warmed_up", duration=round(time.perf_counter() - start, 3))
+
+
+async def evict_idle_clusters(interval: float) -> None:
+    """Close idle Kubernetes cluster clients every interval, until cancelled.
+
+    Clusters are only looked up on low disk alerts, so without a sweep the
+    clients of a cluster gone quiet would stay open.
+
+    Args:
+        interval: Seconds between sweeps
+    """
+    while True:
+        await asyncio.sleep(interval)
+        # The resizer and its clusters only exist once the handler is created
+        pvc_resizer = getattr(registry.get_instance(LOW_DISK_SPACE_HANDLER), "resizer", None)
+        if pvc_resizer is not None:
+            pvc_resizer.clusters.evict_idle()
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    """Start background workers, drain them on shutdown.
+
+    Warm-up, the repository listing and the GitHub change indexer run as
+    tasks, so the app is ready while they import SDKs and read GitHub.
+    """
+    global warm_up_task, repo_listing_task, cluster_sweep_task, change_indexer
+    await job_queue.start()
+    if settings.loop_lag_interval > 0:
+        loop_lag_monitor.start()
+    if settings.warm_up_on_startup:
+        warm_up_task = asyncio.create_task(warm_up())
+    if settings.repo_map_reload_interval > 0:
+        repo_map.start(settings.repo_map_reload_interval)
+    if settings.repo_map_prepopulate:
+        if settings.github_token:
+            # Until listed, every service is looked up on GitHub
+            repo_listing_task = asyncio.create_task(repo_map.keep_listed(
+                token=settings.github_token,
+                org=settings.github_org,
+                base_url=settings.github_api_url,
+                interval=settings.repo_map_list_interval,
+                timeout=settings.github_timeout,
+            ))
+        else:
+            logger.warning("startup.repo_listing_disabled", reason="GitHub token is not configured")
+    if settings.kubernetes_idle_timeout > 0:
+        cluster_sweep_task = asyncio.create_task(
+            evict_idle_clusters(settings.kubernetes_idle_timeout / 2)
+        )
+    if settings.github_index_enabled:
+        if settings.github_token:
+            from services.github.indexer import ChangeIndexer
+            change_indexer = ChangeIndexer(
+                index=change_index,
+                token=settings.github_token,
+                org=settings.github_org,
+                base_url=settings.github_api_url,
+                interval=settings.github_index_interval,
+                lookback_hours=settings.github_index_lookback_hours,
+                concurrency=settings.github_index_concurrency,
+                timeout=settings.github_timeout,
+            )
+            change_indexer.start()
+        else:
+            logger.warning("startup.change_index_disabled", reason="GitHub token is not configured")
+    yield
+    if warm_up_task is not None and not warm_up_task.done():
+        warm_up_task.cancel()
+        await asyncio.gather(warm_up_task, return_exceptions=True)
+    if repo_listing_task is not None:
+        repo_listing_task.cancel()
+        await asyncio.gather(repo_listing_task, return_exceptions=True)
+        repo_listing_task = None
+    if cluster_sweep_task is not None:
+        cluster_sweep_task.cancel()
+        await asyncio.gather(cluster_sweep_task, return_exceptions=True)
+        cluster_sweep_task = None
+    await repo_map.stop()
+    if change_indexer is not None:
+        await change_indexer.stop()
+        change_indexer = None
+    await loop_lag_monitor.stop()
+    await job_queue.stop(timeout=settings.job_shutdown_timeout)
+    # Write notes still buffered so no processing result is lost
+    await note_writer.flush()
+    opsgenie_service.close()
+    # Handlers write pending resizes and close their clients
+    await registry.close()
+    await state.close()
+    executor.shutdown()
+    processor = tracer.configure(None)
+    if processor is not None:
+        processor.shutdown()
+
+
 app = FastAPI(
     title="Event Processor",
     description="Service to process Opsgenie events via integration",
     version="0.1.0",
+    lifespan=lifespan,
 )
 
+# Checked before the body is read, innermost so CORS preflights pass
+app.add_middleware(
+    BodySizeLimitMiddleware,
+    max_size=settings.max_request_size,
+    exempt_paths=("/api/v1/webhook/batch",),
+)
+app.add_middleware(
+    ApiKeyMiddleware,
+    keys=lambda: settings.active_api_keys,
+    timed_paths=("/api/v1/webhook", "/api/v1/webhook/batch"),
+)
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["*"],
@@ -26,73 +291,365 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
+app.add_middleware(RequestTimingMiddleware)
+
+profiler = SamplingProfiler(
+    directory=settings.profiling_dir,
+    interval=settings.profiling_interval,
+    max_profiles=settings.profiling_max_profiles,
+)
+if settings.profiling_enabled:
+    # Not installed at all when disabled, so requests pay nothing for it
+    app.add_middleware(
+        ProfilingMiddleware,
+        profiler=profiler,
+        secret=settings.api_key,
+        threshold=settings.profiling_threshold,
+        header_max_age=settings.profiling_header_max_age,
+    )
+
+metrics.gauge(
+    "http_requests_in_flight",
+    "HTTP requests being served",
+    lambda: {(): RequestTimingMiddleware.in_flight},
+)
+metrics.gauge("job_queue_depth", "Jobs waiting for a worker", lambda: {(): job_queue.stats()["queued"]})
+metrics.gauge("jobs_in_progress", "Jobs being processed by workers", lambda: {(): job_queue.in_progress})
+metrics.gauge(
+    "executor_calls_in_flight",
+    "Blocking calls running in the thread pool",
+    lambda: {(name,): s["in_flight"] for name, s in executor.stats()["services"].items()},
+    ("service",),
+)
+metrics.gauge(
+    "executor_calls_waiting",
+    "Blocking calls waiting for their service limit",
+    lambda: {(name,): s["waiting"] for name, s in executor.stats()["services"].items()},
+    ("service",),
+)
+metrics.gauge(
+    "notes_pending",
+    "Alerts with notes buffered for the next write",
+    lambda: {(): note_writer.stats()["pending_alerts"]},
+)
 
-# Initialize handlers and services
-stub_handler = StubHandler()
-github_changes_handler = GitHubChangesHandler()
-opsgenie_service = OpsgenieService(api_key=settings.opsgenie_api_key)
 
+async def enforce_rate_limit(integration_id: str, api_key: str) -> None:
+    """Reject the request if the client is over its rate limit."""
+    result = await rate_limiter.check(client_key(integration_id, api_key))
+    if not result.allowed:
+        logger.warning(
+            "webhook.rate_limited",
+            integration_id=integration_id,
+            retry_after=round(result.retry_after, 3),
+        )
+        raise HTTPException(
+            status_code=403,
+            detail="Rate limit exceeded",
+            headers={"Retry-After": str(math.ceil(result.retry_after))},
+        )
 
-def verify_api_key(x_actions_auth: str = Header(None)) -> None:
-    """Verify the API key from the request header."""
-    if not x_actions_auth:
-        raise HTTPException(status_code=401, detail="API key is missing")
-    if x_actions_auth != settings.api_key:
-        raise HTTPException(status_code=401, detail="Invalid API key")
 
+async def admit_batch_event(event: OpsgenieEvent, api_key: str) -> Optional[dict[str, Any]]:
+    """Check a batch event against its client's rate limit.
 
-@app.post("/api/v1/webhook")
-async def webhook(
-    request: Request,
-    event: OpsgenieEvent,
-) -> JSONResponse:
-    """Handle Opsgenie webhook events.
-    
-    Args:
-        request: The FastAPI request object.
-        event: The Opsgenie event payload.
-        
     Returns:
-        JSON response with processing result.
+        A "rate_limited" result line if the client is over its limit, else None
     """
-    verify_api_key(request.headers.get('X-Actions-Auth'))
-    
-    # Log the incoming event
-    logger.info(
-        "webhook.received_event",
-        action=event.action,
+    result = await rate_limiter.check(client_key(event.integration_id, api_key))
+    if result.allowed:
+        return None
+    logger.warning(
+        "webhook.rate_limited",
+        integration_id=event.integration_id,
         alert_id=event.alert.alert_id,
-        integration=event.integration_name,
-        client_host=request.client.host if request.client else None,
+        retry_after=round(result.retry_after, 3),
     )
-    
+    return {"status": "rate_limited", "retry_after": math.ceil(result.retry_after)}
+
+
+def decode_body(body: bytes, decode: Callable[[bytes], T]) -> T:
+    """Decode a request body, failing like FastAPI body validation with a 422."""
     try:
-        # For now, use the stub handler for all events
-        result = await stub_handler.handle(event)
-        
-        # Add a note to the alert with the processing result
-        note = f"Event processed by {result['handler']} handler with status: {result['status']}"
-        if result.get('error'):
-            note += f"\nError: {result['error']}"
-        
-        note_result = await opsgenie_service.add_note(
-            alert_id=event.alert.alert_id,
-            note=note,
+        return decode(body)
+    except ValidationError as e:
+        raise RequestValidationError(
+            [{**error, "loc": ("body", *error["loc"])} for error in e.errors(include_url=False)]
         )
-        
-        # Include note result in the response
-        result['note_result'] = note_result
-        
-        return JSONResponse(content=result)
-        
-    except Exception as e:
-        logger.exception(
-            "webhook.processing_error",
+
+
+@app.post("/api/v1/webhook")
+async def webhook(request: Request) -> JSONResponse:
+    """Handle Opsgenie webhook events.
+
+    With `webhook_fast_decode` and no fallback handler only the routing
+    fields are decoded until the request is allowed by the rate limit and
+    routable; the full event is then decoded from the same bytes. With a
+    fallback every event is routable, so the event is decoded once.
+
+    Args:
+        request: The FastAPI request object, its body an Opsgenie event.
+
+    Returns:
+        JSON response with processing result, or 202 with a job id
+        when background processing is enabled.
+    """
+    start = stage_start(request.scope)
+    body = await request.body()
+    event: Optional[OpsgenieEvent] = None
+    if settings.webhook_fast_decode and not registry.has_fallback:
+        route = decode_body(body, decode_route)
+    else:
+        route = event = decode_body(body, decode_event)
+
+    with tracer.span(
+        "webhook",
+        alert_id=route.alert.alert_id,
+        action=route.action,
+        integration=route.integration_name,
+    ):
+        stage = observe_stage("parse", start) if start is not None else time.perf_counter()
+
+        # Authenticated by ApiKeyMiddleware before the body was read
+        await enforce_rate_limit(route.integration_id, request.state.api_key)
+        stage = observe_stage("rate_limit", stage)
+
+        if not registry.can_route(route):
+            raise HTTPException(status_code=404, detail=f"No handler registered for action {route.action}")
+        if event is None:
+            event = decode_body(body, decode_event)
+            stage = observe_stage("decode", stage)
+
+        # Log the incoming event
+        logger.info(
+            "webhook.received_event",
             action=event.action,
             alert_id=event.alert.alert_id,
-            error=str(e),
+            integration=event.integration_name,
+            client_host=request.client.host if request.client else None,
         )
-        raise HTTPException(
-            status_code=500,
-            detail=f"Error processing event: {str(e)}",
-        ) 
\ No newline at end of file
+
+        if settings.webhook_async:
+            try:
+                job = await job_queue.submit(event)
+                observe_stage("enqueue", stage)
+            except QueueFullError as e:
+                logger.warning(
+                    "webhook.queue_full",
+                    action=event.action,
+                    alert_id=event.alert.alert_id,
+                    error=str(e),
+                )
+                raise HTTPException(
+                    status_code=503,
+                    detail="Job queue is full, retry later",
+                    headers={"Retry-After": str(settings.job_retry_after)},
+                )
+
+            return JSONResponse(
+                status_code=202,
+                content={"status": "accepted", "job_id": job.id},
+            )
+
+        try:
+            result = await job_queue.run(event)
+            stage = observe_stage("process", stage)
+            response = JSONResponse(content=result)
+            observe_stage("serialize", stage)
+            return response
+
+        except NoHandlerError as e:
+            raise HTTPException(status_code=404, detail=str(e))
+
+        except Exception as e:
+            logger.exception(
+                "webhook.processing_error",
+                action=event.action,
+                alert_id=event.alert.alert_id,
+                error=str(e),
+            )
+            raise HTTPException(
+                status_code=500,
+                detail=f"Error processing event: {str(e)}",
+            )
+
+
+@app.post("/api/v1/webhook/batch")
+async def webhook_batch(request: Request) -> NDJSONStreamingResponse:
+    """Handle a batch of Opsgenie webhook events.
+
+    The body is a JSON array or NDJSON stream of events. Events are
+    validated and processed while the body is still being read, and a
+    result line is streamed back for each of them as it completes. Every
+    event counts against the rate limit of its integration, events over it
+    get a "rate_limited" result instead of being processed.
+
+    Args:
+        request: The FastAPI request object.
+
+    Returns:
+        NDJSON response with a result line per event and a summary line.
+    """
+    logger.info(
+        "webhook.received_batch",
+        content_type=request.headers.get('Content-Type'),
+        client_host=request.client.host if request.client else None,
+    )
+
+    documents = iter_json_documents(
+        request.stream(),
+        max_document_size=settings.batch_max_event_size,
+    )
+    api_key = request.state.api_key
+    return NDJSONStreamingResponse(
+        process_batch(
+            documents,
+            job_queue.run,
+            parallelism=settings.batch_parallelism,
+            admit=lambda event: admit_batch_event(event, api_key),
+        ),
+    )
+
+
+@app.get("/api/v1/jobs/{job_id}")
+async def get_job(request: Request, job_id: str) -> JSONResponse:
+    """Get status of a background job.
+
+    Args:
+        request: The FastAPI request object.
+        job_id: Job identifier returned by the webhook.
+
+    Returns:
+        JSON response with the job status and result.
+    """
+    job = await job_queue.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+
+    return JSONResponse(content=job.model_dump(mode="json"))
+
+
+@app.get("/health")
+async def health() -> JSONResponse:
+    """Report the app as ready, warm-up is not waited for.
+
+    Returns:
+        JSON response with the warm-up state: "disabled", "running" or "done".
+    """
+    if warm_up_task is None:
+        warm_up_state = "disabled"
+    else:
+        warm_up_state = "done" if warm_up_task.done() else "running"
+    return JSONResponse(content={"status": "ok", "warm_up": warm_up_state})
+
+
+@app.get("/metrics")
+async def metrics_endpoint() -> Response:
+    """Expose metrics in Prometheus text format.
+
+    Returns:
+        Latency histograms of webhook stages, handlers and outbound calls,
+        error counters and queue gauges.
+    """
+    return Response(content=metrics.render(), media_type=METRICS_CONTENT_TYPE)
+
+
+@app.get("/api/v1/changes")
+async def list_changes(
+    hours: float = Query(24.0, gt=0),
+    repo: Optional[list[str]] = Query(None),
+    kind: Optional[list[Literal["push", "pull_request", "deployment"]]] = Query(None),
+    limit: int = Query(100, ge=1, le=1000),
+) -> JSONResponse:
+    """List indexed changes of the GitHub organization, newest first.
+
+    Answered from the in-memory index filled by the background indexer,
+    without calling GitHub.
+
+    Args:
+        hours: Hours to look back.
+        repo: Only changes of these repositories, may be repeated.
+        kind: Only "push", "pull_request" or "deployment" changes, may be repeated.
+        limit: Maximum number of changes.
+
+    Returns:
+        JSON response with the changes and the time the index was updated.
+    """
+    changes = change_index.query(hours=hours, repos=repo, kinds=kind, limit=limit)
+    return JSONResponse(content={
+        "enabled": change_indexer is not None,
+        "updated_at": change_index.updated_at,
+        "changes": [change.to_dict() for change in changes],
+    })
+
+
+@app.get("/api/v1/admin/profiles")
+async def list_profiles(request: Request) -> JSONResponse:
+    """List captured request profiles, newest first.
+
+    Args:
+        request: The FastAPI request object.
+
+    Returns:
+        JSON response with profile ids, labels and sizes.
+    """
+    profiles = await executor.run("profiler", profiler.list_profiles)
+    return JSONResponse(content={"enabled": settings.profiling_enabled, "profiles": profiles})
+
+
+@app.get("/api/v1/admin/profiles/{profile_id}")
+async def get_profile(request: Request, profile_id: str) -> Response:
+    """Download a captured profile in collapsed stack format.
+
+    The file can be rendered with flamegraph.pl, speedscope or inferno.
+
+    Args:
+        request: The FastAPI request object.
+        profile_id: Profile identifier from the profile list.
+
+    Returns:
+        Collapsed stacks, one "frame;frame count" line per stack.
+    """
+    profile = await executor.run("profiler", profiler.read_profile, profile_id)
+    if profile is None:
+        raise HTTPException(status_code=404, detail="Profile not found")
+
+    return Response(
+        content=profile,
+        media_type="text/plain",
+        headers={"Content-Disposition": f'attachment; filename="{profile_id}.folded"'},
+    )
+
+
+@app.get("/api/v1/stats")
+async def stats(request: Request) -> JSONResponse:
+    """Get runtime statistics of queues and worker pools.
+
+    Args:
+        request: The FastAPI request object.
+
+    Returns:
+        JSON response with statistics.
+    """
+    # Handlers and their clients only exist once used or warmed up
+    github_service = getattr(registry.get_instance(GITHUB_CHANGES_HANDLER), "github_service", None)
+    pvc_resizer = getattr(registry.get_instance(LOW_DISK_SPACE_HANDLER), "resizer", None)
+    return JSONResponse(content={
+        "jobs": job_queue.stats(),
+        "executor": executor.stats(),
+        "dedup": deduplicator.stats(),
+        "rate_limit": rate_limiter.stats(),
+        "state": state.stats(),
+        "notes": note_writer.stats(),
+        "opsgenie_pool": opsgenie_service.pool_stats(),
+        "kubernetes": pvc_resizer.clusters.stats() if pvc_resizer else None,
+        "pvc_resizer": pvc_resizer.stats() if pvc_resizer else None,
+        "profiler": profiler.stats(),
+        "change_index": {
+            **change_index.stats(),
+            "indexer": change_indexer.stats() if change_indexer else None,
+        },
+        "repo_map": repo_map.stats(),
+        "handlers": registry.stats(),
+        "github_cache": github_service.cache_stats() if github_service else None,
+    })
@@ -0,0 +1,467 @@
+import json
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import Any
+from unittest.mock import AsyncMock, Mock
+
+import pytest
+from fastapi.testclient import TestClient
+
+import main
+from core.config import settings
+from core.dedup import EventDeduplicator
+from core.ratelimit import RateLimiter
+from core.registry import HandlerRegistry
+from core.state import InMemoryStateBackend
+from core.tracing import BatchSpanProcessor, InMemorySpanExporter, tracer
+from services.github.change_index import Change, ChangeIndex
+from services.opsgenie.note_writer import NoteWriter
+
+
+API_KEY = "test-api-key"
+
+EVENT_PAYLOAD: dict[str, Any] = {
+    "action": "Create",
+    "integrationId": "test-integration",
+    "integrationName": "Test Integration",
+    "source": {"name": "Test Source", "type": "API"},
+    "alert": {
+        "alertId": "test-alert-id",
+        "message": "Test Alert",
+        "tags": ["test"],
+        "tinyId": "1234",
+        "alias": "test-alias",
+        "createdAt": 0,
+        "updatedAt": 0,
+        "username": "test-user",
+        "userId": "test-user-id",
+        "entity": "test-entity",
+    },
+}
+
+
+@pytest.fixture
+def add_note(monkeypatch: pytest.MonkeyPatch) -> AsyncMock:
+    """Mock Opsgenie note writes."""
+    mock = AsyncMock(return_value={"status": "success", "request_id": "req-1"})
+    monkeypatch.setattr(main.opsgenie_service, "add_note", mock)
+    return mock
+
+
+@pytest.fixture
+def client(monkeypatch: pytest.MonkeyPatch, add_note: AsyncMock) -> TestClient:
+    """Test client with lifespan enabled."""
+    monkeypatch.setattr(settings, "api_key", API_KEY)
+    monkeypatch.setattr(main, "deduplicator", EventDeduplicator(InMemoryStateBackend()))
+    monkeypatch.setattr(main, "note_writer", NoteWriter(main.opsgenie_service, user="test", window=0))
+    with TestClient(main.app) as test_client:
+        yield test_client
+
+
+def test_webhook_sync(client: TestClient, add_note: AsyncMock) -> None:
+    """Test synchronous processing returns handler result."""
+    response = client.post(
+        "/api/v1/webhook", json=EVENT_PAYLOAD, headers={"X-Actions-Auth": API_KEY}
+    )
+
+    assert response.status_code == 200
+    assert response.json()["status"] == "processed"
+    assert response.json()["note_result"]["status"] == "success"
+    add_note.assert_awaited_once()
+
+
+def test_webhook_sync_skips_note_window(
+    monkeypatch: pytest.MonkeyPatch, add_note: AsyncMock
+) -> None:
+    """Test that the response does not wait for the note debounce window."""
+    monkeypatch.setattr(settings, "api_key", API_KEY)
+    monkeypatch.setattr(main, "deduplicator", EventDeduplicator(InMemoryStateBackend()))
+    monkeypatch.setattr(main, "note_writer", NoteWriter(main.opsgenie_service, user="test", window=5))
+
+    with TestClient(main.app) as client:
+        start = time.perf_counter()
+        response = client.post(
+            "/api/v1/webhook", json=EVENT_PAYLOAD, headers={"X-Actions-Auth": API_KEY}
+        )
+        elapsed = time.perf_counter() - start
+
+        assert response.json()["note_result"]["status"] == "success"
+        assert elapsed < 1
+        add_note.assert_awaited_once()
+
+
+def test_webhook_invalid_key(client: TestClient) -> None:
+    """Test that requests with a wrong key are rejected."""
+    response = client.post(
+        "/api/v1/webhook", json=EVENT_PAYLOAD, headers={"X-Actions-Auth": "wrong"}
+    )
+
+    assert response.status_code == 401
+
+
+def test_webhook_async_job(
+    monkeypatch: pytest.MonkeyPatch, client: TestClient, add_note: AsyncMock
+) -> None:
+    """Test background mode returns 202 and job becomes available."""
+    monkeypatch.setattr(settings, "webhook_async", True)
+
+    response = client.post(
+        "/api/v1/webhook", json=EVENT_PAYLOAD, headers={"X-Actions-Auth": API_KEY}
+    )
+    assert response.status_code == 202
+    job_id = response.json()["job_id"]
+
+    for _ in range(100):
+        job = client.get(f"/api/v1/jobs/{job_id}", headers={"X-Actions-Auth": API_KEY})
+        assert job.status_code == 200
+        if job.json()["status"] == "done":
+            break
+    assert job.json()["status"] == "done"
+    assert job.json()["result"]["handler"] == "stub"
+
+
+def test_webhook_async_queue_full(
+    monkeypatch: pytest.MonkeyPatch, client: TestClient
+) -> None:
+    """Test backpressure response when the queue is full."""
+    monkeypatch.setattr(settings, "webhook_async", True)
+
+    async def submit(event: Any) -> None:
+        raise main.QueueFullError("Job queue is full")
+
+    monkeypatch.setattr(main.job_queue, "submit", submit)
+
+    response = client.post(
+        "/api/v1/webhook", json=EVENT_PAYLOAD, headers={"X-Actions-Auth": API_KEY}
+    )
+
+    assert response.status_code == 503
+    assert response.headers["Retry-After"] == str(settings.job_retry_after)
+
+
+def test_unknown_job(client: TestClient) -> None:
+    """Test status lookup of an unknown job."""
+    response = client.get("/api/v1/jobs/unknown", headers={"X-Actions-Auth": API_KEY})
+
+    assert response.status_code == 404
+
+
+def test_webhook_replay_deduplicated(client: TestClient, add_note: AsyncMock) -> None:
+    """Test that a redelivered event does not post a second note."""
+    for _ in range(2):
+        response = client.post(
+            "/api/v1/webhook", json=EVENT_PAYLOAD, headers={"X-Actions-Auth": API_KEY}
+        )
+        assert response.status_code == 200
+
+    assert response.json()["deduplicated"] is True
+    add_note.assert_awaited_once()
+
+
+def test_webhook_batch(client: TestClient, add_note: AsyncMock) -> None:
+    """Test that a streamed NDJSON batch gets a result line per event."""
+    events = [
+        {**EVENT_PAYLOAD, "alert": {**EVENT_PAYLOAD["alert"], "alertId": f"alert-{i}"}}
+        for i in range(5)
+    ]
+    lines = [json.dumps(event).encode() + b"\n" for event in events]
+    lines.insert(2, b'{"action": "Create"}\n')
+
+    response = client.post(
+        "/api/v1/webhook/batch",
+        content=iter(lines),
+        headers={"X-Actions-Auth": API_KEY, "Content-Type": "application/x-ndjson"},
+    )
+
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/x-ndjson"
+    results = [json.loads(line) for line in response.text.splitlines()]
+    summary = results.pop()
+    assert summary == {"status": "done", "total": 6, "processed": 5, "failed": 1}
+    by_index = {result["index"]: result for result in results}
+    assert by_index[2]["status"] == "invalid"
+    assert by_index[5]["alert_id"] == "alert-4"
+    assert by_index[5]["status"] == "processed"
+    assert add_note.await_count == 5
+
+
+def test_webhook_batch_validates_like_webhook(client: TestClient) -> None:
+    """Test that an event is accepted or rejected alike as a webhook, array item and NDJSON line."""
+    headers = {"X-Actions-Auth": API_KEY}
+    for created_at, status, code in (("123", "processed", 200), ("soon", "invalid", 422)):
+        event = {**EVENT_PAYLOAD, "alert": {**EVENT_PAYLOAD["alert"], "createdAt": created_at}}
+
+        single = client.post("/api/v1/webhook", json=event, headers=headers)
+        array = client.post("/api/v1/webhook/batch", content=json.dumps([event]), headers=headers)
+        ndjson = client.post("/api/v1/webhook/batch", content=json.dumps(event) + "\n", headers=headers)
+
+        assert single.status_code == code
+        assert json.loads(array.text.splitlines()[0])["status"] == status
+        assert json.loads(ndjson.text.splitlines()[0])["status"] == status
+
+
+def test_webhook_batch_malformed(client: TestClient) -> None:
+    """Test that a malformed array is reported in the summary."""
+    response = client.post(
+        "/api/v1/webhook/batch",
+        content=b"[" + json.dumps(EVENT_PAYLOAD).encode() + b" oops",
+        headers={"X-Actions-Auth": API_KEY},
+    )
+
+    results = [json.loads(line) for line in response.text.splitlines()]
+    assert results[0]["status"] == "processed"
+    assert results[-1]["status"] == "error"
+    assert results[-1]["total"] == 1
+
+
+def test_webhook_batch_malformed_item(client: TestClient, add_note: AsyncMock) -> None:
+    """Test that a malformed array item is reported invalid and the rest processed."""
+    event = json.dumps(EVENT_PAYLOAD).encode()
+    response = client.post(
+        "/api/v1/webhook/batch",
+        content=b"[" + event + b', {"action": Create}, ' + event + b"]",
+        headers={"X-Actions-Auth": API_KEY},
+    )
+
+    results = [json.loads(line) for line in response.text.splitlines()]
+    assert results[-1] == {"status": "done", "total": 3, "processed": 2, "failed": 1}
+    by_index = {result["index"]: result for result in results[:-1]}
+    assert by_index[1]["status"] == "invalid"
+    assert by_index[1]["error"][0]["type"] == "json_invalid"
+
+
+def test_webhook_rate_limited(monkeypatch: pytest.MonkeyPatch, client: TestClient) -> None:
+    """Test that an integration over its rate limit gets 403."""
+    monkeypatch.setattr(
+        main, "rate_limiter", RateLimiter(InMemoryStateBackend(), per_minute=60, burst=1)
+    )
+    headers = {"X-Actions-Auth": API_KEY}
+
+    assert client.post("/api/v1/webhook", json=EVENT_PAYLOAD, headers=headers).status_code == 200
+    response = client.post("/api/v1/webhook", json=EVENT_PAYLOAD, headers=headers)
+
+    assert response.status_code == 403
+    assert response.headers["Retry-After"] == "1"
+    other = {**EVENT_PAYLOAD, "integrationId": "other-integration"}
+    assert client.post("/api/v1/webhook", json=other, headers=headers).status_code == 200
+
+
+def test_webhook_batch_rate_limited(
+    monkeypatch: pytest.MonkeyPatch, client: TestClient, add_note: AsyncMock
+) -> None:
+    """Test that batch events count against the rate limit of their integration."""
+    monkeypatch.setattr(
+        main, "rate_limiter", RateLimiter(InMemoryStateBackend(), per_minute=60, burst=2)
+    )
+    events = [
+        {**EVENT_PAYLOAD, "alert": {**EVENT_PAYLOAD["alert"], "alertId": f"alert-{i}"}}
+        for i in range(3)
+    ]
+    events.append({
+        **EVENT_PAYLOAD,
+        "integrationId": "other-integration",
+        "alert": {**EVENT_PAYLOAD["alert"], "alertId": "alert-3"},
+    })
+
+    response = client.post(
+        "/api/v1/webhook/batch",
+        content=b"\n".join(json.dumps(event).encode() for event in events),
+        headers={"X-Actions-Auth": API_KEY},
+    )
+
+    results = [json.loads(line) for line in response.text.splitlines()]
+    assert results.pop() == {"status": "done", "total": 4, "processed": 3, "failed": 1}
+    by_index = {result["index"]: result for result in results}
+    assert by_index[2] == {"index": 2, "alert_id": "alert-2", "status": "rate_limited", "retry_after": 1}
+    assert by_index[3]["status"] == "processed"
+    assert add_note.await_count == 3
+    assert client.post("/api/v1/webhook", json=EVENT_PAYLOAD, headers={"X-Actions-Auth": API_KEY}).status_code == 403
+
+
+def test_metrics(client: TestClient) -> None:
+    """Test that webhook stages and handlers show up in the metrics."""
+    client.post("/api/v1/webhook", json=EVENT_PAYLOAD, headers={"X-Actions-Auth": API_KEY})
+
+    response = client.get("/metrics")
+
+    assert response.status_code == 200
+    assert response.headers["Content-Type"].startswith("text/plain; version=0.0.4")
+    for stage in ("parse", "auth", "rate_limit", "process", "serialize"):
+        assert f'webhook_stage_seconds_count{{stage="{stage}"}}' in response.text
+    assert 'handler_seconds_count{handler="StubHandler",action="Create"}' in response.text
+    assert "job_queue_depth 0" in response.text
+
+
+def test_profiles_admin(client: TestClient) -> None:
+    """Test that profiles are listed only with the API key."""
+    assert client.get("/api/v1/admin/profiles").status_code == 401
+
+    headers = {"X-Actions-Auth": API_KEY}
+    response = client.get("/api/v1/admin/profiles", headers=headers)
+
+    assert response.status_code == 200
+    assert response.json()["enabled"] is False
+    assert client.get("/api/v1/admin/profiles/" + "0" * 32, headers=headers).status_code == 404
+
+
+def test_webhook_traced(client: TestClient) -> None:
+    """Test that the webhook, its handler and the note share one trace."""
+    exporter = InMemorySpanExporter()
+    previous = tracer.configure(BatchSpanProcessor(exporter))
+    try:
+        client.post("/api/v1/webhook", json=EVENT_PAYLOAD, headers={"X-Actions-Auth": API_KEY})
+    finally:
+        processor = tracer.configure(previous)
+        assert processor is not None
+        processor.shutdown()
+
+    names = {span.name for span in exporter.spans}
+    assert {"webhook", "process_event", "handler.StubHandler", "note_writer.add_note"} <= names
+    assert len({span.trace_id for span in exporter.spans}) == 1
+    assert {span.attributes["alert_id"] for span in exporter.spans} == {"test-alert-id"}
+
+
+def test_health_warm_up(monkeypatch: pytest.MonkeyPatch, add_note: AsyncMock) -> None:
+    """Test that warm-up runs in the background and is reported by /health."""
+    warm_up = AsyncMock()
+    monkeypatch.setattr(settings, "warm_up_on_startup", True)
+    monkeypatch.setattr(main.registry, "warm_up", warm_up)
+    monkeypatch.setattr(main.opsgenie_service, "start", lambda: None)
+
+    async def warmed_up() -> None:
+        await main.warm_up_task
+
+    with TestClient(main.app) as client:
+        client.portal.call(warmed_up)
+        response = client.get("/health")
+
+    assert response.status_code == 200
+    assert response.json() == {"status": "ok", "warm_up": "done"}
+    warm_up.assert_awaited_once()
+    monkeypatch.setattr(main, "warm_up_task", None)
+
+
+def test_idle_clusters_evicted(monkeypatch: pytest.MonkeyPatch, add_note: AsyncMock) -> None:
+    """Test that idle cluster clients are swept in the background while the app runs."""
+    handler = Mock(close=AsyncMock())
+    monkeypatch.setattr(settings, "kubernetes_idle_timeout", 0.02)
+    monkeypatch.setattr(main.registry, "_instances", {main.LOW_DISK_SPACE_HANDLER: handler})
+
+    with TestClient(main.app):
+        assert main.cluster_sweep_task is not None
+        time.sleep(0.1)
+    assert main.cluster_sweep_task is None
+
+    assert handler.resizer.clusters.evict_idle.call_count >= 2
+    handler.close.assert_awaited_once()
+
+
+def test_import_skips_sdks() -> None:
+    """Test that importing the app loads no Kubernetes, Opsgenie or GitHub SDK."""
+    code = "import sys, main; print(sorted({'kubernetes', 'opsgenie_sdk', 'github'} & set(sys.modules)))"
+    result = subprocess.run(
+        [sys.executable, "-c", code],
+        cwd=Path(__file__).parent, capture_output=True, text=True, check=True,
+    )
+
+    assert result.stdout.strip().splitlines()[-1] == "[]"
+
+
+def test_webhook_invalid_body(client: TestClient) -> None:
+    """Test that malformed bodies are rejected like FastAPI validation and coercible ones accepted."""
+    headers = {"X-Actions-Auth": API_KEY}
+    lax = {**EVENT_PAYLOAD, "alert": {**EVENT_PAYLOAD["alert"], "createdAt": "123"}}
+    missing = {**EVENT_PAYLOAD, "alert": {**EVENT_PAYLOAD["alert"], "createdAt": "soon"}}
+
+    malformed = client.post("/api/v1/webhook", content=b"{oops", headers=headers)
+    coerced = client.post("/api/v1/webhook", json=lax, headers=headers)
+    invalid = client.post("/api/v1/webhook", json=missing, headers=headers)
+
+    assert malformed.status_code == 422
+    assert malformed.json()["detail"][0]["type"] == "json_invalid"
+    assert coerced.status_code == 200
+    assert invalid.status_code == 422
+    assert invalid.json()["detail"][0]["loc"] == ["body", "alert", "createdAt"]
+
+
+def test_webhook_fallback_decodes_once(monkeypatch: pytest.MonkeyPatch, client: TestClient) -> None:
+    """Test that the routing projection is skipped when a fallback handler routes every event."""
+    decode_route = Mock()
+    monkeypatch.setattr(main, "decode_route", decode_route)
+
+    response = client.post("/api/v1/webhook", json=EVENT_PAYLOAD, headers={"X-Actions-Auth": API_KEY})
+
+    assert response.status_code == 200
+    decode_route.assert_not_called()
+
+
+def test_webhook_unroutable_not_decoded(monkeypatch: pytest.MonkeyPatch, client: TestClient) -> None:
+    """Test that an event without handler is rejected before the full event is built."""
+    decode_event = Mock()
+    monkeypatch.setattr(main, "registry", HandlerRegistry())
+    monkeypatch.setattr(main, "decode_event", decode_event)
+
+    response = client.post("/api/v1/webhook", json=EVENT_PAYLOAD, headers={"X-Actions-Auth": API_KEY})
+
+    assert response.status_code == 404
+    decode_event.assert_not_called()
+
+
+def test_webhook_rotated_key_and_size_limit(monkeypatch: pytest.MonkeyPatch, client: TestClient) -> None:
+    """Test that every active key is accepted and bodies are checked before parsing."""
+    monkeypatch.setattr(settings, "api_keys", ["next-api-key"])
+
+    rotated = client.post("/api/v1/webhook", json=EVENT_PAYLOAD, headers={"X-Actions-Auth": "next-api-key"})
+    unauthenticated = client.post("/api/v1/webhook", content=b"{oops", headers={"X-Actions-Auth": "old"})
+    oversized = client.post(
+        "/api/v1/webhook",
+        content=b" " * (settings.max_request_size + 1),
+        headers={"X-Actions-Auth": API_KEY},
+    )
+
+    assert rotated.status_code == 200
+    assert unauthenticated.status_code == 401
+    assert oversized.status_code == 413
+
+
+def test_changes_index(monkeypatch: pytest.MonkeyPatch, client: TestClient) -> None:
+    """Test that indexed changes are queried by repository and kind."""
+    index = ChangeIndex()
+    now = time.time()
+    index.add([
+        Change(now - 60, "report-loader", "deployment", "42", "production main", "https://example.com"),
+        Change(now - 120, "report-loader", "push", "abc", "Fix loader", "https://example.com"),
+        Change(now - 7200, "billing", "push", "def", "Bump", "https://example.com"),
+    ])
+    monkeypatch.setattr(main, "change_index", index)
+    headers = {"X-Actions-Auth": API_KEY}
+
+    response = client.get("/api/v1/changes?hours=1&repo=report-loader&kind=push", headers=headers)
+
+    assert response.status_code == 200
+    assert response.json()["enabled"] is False
+    assert [change["id"] for change in response.json()["changes"]] == ["abc"]
+    assert len(client.get("/api/v1/changes?hours=3", headers=headers).json()["changes"]) == 3
+    assert client.get("/api/v1/changes?kind=tag", headers=headers).status_code == 422
+
+
+@pytest.mark.parametrize("backend", ["pygithub", "httpx"])
+def test_change_indexer_org_matches_service(
+    monkeypatch: pytest.MonkeyPatch, add_note: AsyncMock, backend: str
+) -> None:
+    """Test that indexed changes come from the org recent changes are checked in."""
+    from services.github.factory import create_github_service
+    from services.github.indexer import ChangeIndexer
+
+    monkeypatch.setattr(settings, "github_token", "test-token")
+    monkeypatch.setattr(settings, "github_backend", backend)
+    monkeypatch.setattr(settings, "github_index_enabled", True)
+    monkeypatch.setattr(ChangeIndexer, "start", lambda self: None)
+
+    with TestClient(main.app):
+        assert main.change_indexer is not None
+        assert main.change_indexer.org == create_github_service(token="test-token").org
+        assert main.change_indexer.org == settings.github_org
+    assert main.change_indexer is None
@@ -1,5 +1,7 @@
-from typing import Optional
-from pydantic import BaseModel, Field
+from typing import Any, Optional, Union
+from pydantic import BaseModel, ConfigDict, Field
+
+from utils.alert_parser import extract_labels
 
 
 class Source(BaseModel):
@@ -32,4 +34,92 @@ class OpsgenieEvent(BaseModel):
     alert: Alert
 
     class Config:
-        populate_by_name = True 
\ No newline at end of file
+        populate_by_name = True
+
+
+class AlertRoute(BaseModel):
+    """Alert fields read to route an event."""
+    model_config = ConfigDict(populate_by_name=True)
+
+    alert_id: str = Field(alias="alertId")
+    tags: list[str]
+    description: Optional[str] = None
+
+
+class EventRoute(BaseModel):
+    """Projection of an Opsgenie event on the fields read before processing.
+
+    Auth, rate limiting and routing only need these, so a rejected request
+    never builds the full `OpsgenieEvent`. Other fields are skipped by the
+    JSON parser without creating Python objects for them.
+    """
+    model_config = ConfigDict(populate_by_name=True)
+
+    action: str
+    integration_id: str = Field(alias="integrationId")
+    integration_name: str = Field(alias="integrationName")
+    alert: AlertRoute
+
+    @property
+    def alertname(self) -> Optional[str]:
+        """The `alertname` label of the alert description."""
+        return extract_labels(self.alert.description).get("alertname")
+
+
+# Anything the registry can route, full events and projections alike
+RoutableEvent = Union[OpsgenieEvent, EventRoute]
+
+# Compiled once with the models; validating JSON bytes with them parses and
+# builds the model in one pass, without the dict `json.loads` would create
+_EVENT_VALIDATOR = OpsgenieEvent.__pydantic_validator__
+_ROUTE_VALIDATOR = EventRoute.__pydantic_validator__
+
+
+def decode_event(body: Union[bytes, str]) -> OpsgenieEvent:
+    """Decode a webhook body into an event.
+
+    Values are coerced like `OpsgenieEvent.model_validate` does, e.g. a
+    numeric string is accepted for `createdAt`.
+
+    Args:
+        body: JSON document
+
+    Returns:
+        The event
+
+    Raises:
+        ValidationError: If the body is not valid JSON or not a valid event
+    """
+    return _EVENT_VALIDATOR.validate_json(body)
+
+
+def validate_event(data: Any) -> OpsgenieEvent:
+    """Validate an already decoded event, e.g. an item of a JSON array batch.
+
+    Values are coerced the same way as by `decode_event`.
+
+    Args:
+        data: Decoded JSON value
+
+    Returns:
+        The event
+
+    Raises:
+        ValidationError: If the value is not a valid event
+    """
+    return _EVENT_VALIDATOR.validate_python(data)
+
+
+def decode_route(body: Union[bytes, str]) -> EventRoute:
+    """Decode the routing fields of a webhook body.
+
+    Args:
+        body: JSON document
+
+    Returns:
+        The event projection
+
+    Raises:
+        ValidationError: If the body is not valid JSON or lacks routing fields
+    """
+    return _ROUTE_VALIDATOR.validate_json(body)
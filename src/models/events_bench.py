@@ -0,0 +1,101 @@
+"""Micro-benchmark of webhook body decoding.
+
+Compares the previous path (FastAPI's `json.loads` followed by
+`OpsgenieEvent.model_validate`) with the bytes decode and with the
+routing projection, on the benchmark corpus and on a full Opsgenie payload
+carrying the fields Opsgenie sends but no handler reads. Without a
+fallback handler an accepted request costs "route + event" and one rejected
+before processing only "route"; with a fallback every request costs "event".
+
+Run from `src/`:
+
+    python -m models.events_bench
+"""
+import argparse
+import json
+import timeit
+from typing import Any, Callable
+
+from benchmarks.webhook_bench import CORPUS
+from models.events import OpsgenieEvent, decode_event, decode_route
+from utils.alert_parser_bench import make_description
+
+
+def legacy_decode(body: bytes) -> OpsgenieEvent:
+    """Previous decode, a dict from `json.loads` validated by FastAPI."""
+    return OpsgenieEvent.model_validate(json.loads(body))
+
+
+def fast_decode(body: bytes) -> OpsgenieEvent:
+    """Projection for auth and routing, then the full event."""
+    decode_route(body)
+    return decode_event(body)
+
+
+def make_payload(labels_count: int) -> dict[str, Any]:
+    """Build an Opsgenie webhook payload with the fields Opsgenie sends."""
+    return {
+        "action": "CheckGitHubChanges",
+        "integrationId": "8c0b6f3e-grafana",
+        "integrationName": "Grafana production",
+        "integrationType": "Webhook",
+        "source": {"name": "grafana", "type": "API"},
+        "alert": {
+            "alertId": "0f5e4c1a-7a54-4c35-a1f4-6b36f2a8c1d9-1760000000000",
+            "message": "Health check is not 200",
+            "tags": ["production", "grafana", "lisbon"],
+            "tinyId": "4211",
+            "alias": "report-loader-db-health",
+            "createdAt": 1760000000000,
+            "updatedAt": 1760000000001000000,
+            "username": "System",
+            "userId": "5d1c1a4e",
+            "entity": "report.improvado.io",
+            "description": make_description(labels_count, 10),
+            "priority": "P2",
+            "teams": ["b3d1c7a2-sre"],
+            "responders": [{"id": "b3d1c7a2-sre", "type": "team", "name": "SRE"}],
+            "actions": ["CheckGitHubChanges", "IncreaseDiskSpace"],
+            "details": {f"label_{i}": f"value-{i}" for i in range(labels_count)},
+            "source": "Grafana",
+        },
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--labels", type=int, default=30, help="Labels of the full payload")
+    parser.add_argument("--number", type=int, default=5000, help="Decodes per measurement")
+    parser.add_argument("--repeat", type=int, default=5, help="Measurements, best one is used")
+    args = parser.parse_args()
+
+    with CORPUS.open() as corpus:
+        payloads = {
+            entry["name"]: entry["event"]
+            for entry in map(json.loads, filter(str.strip, corpus))
+        }
+    payloads["full-payload"] = make_payload(args.labels)
+
+    paths: dict[str, Callable[[bytes], Any]] = {
+        "legacy": legacy_decode,
+        "event": decode_event,
+        "route + event": fast_decode,
+        "route": decode_route,
+    }
+    print(f"{'payload':>20} {'bytes':>6} " + " ".join(f"{name:>14}" for name in paths) + "  (us/decode)")
+    for name, payload in payloads.items():
+        body = json.dumps(payload).encode()
+        assert decode_event(body) == legacy_decode(body)
+        results = [
+            min(timeit.repeat(lambda: decode(body), number=args.number, repeat=args.repeat))
+            / args.number * 1e6
+            for decode in paths.values()
+        ]
+        print(
+            f"{name:>20} {len(body):>6} "
+            + " ".join(f"{us:8.2f} {results[0] / us:4.1f}x" for us in results)
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+import json
+
+import pytest
+from pydantic import ValidationError
+
+from models.events import OpsgenieEvent, decode_event, decode_route
+
+EVENT = {
+    "action": "CheckGitHubChanges",
+    "integrationId": "test-integration",
+    "integrationName": "Test Integration",
+    "source": {"name": "Test Source", "type": "API"},
+    "alert": {
+        "alertId": "test-alert-id",
+        "message": "Test Alert",
+        "tags": ["production"],
+        "tinyId": "1234",
+        "alias": "test-alias",
+        "createdAt": 0,
+        "updatedAt": 0,
+        "username": "test-user",
+        "userId": "test-user-id",
+        "entity": "test-entity",
+        "description": "Labels:\n- alertname = HealthCheckIsNot200\n",
+        "details": {"unused": ["field"] * 10},
+    },
+}
+
+
+def test_decode_event_matches_model() -> None:
+    """Test that the fast decode builds the same event as model validation."""
+    body = json.dumps(EVENT).encode()
+
+    assert decode_event(body) == OpsgenieEvent.model_validate(EVENT)
+
+
+def test_decode_route() -> None:
+    """Test that the projection carries the routing fields."""
+    route = decode_route(json.dumps(EVENT).encode())
+
+    assert route.action == "CheckGitHubChanges"
+    assert route.integration_id == "test-integration"
+    assert route.alert.alert_id == "test-alert-id"
+    assert route.alert.tags == ["production"]
+    assert route.alertname == "HealthCheckIsNot200"
+
+
+def test_decode_coerces_like_model() -> None:
+    """Test that values are coerced like model validation, and invalid JSON is rejected."""
+    lax = {**EVENT, "alert": {**EVENT["alert"], "updatedAt": "0"}}
+
+    assert decode_event(json.dumps(lax).encode()) == OpsgenieEvent.model_validate(lax)
+    with pytest.raises(ValidationError):
+        decode_route(b'{"action": "Create"')
@@ -0,0 +1,25 @@
+from enum import Enum
+from typing import Any, Optional
+
+from pydantic import BaseModel
+
+
+class JobStatus(str, Enum):
+    """Lifecycle states of a background job."""
+    QUEUED = "queued"
+    RUNNING = "running"
+    DONE = "done"
+    FAILED = "failed"
+
+
+class Job(BaseModel):
+    """Background processing job for a single Opsgenie event."""
+    id: str
+    status: JobStatus = JobStatus.QUEUED
+    action: str
+    alert_id: str
+    created_at: float
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+    result: Optional[dict[str, Any]] = None
+    error: Optional[str] = None
@@ -0,0 +1,179 @@
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+from urllib.parse import parse_qs, urlparse
+
+import httpx
+import structlog
+
+from core.tracing import tracer
+from services.github.base import BaseGitHubService
+
+logger = structlog.get_logger()
+
+
+def count_from_link_header(response: httpx.Response, page_size: int) -> Optional[int]:
+    """Estimate total number of items from the `Link` header of a paged response.
+
+    With `per_page=1` the page number of the `last` link is the item count.
+
+    Args:
+        response: Paged GitHub API response
+        page_size: Page size used for the request
+
+    Returns:
+        Number of items if the response is paged, None otherwise
+    """
+    last = response.links.get("last")
+    if not last or "url" not in last:
+        return None
+    pages = parse_qs(urlparse(last["url"]).query).get("page")
+    if not pages:
+        return None
+    return int(pages[0]) * page_size
+
+
+class AsyncGitHubService(BaseGitHubService):
+    """Service for interacting with GitHub through a pooled async HTTP client."""
+
+    def __init__(
+        self,
+        token: str,
+        org: str = "improvado",
+        base_url: str = "https://api.github.com",
+        http2: bool = True,
+        max_connections: int = 20,
+        max_keepalive_connections: int = 10,
+        timeout: float = 10.0,
+    ) -> None:
+        """Initialize GitHub service.
+
+        Args:
+            token: GitHub access token
+            org: GitHub organization name
+            base_url: GitHub REST API URL
+            http2: Use HTTP/2 when the server supports it
+            max_connections: Maximum number of open connections
+            max_keepalive_connections: Maximum number of idle connections kept alive
+            timeout: Request timeout in seconds
+        """
+        super().__init__()
+        self._token = token
+        self._org_name = org
+        self._base_url = base_url
+        self._http2 = http2
+        self._limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+        )
+        self._timeout = timeout
+        self._client: Optional[httpx.AsyncClient] = None
+        logger.info("async_github_service.initialized", org=org, base_url=base_url)
+
+    def _get_client(self) -> httpx.AsyncClient:
+        """Get HTTP client, creating it on first use."""
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                base_url=self._base_url,
+                http2=self._http2,
+                limits=self._limits,
+                timeout=self._timeout,
+                headers={
+                    "Authorization": f"Bearer {self._token}",
+                    "Accept": "application/vnd.github+json",
+                    "X-GitHub-Api-Version": "2022-11-28",
+                },
+            )
+        return self._client
+
+    async def close(self) -> None:
+        """Close HTTP client and its connection pool."""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    @tracer.traced("github.fetch_recent_changes")
+    async def _fetch_recent_changes(
+        self,
+        service_name: str,
+        hours: int
+    ) -> dict[str, Optional[str]]:
+        """Fetch recent changes from GitHub.
+
+        The latest commit and the commit count come from a single
+        `per_page=1` request: the count is the page number of the `last` link.
+
+        Args:
+            service_name: Name of the service/repository
+            hours: Number of hours to look back
+
+        Returns:
+            Dictionary with change information
+        """
+        since = datetime.now(timezone.utc) - timedelta(hours=hours)
+
+        try:
+            response = await self._get_client().get(
+                f"/repos/{self._org_name}/{service_name}/commits",
+                params={"since": since.strftime("%Y-%m-%dT%H:%M:%SZ"), "per_page": 1},
+            )
+        except httpx.HTTPError as e:
+            logger.error(
+                "async_github_service.check_changes_error",
+                service=service_name,
+                error=str(e)
+            )
+            return {
+                "status": "error",
+                "message": f"Error checking changes: {str(e)}",
+                "last_commit": None,
+                "last_commit_url": None
+            }
+
+        if response.status_code == 404:
+            logger.warning("async_github_service.repo_not_found", service=service_name)
+            return {
+                "status": "error",
+                "message": f"Repository {service_name} not found",
+                "last_commit": None,
+                "last_commit_url": None
+            }
+
+        # GitHub answers 409 for repositories without any commits
+        if response.status_code == 409:
+            commits = []
+        elif response.is_error:
+            try:
+                message = response.json().get("message", response.text)
+            except ValueError:
+                message = response.text
+            logger.error(
+                "async_github_service.check_changes_error",
+                service=service_name,
+                status=response.status_code,
+                error=message
+            )
+            return {
+                "status": "error",
+                "message": f"Error checking changes: {response.status_code} {message}",
+                "last_commit": None,
+                "last_commit_url": None
+            }
+        else:
+            commits = response.json()
+
+        if not commits:
+            return {
+                "status": "success",
+                "message": f"No commits found in the last {hours} hours",
+                "last_commit": None,
+                "last_commit_url": None
+            }
+
+        latest_commit = commits[0]
+        total = count_from_link_header(response, page_size=1) or len(commits)
+        return {
+            "status": "success",
+            "message": f"Found {total} commits in the last {hours} hours",
+            "last_commit": latest_commit["commit"]["message"],
+            "last_commit_url": latest_commit["html_url"]
+        }
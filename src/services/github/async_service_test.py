@@ -0,0 +1,247 @@
+import json
+import threading
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Iterator
+
+import pytest
+
+from core.config import settings
+from handlers.github_changes_handler import GitHubChangesHandler
+from services.github.factory import create_github_service
+from models.events import Alert, OpsgenieEvent, Source
+
+
+class StubGitHub:
+    """Local GitHub API stub serving a single configured response."""
+
+    def __init__(self) -> None:
+        self.status = 200
+        self.body: Any = []
+        self.headers: dict[str, str] = {}
+        self.requests: list[str] = []
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self) -> None:
+                stub.requests.append(self.path)
+                payload = json.dumps(stub.body).encode()
+                self.send_response(stub.status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(payload)))
+                for name, value in stub.headers.items():
+                    self.send_header(name, value.format(base_url=stub.url))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def log_message(self, format: str, *args: Any) -> None:
+                pass
+
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self._server.server_address[1]}"
+        self._thread = threading.Thread(
+            target=self._server.serve_forever, kwargs={"poll_interval": 0.05}, daemon=True
+        )
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+
+@pytest.fixture
+def stub_github() -> Iterator[StubGitHub]:
+    """Running GitHub API stub."""
+    stub = StubGitHub()
+    stub.start()
+    yield stub
+    stub.stop()
+
+
+@pytest.fixture
+def handler(monkeypatch: pytest.MonkeyPatch, stub_github: StubGitHub) -> GitHubChangesHandler:
+    """GitHubChangesHandler using the httpx backend against the stub."""
+    monkeypatch.setattr(settings, "github_token", "test-token")
+    monkeypatch.setattr(settings, "github_backend", "httpx")
+    monkeypatch.setattr(settings, "github_api_url", stub_github.url)
+    monkeypatch.setattr(settings, "github_org", "improvado")
+    return GitHubChangesHandler()
+
+
+@pytest.fixture
+def sample_event() -> OpsgenieEvent:
+    """Sample Opsgenie event with health check alert."""
+    return OpsgenieEvent(
+        action="Create",
+        integrationId="test-integration",
+        integrationName="Test Integration",
+        source=Source(name="Test Source", type="API"),
+        alert=Alert(
+            alertId="test-alert-id",
+            message="Test Alert",
+            tags=["test"],
+            tinyId="1234",
+            alias="test-alias",
+            createdAt=int(datetime.now().timestamp()),
+            updatedAt=int(datetime.now().timestamp()),
+            username="test-user",
+            userId="test-user-id",
+            entity="test-entity",
+            description="""Alerts Firing:
+- Message: URL https://report.improvado.io/-/health/report-loader-db/, already crashed for 10m
+
+Labels:
+- alertname = HealthCheckIsNot200
+- group = production
+- host = report.improvado.io
+- k8s_cluster_name = lisbon""",
+        ),
+    )
+
+
+@pytest.mark.asyncio
+async def test_handle_success(
+    handler: GitHubChangesHandler,
+    sample_event: OpsgenieEvent,
+    stub_github: StubGitHub,
+) -> None:
+    """Test latest commit and count are fetched with a single request."""
+    stub_github.body = [
+        {
+            "commit": {"message": "Test commit"},
+            "html_url": "https://github.com/improvado/report-loader-db/commit/abc123",
+        }
+    ]
+    stub_github.headers = {
+        "Link": '<{base_url}/repos/improvado/report-loader-db/commits?per_page=1&page=2>; rel="next", '
+                '<{base_url}/repos/improvado/report-loader-db/commits?per_page=1&page=7>; rel="last"',
+    }
+
+    result = await handler.handle(sample_event)
+    await handler.close()
+
+    assert result["status"] == "processed"
+    assert result["alert_info"]["service"] == "report-loader-db"
+    assert result["github_changes"]["status"] == "success"
+    assert result["github_changes"]["last_commit"] == "Test commit"
+    assert result["github_changes"]["message"] == "Found 7 commits in the last 24 hours"
+    assert len(stub_github.requests) == 1
+    assert stub_github.requests[0].startswith("/repos/improvado/report-loader-db/commits?")
+    assert "per_page=1" in stub_github.requests[0]
+
+
+@pytest.mark.asyncio
+async def test_handle_single_commit(
+    handler: GitHubChangesHandler,
+    sample_event: OpsgenieEvent,
+    stub_github: StubGitHub,
+) -> None:
+    """Test commit count without pagination links."""
+    stub_github.body = [{"commit": {"message": "Only commit"}, "html_url": "url"}]
+
+    result = await handler.handle(sample_event)
+    await handler.close()
+
+    assert result["github_changes"]["message"] == "Found 1 commits in the last 24 hours"
+
+
+@pytest.mark.asyncio
+async def test_handle_no_changes(
+    handler: GitHubChangesHandler,
+    sample_event: OpsgenieEvent,
+    stub_github: StubGitHub,
+) -> None:
+    """Test handling of an event with no recent changes."""
+    stub_github.body = []
+
+    result = await handler.handle(sample_event)
+    await handler.close()
+
+    assert result["status"] == "processed"
+    assert result["github_changes"]["status"] == "success"
+    assert result["github_changes"]["message"] == "No commits found in the last 24 hours"
+    assert result["github_changes"]["last_commit"] is None
+
+
+@pytest.mark.asyncio
+async def test_handle_repo_not_found(
+    handler: GitHubChangesHandler,
+    sample_event: OpsgenieEvent,
+    stub_github: StubGitHub,
+) -> None:
+    """Test handling of a non-existent repository."""
+    stub_github.status = 404
+    stub_github.body = {"message": "Not Found"}
+
+    result = await handler.handle(sample_event)
+    await handler.close()
+
+    assert result["status"] == "processed"
+    assert result["github_changes"]["status"] == "error"
+    assert "Repository report-loader-db not found" in result["github_changes"]["message"]
+
+
+@pytest.mark.asyncio
+async def test_handle_github_api_error(
+    handler: GitHubChangesHandler,
+    sample_event: OpsgenieEvent,
+    stub_github: StubGitHub,
+) -> None:
+    """Test handling of GitHub API errors."""
+    stub_github.status = 500
+    stub_github.body = {"message": "Internal Server Error"}
+
+    result = await handler.handle(sample_event)
+    await handler.close()
+
+    assert result["status"] == "processed"
+    assert result["github_changes"]["status"] == "error"
+    assert "Error checking changes" in result["github_changes"]["message"]
+
+
+@pytest.mark.asyncio
+async def test_handle_rate_limit(
+    handler: GitHubChangesHandler,
+    sample_event: OpsgenieEvent,
+    stub_github: StubGitHub,
+) -> None:
+    """Test handling of GitHub API rate limit."""
+    stub_github.status = 403
+    stub_github.body = {
+        "message": "API rate limit exceeded",
+        "documentation_url": "https://docs.github.com/rest/overview/resources-in-the-rest-api#rate-limiting",
+    }
+
+    result = await handler.handle(sample_event)
+    await handler.close()
+
+    assert result["status"] == "processed"
+    assert result["github_changes"]["status"] == "error"
+    assert "API rate limit exceeded" in result["github_changes"]["message"]
+
+
+@pytest.mark.asyncio
+async def test_handle_invalid_description(
+    handler: GitHubChangesHandler,
+    sample_event: OpsgenieEvent,
+) -> None:
+    """Test handling of event with invalid description format."""
+    sample_event.alert.description = "Invalid description without URL"
+
+    result = await handler.handle(sample_event)
+
+    assert result["status"] == "error"
+    assert "Could not find URL in description" in result["error"]
+
+
+@pytest.mark.parametrize("backend", ["pygithub", "httpx"])
+def test_factory_uses_configured_org(monkeypatch: pytest.MonkeyPatch, backend: str) -> None:
+    """Test that both backends look repositories up in the configured org."""
+    monkeypatch.setattr(settings, "github_backend", backend)
+    monkeypatch.setattr(settings, "github_org", "tekliner")
+
+    assert create_github_service(token="test-token").org == "tekliner"
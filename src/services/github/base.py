@@ -0,0 +1,90 @@
+from abc import ABC, abstractmethod
+from typing import Any, Optional
+
+from core.cache import TTLCache
+from core.config import settings
+from core.metrics import track_call
+from core.tracing import tracer
+from services.github.repo_map import repo_map
+
+
+class BaseGitHubService(ABC):
+    """Base interface for GitHub service backends.
+    
+    Results of `check_recent_changes` are cached by (service, hours) for a
+    short time, so flapping alerts do not hit GitHub with identical requests.
+    """
+
+    _org_name: str
+
+    def __init__(self) -> None:
+        """Initialize caches."""
+        self._changes_cache: TTLCache[tuple[str, int], dict[str, Optional[str]]] = TTLCache(
+            max_size=settings.github_cache_max_size,
+            ttl=settings.github_changes_cache_ttl,
+        )
+
+    @property
+    def org(self) -> str:
+        """GitHub organization repositories are looked up in."""
+        return self._org_name
+
+    @tracer.traced("github.check_recent_changes")
+    @track_call("github", "check_recent_changes")
+    async def check_recent_changes(
+        self,
+        service_name: str,
+        hours: int = 24
+    ) -> dict[str, Optional[str]]:
+        """Check if there were any changes in the repository in the last N hours.
+        
+        Args:
+            service_name: Name of the service/repository
+            hours: Number of hours to look back
+            
+        Returns:
+            Dictionary with change information
+        """
+        # Known missing from the org listing, no 404 round trip
+        if not repo_map.exists(service_name):
+            return {
+                "status": "error",
+                "message": f"Repository {service_name} not found",
+                "last_commit": None,
+                "last_commit_url": None
+            }
+        return await self._changes_cache.get_or_load(
+            (service_name, hours),
+            lambda: self._fetch_recent_changes(service_name, hours),
+            cache_if=lambda result: result["status"] == "success",
+        )
+
+    @abstractmethod
+    async def _fetch_recent_changes(
+        self,
+        service_name: str,
+        hours: int
+    ) -> dict[str, Optional[str]]:
+        """Fetch recent changes from GitHub, bypassing the cache."""
+        pass
+
+    def invalidate(self, service_name: Optional[str] = None) -> None:
+        """Drop cached results for a service or, without a name, for all services.
+        
+        Args:
+            service_name: Name of the service/repository
+        """
+        if service_name is None:
+            self._changes_cache.invalidate()
+            return
+        for key in self._changes_cache.keys():
+            if key[0] == service_name:
+                self._changes_cache.invalidate(key)
+
+    def cache_stats(self) -> dict[str, Any]:
+        """Get cache statistics."""
+        return {"changes": self._changes_cache.stats()}
+
+    async def close(self) -> None:
+        """Release network resources held by the backend."""
+        pass
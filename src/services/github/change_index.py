@@ -0,0 +1,165 @@
+import bisect
+import heapq
+import itertools
+import time
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Any, Iterable, Literal, Optional
+
+from core.config import settings
+
+ChangeKind = Literal["push", "pull_request", "deployment"]
+
+
+@dataclass(frozen=True, slots=True)
+class Change:
+    """A push, merged pull request or deployment of a repository."""
+
+    timestamp: float  # Unix time the change landed
+    repo: str
+    kind: ChangeKind
+    id: str  # Commit sha, pull request number or deployment id
+    title: str
+    url: str
+    author: Optional[str] = None
+
+    def to_dict(self) -> dict[str, Any]:
+        """Serialize with an ISO 8601 time."""
+        return {
+            "time": datetime.fromtimestamp(self.timestamp, timezone.utc).isoformat(),
+            "repo": self.repo,
+            "kind": self.kind,
+            "id": self.id,
+            "title": self.title,
+            "url": self.url,
+            "author": self.author,
+        }
+
+
+class _Timeline:
+    """Changes ordered by time, with a parallel list of times to bisect."""
+
+    __slots__ = ("times", "changes")
+
+    def __init__(self) -> None:
+        self.times: list[float] = []
+        self.changes: list[Change] = []
+
+    def add(self, change: Change) -> None:
+        # Changes mostly arrive in order, so this is usually an append
+        position = bisect.bisect_right(self.times, change.timestamp)
+        self.times.insert(position, change.timestamp)
+        self.changes.insert(position, change)
+
+    def since(self, start: float) -> list[Change]:
+        """Changes from a time on, oldest first."""
+        return self.changes[bisect.bisect_left(self.times, start):]
+
+    def drop_before(self, cutoff: float) -> list[Change]:
+        position = bisect.bisect_left(self.times, cutoff)
+        dropped = self.changes[:position]
+        del self.times[:position], self.changes[:position]
+        return dropped
+
+
+class ChangeIndex:
+    """In-memory time-ordered index of changes across the organization.
+
+    Changes are kept in one timeline and one per repository, so "what
+    changed in the last N hours", optionally in a few repositories, takes a
+    binary search per timeline plus the size of the answer, without calling
+    GitHub. Changes older than `retention` seconds are dropped on insert.
+    """
+
+    def __init__(self, retention: float = 72 * 3600) -> None:
+        """Initialize index.
+
+        Args:
+            retention: Seconds changes are kept
+        """
+        self._retention = retention
+        self._all = _Timeline()
+        self._repos: dict[str, _Timeline] = {}
+        self._keys: set[tuple[str, ChangeKind, str]] = set()
+        self.updated_at: Optional[float] = None
+
+    @property
+    def ready(self) -> bool:
+        """Whether the index has been filled at least once."""
+        return self.updated_at is not None
+
+    def add(self, changes: Iterable[Change]) -> int:
+        """Add changes, skipping ones already indexed or past retention.
+
+        Args:
+            changes: Changes in any order
+
+        Returns:
+            Number of changes added
+        """
+        cutoff = time.time() - self._retention
+        added = 0
+        for change in changes:
+            key = (change.repo, change.kind, change.id)
+            if change.timestamp < cutoff or key in self._keys:
+                continue
+            self._keys.add(key)
+            self._all.add(change)
+            self._repos.setdefault(change.repo, _Timeline()).add(change)
+            added += 1
+
+        expired = self._all.drop_before(cutoff)
+        for change in expired:
+            self._keys.discard((change.repo, change.kind, change.id))
+        for repo in {change.repo for change in expired}:
+            timeline = self._repos[repo]
+            timeline.drop_before(cutoff)
+            if not timeline.times:
+                del self._repos[repo]
+        self.updated_at = time.time()
+        return added
+
+    def query(
+        self,
+        hours: float,
+        repos: Optional[Iterable[str]] = None,
+        kinds: Optional[Iterable[ChangeKind]] = None,
+        limit: Optional[int] = None,
+    ) -> list[Change]:
+        """Get changes of the last hours, newest first.
+
+        Args:
+            hours: Hours to look back
+            repos: Only changes of these repositories, all by default
+            kinds: Only changes of these kinds, all by default
+            limit: Maximum number of changes
+
+        Returns:
+            Matching changes, newest first
+        """
+        start = time.time() - hours * 3600
+        if repos is None:
+            found = self._all.since(start)
+        else:
+            timelines = [self._repos[repo] for repo in dict.fromkeys(repos) if repo in self._repos]
+            found = list(heapq.merge(
+                *(timeline.since(start) for timeline in timelines),
+                key=lambda change: change.timestamp,
+            ))
+        changes: Iterable[Change] = reversed(found)
+        if kinds is not None:
+            wanted = set(kinds)
+            changes = (change for change in changes if change.kind in wanted)
+        return list(itertools.islice(changes, limit))
+
+    def stats(self) -> dict[str, Any]:
+        """Get index statistics."""
+        return {
+            "changes": len(self._all.times),
+            "repos": len(self._repos),
+            "updated_at": self.updated_at,
+        }
+
+
+# Filled by the background indexer when it is enabled
+change_index = ChangeIndex(retention=settings.github_index_lookback_hours * 3600)
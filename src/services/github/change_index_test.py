@@ -0,0 +1,55 @@
+import time
+
+from services.github.change_index import Change, ChangeIndex
+
+
+def make_change(hours_ago: float, repo: str = "report-loader", kind: str = "push", id: str = "") -> Change:
+    return Change(
+        timestamp=time.time() - hours_ago * 3600,
+        repo=repo,
+        kind=kind,  # type: ignore[arg-type]
+        id=id or f"{repo}-{kind}-{hours_ago}",
+        title="Deploy",
+        url=f"https://github.com/improvado/{repo}",
+    )
+
+
+def test_query_newest_first() -> None:
+    """Test that only changes of the window are returned, newest first."""
+    index = ChangeIndex()
+    index.add([make_change(5), make_change(1), make_change(30), make_change(3)])
+
+    assert [round((time.time() - c.timestamp) / 3600) for c in index.query(hours=6)] == [1, 3, 5]
+    assert len(index.query(hours=48)) == 4
+    assert len(index.query(hours=48, limit=2)) == 2
+
+
+def test_query_repos_and_kinds() -> None:
+    """Test that changes of several repositories are merged in time order."""
+    index = ChangeIndex()
+    index.add([
+        make_change(1, "a"),
+        make_change(2, "b", "deployment"),
+        make_change(3, "a", "pull_request"),
+        make_change(4, "c"),
+    ])
+
+    assert [c.repo for c in index.query(hours=24, repos=["a", "b", "missing"])] == ["a", "b", "a"]
+    assert [c.kind for c in index.query(hours=24, kinds=["deployment", "pull_request"])] == [
+        "deployment", "pull_request",
+    ]
+
+
+def test_deduplicates_and_expires() -> None:
+    """Test that changes are indexed once and dropped after the retention."""
+    index = ChangeIndex(retention=10 * 3600)
+    assert not index.ready
+
+    assert index.add([make_change(1, id="x"), make_change(1, id="x"), make_change(11)]) == 1
+    assert index.add([make_change(1, id="x")]) == 0
+    assert index.ready
+    assert index.stats()["changes"] == 1
+
+    index._retention = 0.5 * 3600
+    index.add([])
+    assert index.stats() == {"changes": 0, "repos": 0, "updated_at": index.updated_at}
@@ -0,0 +1,33 @@
+from core.config import settings
+from services.github.base import BaseGitHubService
+
+
+def create_github_service(token: str) -> BaseGitHubService:
+    """Create GitHub service with the backend selected in settings.
+    
+    Args:
+        token: GitHub access token
+        
+    Returns:
+        GitHub service instance
+        
+    Raises:
+        ValueError: If the configured backend is unknown
+    """
+    if settings.github_backend == "pygithub":
+        from services.github.service import GitHubService
+        return GitHubService(token=token, org=settings.github_org)
+    
+    if settings.github_backend == "httpx":
+        from services.github.async_service import AsyncGitHubService
+        return AsyncGitHubService(
+            token=token,
+            org=settings.github_org,
+            base_url=settings.github_api_url,
+            http2=settings.github_http2,
+            max_connections=settings.github_max_connections,
+            max_keepalive_connections=settings.github_max_keepalive_connections,
+            timeout=settings.github_timeout,
+        )
+    
+    raise ValueError(f"Unknown GitHub backend: {settings.github_backend}")
@@ -0,0 +1,270 @@
+import asyncio
+import time
+from datetime import datetime, timezone
+from typing import Any, AsyncIterator, Awaitable, Callable, Optional
+
+import httpx
+import structlog
+
+from core.metrics import track_call
+from core.tracing import tracer
+from services.github.change_index import Change, ChangeIndex
+
+logger = structlog.get_logger()
+
+# Seconds a cursor is moved back, for changes committed before but pushed after a read
+CURSOR_OVERLAP = 300.0
+MAX_PAGES = 10
+
+
+class ListingTruncatedError(Exception):
+    """Raised when a listing has more than `MAX_PAGES` pages to read."""
+
+
+def parse_time(value: str) -> float:
+    """Parse a GitHub ISO 8601 time into Unix time."""
+    return datetime.fromisoformat(value.replace("Z", "+00:00")).timestamp()
+
+
+def format_time(timestamp: float) -> str:
+    """Format Unix time for GitHub `since` parameters."""
+    return datetime.fromtimestamp(timestamp, timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+class ChangeIndexer:
+    """Keeps a change index filled from the GitHub REST API in the background.
+
+    Every `interval` the repositories of the organization are listed by
+    last push, newest first, and listing stops at the first one idle for
+    the whole lookback. Commits of the default branch and merged pull
+    requests are only read for repositories pushed since their cursor;
+    deployments, which do not count as pushes, for every active repository.
+    All reads stop at the repository's cursor, which only advances once the
+    repository was read completely, so a failed read is retried next time.
+    """
+
+    def __init__(
+        self,
+        index: ChangeIndex,
+        token: str,
+        org: str,
+        base_url: str = "https://api.github.com",
+        interval: float = 300.0,
+        lookback_hours: int = 72,
+        concurrency: int = 4,
+        timeout: float = 10.0,
+    ) -> None:
+        """Initialize indexer.
+
+        Args:
+            index: Index changes are added to
+            token: GitHub access token
+            org: GitHub organization name
+            base_url: GitHub REST API URL
+            interval: Seconds between refreshes
+            lookback_hours: Hours of history read on the first refresh
+            concurrency: Repositories read at once
+            timeout: Request timeout in seconds
+        """
+        self._index = index
+        self._org = org
+        self._interval = interval
+        self._lookback = lookback_hours * 3600
+        self._concurrency = concurrency
+        self._client = httpx.AsyncClient(
+            base_url=base_url,
+            timeout=timeout,
+            headers={
+                "Authorization": f"Bearer {token}",
+                "Accept": "application/vnd.github+json",
+                "X-GitHub-Api-Version": "2022-11-28",
+            },
+        )
+        self._cursors: dict[str, float] = {}
+        self._pushed_at: dict[str, float] = {}
+        self._task: Optional[asyncio.Task[None]] = None
+        self.refreshes = 0
+        self.errors = 0
+        self.last_refresh_seconds: Optional[float] = None
+
+    @property
+    def org(self) -> str:
+        """GitHub organization the index is filled from."""
+        return self._org
+
+    def start(self) -> None:
+        """Start refreshing in the background."""
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop refreshing and close the HTTP client."""
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+        await self._client.aclose()
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await self.refresh()
+            except Exception as e:
+                self.errors += 1
+                logger.exception("change_indexer.refresh_failed", error=str(e))
+            await asyncio.sleep(self._interval)
+
+    async def _pages(self, path: str, params: dict[str, Any]) -> AsyncIterator[dict[str, Any]]:
+        """Iterate items of a paged listing, newest first for the listings used here.
+
+        Raises:
+            ListingTruncatedError: If pages are left after `MAX_PAGES`
+        """
+        url: Optional[str] = path
+        for _ in range(MAX_PAGES):
+            if url is None:
+                return
+            response = await self._client.get(url, params=params if url == path else None)
+            # Empty repositories answer 409, ones without access 404
+            if response.status_code in (404, 409):
+                return
+            response.raise_for_status()
+            for item in response.json():
+                yield item
+            url = response.links.get("next", {}).get("url")
+        if url is not None:
+            raise ListingTruncatedError(path)
+
+    @tracer.traced("github.index_refresh")
+    @track_call("github", "index_refresh")
+    async def refresh(self) -> int:
+        """Read changes since the last refresh into the index.
+
+        Returns:
+            Number of changes added
+        """
+        started = time.time()
+        horizon = started - self._lookback
+        active: list[dict[str, Any]] = []
+        try:
+            async for repo in self._pages(
+                f"/orgs/{self._org}/repos",
+                {"sort": "pushed", "direction": "desc", "per_page": 100},
+            ):
+                if not repo.get("pushed_at") or parse_time(repo["pushed_at"]) < horizon:
+                    break
+                active.append(repo)
+        except ListingTruncatedError:
+            # The repositories pushed least recently are read once others go idle
+            logger.warning("change_indexer.repos_truncated", org=self._org, repos=len(active))
+
+        semaphore = asyncio.Semaphore(self._concurrency)
+
+        async def read(repo: dict[str, Any]) -> int:
+            async with semaphore:
+                try:
+                    return await self._read_repo(repo, started)
+                except httpx.HTTPError as e:
+                    self.errors += 1
+                    logger.warning("change_indexer.repo_failed", repo=repo["name"], error=str(e))
+                    return 0
+
+        added = sum(await asyncio.gather(*(read(repo) for repo in active)))
+        self.refreshes += 1
+        self.last_refresh_seconds = round(time.time() - started, 3)
+        # Drops expired changes and marks the index ready, also without any repository
+        self._index.add(())
+        logger.info(
+            "change_indexer.refreshed",
+            repos=len(active),
+            added=added,
+            duration=self.last_refresh_seconds,
+        )
+        return added
+
+    async def _read_repo(self, repo: dict[str, Any], started: float) -> int:
+        """Read changes of a repository since its cursor, then advance it.
+
+        Changes read from a truncated listing are indexed, but the cursor
+        stays, so the pages left unread are read again next time.
+        """
+        name = repo["name"]
+        cursor = self._cursors.get(name, started - self._lookback)
+        pushed_at = parse_time(repo["pushed_at"])
+        changes: list[Change] = []
+        readers: list[Callable[[], Awaitable[None]]] = []
+        if pushed_at > self._pushed_at.get(name, 0):
+            readers.append(lambda: self._read_commits(name, cursor, changes))
+            readers.append(lambda: self._read_pull_requests(name, cursor, changes))
+        readers.append(lambda: self._read_deployments(name, repo.get("html_url", ""), cursor, changes))
+        complete = True
+        for reader in readers:
+            try:
+                await reader()
+            except ListingTruncatedError as e:
+                complete = False
+                logger.warning("change_indexer.listing_truncated", repo=name, path=str(e), pages=MAX_PAGES)
+
+        added = self._index.add(changes)
+        if complete:
+            self._cursors[name] = started - CURSOR_OVERLAP
+            self._pushed_at[name] = pushed_at
+        return added
+
+    async def _read_commits(self, repo: str, cursor: float, changes: list[Change]) -> None:
+        async for commit in self._pages(
+            f"/repos/{self._org}/{repo}/commits",
+            {"since": format_time(cursor), "per_page": 100},
+        ):
+            author = commit.get("author") or {}
+            changes.append(Change(
+                timestamp=parse_time(commit["commit"]["committer"]["date"]),
+                repo=repo,
+                kind="push",
+                id=commit["sha"],
+                title=commit["commit"]["message"].split("\n", 1)[0],
+                url=commit["html_url"],
+                author=author.get("login") or commit["commit"]["author"].get("name"),
+            ))
+
+    async def _read_pull_requests(self, repo: str, cursor: float, changes: list[Change]) -> None:
+        async for pull in self._pages(
+            f"/repos/{self._org}/{repo}/pulls",
+            {"state": "closed", "sort": "updated", "direction": "desc", "per_page": 50},
+        ):
+            if parse_time(pull["updated_at"]) < cursor:
+                break
+            if pull.get("merged_at") and parse_time(pull["merged_at"]) >= cursor:
+                changes.append(Change(
+                    timestamp=parse_time(pull["merged_at"]),
+                    repo=repo,
+                    kind="pull_request",
+                    id=str(pull["number"]),
+                    title=pull["title"],
+                    url=pull["html_url"],
+                    author=(pull.get("user") or {}).get("login"),
+                ))
+
+    async def _read_deployments(self, repo: str, html_url: str, cursor: float, changes: list[Change]) -> None:
+        async for deployment in self._pages(f"/repos/{self._org}/{repo}/deployments", {"per_page": 30}):
+            created_at = parse_time(deployment["created_at"])
+            if created_at < cursor:
+                break
+            changes.append(Change(
+                timestamp=created_at,
+                repo=repo,
+                kind="deployment",
+                id=str(deployment["id"]),
+                title=f"{deployment.get('environment')} {deployment.get('ref')}",
+                url=f"{html_url}/deployments" if html_url else deployment["url"],
+                author=(deployment.get("creator") or {}).get("login"),
+            ))
+
+    def stats(self) -> dict[str, Any]:
+        """Get indexer statistics."""
+        return {
+            "repos": len(self._cursors),
+            "refreshes": self.refreshes,
+            "errors": self.errors,
+            "last_refresh_seconds": self.last_refresh_seconds,
+        }
@@ -0,0 +1,137 @@
+import json
+import threading
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Iterator
+from urllib.parse import urlparse
+
+import pytest
+
+from services.github.change_index import ChangeIndex
+from services.github.indexer import ChangeIndexer
+
+
+def ago(hours: float) -> str:
+    return (datetime.now(timezone.utc) - timedelta(hours=hours)).strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+class StubGitHub:
+    """Local GitHub API stub answering listings by path."""
+
+    def __init__(self, routes: dict[str, Any]) -> None:
+        self.routes = routes
+        self.next_pages: set[str] = set()  # Paths answered with a link to a next page
+        self.requests: list[str] = []
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self) -> None:
+                stub.requests.append(self.path)
+                body = stub.routes.get(urlparse(self.path).path)
+                payload = json.dumps(body if body is not None else {"message": "Not Found"}).encode()
+                self.send_response(200 if body is not None else 404)
+                self.send_header("Content-Type", "application/json")
+                if urlparse(self.path).path in stub.next_pages:
+                    self.send_header("Link", f'<{stub.url}{urlparse(self.path).path}?page=2>; rel="next"')
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def log_message(self, format: str, *args: Any) -> None:
+                pass
+
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self._server.server_address[1]}"
+        threading.Thread(target=self._server.serve_forever, kwargs={"poll_interval": 0.05}, daemon=True).start()
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+
+@pytest.fixture
+def stub_github() -> Iterator[StubGitHub]:
+    """GitHub stub with one active and one idle repository."""
+    stub = StubGitHub({
+        "/orgs/improvado/repos": [
+            {"name": "report-loader", "pushed_at": ago(1), "html_url": "https://github.com/improvado/report-loader"},
+            {"name": "legacy", "pushed_at": ago(500)},
+        ],
+        "/repos/improvado/report-loader/commits": [{
+            "sha": "abc123",
+            "html_url": "https://github.com/improvado/report-loader/commit/abc123",
+            "author": {"login": "dev"},
+            "commit": {
+                "message": "Fix loader\n\nDetails",
+                "author": {"name": "Dev"},
+                "committer": {"date": ago(1)},
+            },
+        }],
+        "/repos/improvado/report-loader/pulls": [
+            {"number": 7, "title": "Add retries", "html_url": "https://github.com/improvado/report-loader/pull/7",
+             "user": {"login": "dev"}, "updated_at": ago(2), "merged_at": ago(2)},
+            {"number": 6, "title": "Closed unmerged", "html_url": "", "updated_at": ago(3), "merged_at": None},
+            {"number": 5, "title": "Too old", "html_url": "", "updated_at": ago(100), "merged_at": ago(100)},
+        ],
+        "/repos/improvado/report-loader/deployments": [
+            {"id": 42, "environment": "production", "ref": "main", "created_at": ago(0.5),
+             "url": "", "creator": {"login": "ci"}},
+        ],
+    })
+    yield stub
+    stub.stop()
+
+
+@pytest.mark.asyncio
+async def test_refresh_indexes_active_repos(stub_github: StubGitHub) -> None:
+    """Test that pushes, merged PRs and deployments of active repositories are indexed."""
+    index = ChangeIndex()
+    indexer = ChangeIndexer(index, token="t", org="improvado", base_url=stub_github.url, lookback_hours=72)
+
+    assert await indexer.refresh() == 3
+    await indexer.stop()
+
+    changes = index.query(hours=24)
+    assert [(c.kind, c.id) for c in changes] == [
+        ("deployment", "42"), ("push", "abc123"), ("pull_request", "7"),
+    ]
+    assert changes[1].title == "Fix loader"
+    assert not any("/repos/improvado/legacy/" in path for path in stub_github.requests)
+
+
+@pytest.mark.asyncio
+async def test_refresh_is_incremental(stub_github: StubGitHub) -> None:
+    """Test that an unchanged repository is only checked for deployments again."""
+    index = ChangeIndex()
+    indexer = ChangeIndexer(index, token="t", org="improvado", base_url=stub_github.url)
+
+    await indexer.refresh()
+    stub_github.requests.clear()
+    added = await indexer.refresh()
+    await indexer.stop()
+
+    assert added == 0
+    paths = [urlparse(path).path for path in stub_github.requests]
+    assert paths == ["/orgs/improvado/repos", "/repos/improvado/report-loader/deployments"]
+    assert indexer.stats()["refreshes"] == 2
+
+
+@pytest.mark.asyncio
+async def test_truncated_listing_keeps_cursor(
+    stub_github: StubGitHub, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Test that a repository with unread pages is read again from the same cursor."""
+    monkeypatch.setattr("services.github.indexer.MAX_PAGES", 1)
+    stub_github.next_pages.add("/repos/improvado/report-loader/commits")
+    index = ChangeIndex()
+    indexer = ChangeIndexer(index, token="t", org="improvado", base_url=stub_github.url)
+
+    assert await indexer.refresh() == 3
+    stub_github.requests.clear()
+    await indexer.refresh()
+    await indexer.stop()
+
+    assert "/repos/improvado/report-loader/commits" in [urlparse(path).path for path in stub_github.requests]
+    assert indexer.stats()["repos"] == 0
@@ -0,0 +1,280 @@
+import asyncio
+import dataclasses
+import fnmatch
+import json
+import os
+import re
+from dataclasses import dataclass
+from types import MappingProxyType
+from typing import Any, Iterable, Mapping, Optional
+
+import structlog
+
+from core.config import settings
+
+logger = structlog.get_logger()
+
+MAX_REPO_PAGES = 50
+
+
+@dataclass(frozen=True, slots=True)
+class RepoMap:
+    """Immutable rules resolving service names to GitHub repositories.
+
+    A service resolves by its exact entry, then to itself if it is a known
+    repository, then by the longest matching prefix, then by the first
+    matching glob, and otherwise to itself.
+    """
+
+    services: Mapping[str, str] = dataclasses.field(default_factory=lambda: MappingProxyType({}))
+    prefixes: tuple[tuple[str, str], ...] = ()  # Longest prefix first
+    globs: tuple[tuple[re.Pattern[str], str], ...] = ()
+    repos: Optional[frozenset[str]] = None  # Lowercase names of the org, None if not listed
+
+    @classmethod
+    def from_dict(cls, data: Mapping[str, Any]) -> "RepoMap":
+        """Build rules from a parsed mapping file.
+
+        Args:
+            data: Object with optional "services", "prefixes" and "globs"
+                objects, each mapping a service name, prefix or glob to a
+                repository name
+
+        Returns:
+            Rules with prefixes ordered and globs compiled
+
+        Raises:
+            ValueError: If a section or repository name has the wrong type
+        """
+        sections = {}
+        for section in ("services", "prefixes", "globs"):
+            rules = data.get(section, {})
+            if not isinstance(rules, dict) or not all(
+                isinstance(key, str) and isinstance(repo, str) for key, repo in rules.items()
+            ):
+                raise ValueError(f'"{section}" must map names to repository names')
+            sections[section] = rules
+        return cls(
+            services=MappingProxyType(dict(sections["services"])),
+            prefixes=tuple(sorted(sections["prefixes"].items(), key=lambda rule: -len(rule[0]))),
+            globs=tuple(
+                (re.compile(fnmatch.translate(pattern)), repo)
+                for pattern, repo in sections["globs"].items()
+            ),
+        )
+
+    def resolve(self, service_name: str) -> str:
+        """Get the repository of a service.
+
+        Args:
+            service_name: Service name from the health check URL
+
+        Returns:
+            Repository name, the service name if no rule matches
+        """
+        if (repo := self.services.get(service_name)) is not None:
+            return repo
+        if self.repos is not None and service_name.lower() in self.repos:
+            return service_name
+        for prefix, repo in self.prefixes:
+            if service_name.startswith(prefix):
+                return repo
+        for pattern, repo in self.globs:
+            if pattern.match(service_name):
+                return repo
+        return service_name
+
+    def exists(self, repo: str) -> bool:
+        """Whether a repository may exist, always true if the org was not listed."""
+        return self.repos is None or repo.lower() in self.repos
+
+
+class RepoMapStore:
+    """Holds the current `RepoMap` and reloads it when its file changes.
+
+    The file, e.g. a mounted ConfigMap, is checked every `interval` seconds
+    by a task of each worker, so edits apply without a restart. A new map
+    replaces the current one as a whole, lookups never see a partial one;
+    an unreadable or invalid file keeps the previous map.
+    """
+
+    def __init__(self, path: Optional[str] = None) -> None:
+        """Initialize store, loading the file if one is set.
+
+        Args:
+            path: JSON mapping file, None for no rules
+        """
+        self._path = path
+        self._signature: Optional[tuple[int, int, int]] = None
+        self._task: Optional[asyncio.Task[None]] = None
+        self.current = RepoMap()
+        self.reloads = 0
+        self.errors = 0
+        if path is not None:
+            self.reload()
+
+    def resolve(self, service_name: str) -> str:
+        """Get the repository of a service with the current rules."""
+        return self.current.resolve(service_name)
+
+    def exists(self, repo: str) -> bool:
+        """Whether a repository may exist with the current rules."""
+        return self.current.exists(repo)
+
+    def reload(self) -> bool:
+        """Load the file if it changed since the last load.
+
+        Returns:
+            Whether a new map was loaded
+        """
+        if self._path is None:
+            return False
+        try:
+            # Stat follows the symlink a ConfigMap update swaps
+            stat = os.stat(self._path)
+            signature = (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+            if signature == self._signature:
+                return False
+            with open(self._path, encoding="utf-8") as file:
+                data = json.load(file)
+            if not isinstance(data, dict):
+                raise ValueError("Mapping file must contain a JSON object")
+            loaded = RepoMap.from_dict(data)
+        except (OSError, ValueError) as e:
+            self.errors += 1
+            logger.error("repo_map.reload_failed", path=self._path, error=str(e))
+            return False
+
+        self._signature = signature
+        self.current = dataclasses.replace(loaded, repos=self.current.repos)
+        self.reloads += 1
+        logger.info(
+            "repo_map.reloaded",
+            path=self._path,
+            services=len(loaded.services),
+            prefixes=len(loaded.prefixes),
+            globs=len(loaded.globs),
+        )
+        return True
+
+    def set_repos(self, repos: Iterable[str]) -> None:
+        """Set the repositories of the org, unknown ones are not looked up.
+
+        Args:
+            repos: Repository names
+        """
+        self.current = dataclasses.replace(self.current, repos=frozenset(repo.lower() for repo in repos))
+
+    async def prepopulate(self, token: str, org: str, base_url: str, timeout: float = 10.0) -> int:
+        """List the repositories of an organization into the map.
+
+        On failure the map stays without repositories, so every service is
+        still looked up on GitHub.
+
+        Args:
+            token: GitHub access token
+            org: GitHub organization name
+            base_url: GitHub REST API URL
+            timeout: Request timeout in seconds
+
+        Returns:
+            Number of repositories, 0 on failure
+        """
+        # Imported here, the alert parser imports this module on the startup path
+        import httpx
+
+        names: list[str] = []
+        try:
+            async with httpx.AsyncClient(
+                base_url=base_url,
+                timeout=timeout,
+                headers={
+                    "Authorization": f"Bearer {token}",
+                    "Accept": "application/vnd.github+json",
+                    "X-GitHub-Api-Version": "2022-11-28",
+                },
+            ) as client:
+                url: Optional[str] = f"/orgs/{org}/repos"
+                params: Optional[dict[str, Any]] = {"per_page": 100, "type": "all"}
+                for _ in range(MAX_REPO_PAGES):
+                    if url is None:
+                        break
+                    response = await client.get(url, params=params)
+                    response.raise_for_status()
+                    names.extend(repo["name"] for repo in response.json())
+                    url, params = response.links.get("next", {}).get("url"), None
+                # A partial list would hide existing repositories
+                if url is not None:
+                    raise ValueError(f"Organization has over {MAX_REPO_PAGES * 100} repositories")
+        except (httpx.HTTPError, ValueError) as e:
+            self.errors += 1
+            logger.error("repo_map.prepopulate_failed", org=org, error=str(e))
+            return 0
+
+        self.set_repos(names)
+        logger.info("repo_map.prepopulated", org=org, repos=len(names))
+        return len(names)
+
+    async def keep_listed(
+        self,
+        token: str,
+        org: str,
+        base_url: str,
+        interval: float,
+        timeout: float = 10.0,
+    ) -> None:
+        """List the repositories of an organization now and then every interval.
+
+        Repositories created after a listing are reported as not found
+        until the next one, so the interval bounds how long that lasts.
+
+        Args:
+            token: GitHub access token
+            org: GitHub organization name
+            base_url: GitHub REST API URL
+            interval: Seconds between listings, 0 lists once
+            timeout: Request timeout in seconds
+        """
+        while True:
+            await self.prepopulate(token=token, org=org, base_url=base_url, timeout=timeout)
+            if interval <= 0:
+                return
+            await asyncio.sleep(interval)
+
+    def start(self, interval: float) -> None:
+        """Check the file for changes in the background.
+
+        Args:
+            interval: Seconds between checks
+        """
+        if self._task is None and self._path is not None:
+            self._task = asyncio.create_task(self._run(interval))
+
+    async def stop(self) -> None:
+        """Stop checking the file."""
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    async def _run(self, interval: float) -> None:
+        while True:
+            await asyncio.sleep(interval)
+            self.reload()
+
+    def stats(self) -> dict[str, Any]:
+        """Get map statistics."""
+        current = self.current
+        return {
+            "path": self._path,
+            "services": len(current.services),
+            "prefixes": len(current.prefixes),
+            "globs": len(current.globs),
+            "repos": len(current.repos) if current.repos is not None else None,
+            "reloads": self.reloads,
+            "errors": self.errors,
+        }
+
+
+# Rules of `settings.repo_map_file`, reloaded by the app lifespan
+repo_map = RepoMapStore(settings.repo_map_file)
@@ -0,0 +1,164 @@
+import asyncio
+import json
+import os
+from pathlib import Path
+from typing import Iterator
+
+import pytest
+
+from services.github.async_service import AsyncGitHubService
+from services.github.indexer_test import StubGitHub
+from services.github.repo_map import RepoMap, RepoMapStore
+from utils.alert_parser import parse_alert
+
+RULES = {
+    "services": {"report-loader-db": "rtbmedia"},
+    "prefixes": {"report-": "reports", "report-api-": "report-api"},
+    "globs": {"*-worker": "workers", "etl-??": "etl"},
+}
+
+
+def write_rules(path: Path, rules: object) -> None:
+    path.write_text(json.dumps(rules))
+    # Every write counts as a change, also within the mtime resolution
+    os.utime(path, ns=(0, path.stat().st_mtime_ns + 1_000_000))
+
+
+@pytest.fixture
+def stub_github() -> Iterator[StubGitHub]:
+    """GitHub stub listing two repositories of the org."""
+    stub = StubGitHub({"/orgs/improvado/repos": [{"name": "rtbmedia"}, {"name": "Report-Loader"}]})
+    yield stub
+    stub.stop()
+
+
+def test_resolve_order() -> None:
+    """Test exact entries, then the longest prefix, then the first glob."""
+    rules = RepoMap.from_dict(RULES)
+
+    assert rules.resolve("report-loader-db") == "rtbmedia"
+    assert rules.resolve("report-api-v2") == "report-api"
+    assert rules.resolve("report-ui") == "reports"
+    assert rules.resolve("billing-worker") == "workers"
+    assert rules.resolve("etl-01") == "etl"
+    assert rules.resolve("etl-001") == "etl-001"
+    assert rules.resolve("billing") == "billing"
+    assert rules.exists("anything")
+    with pytest.raises(TypeError):
+        rules.services["billing"] = "x"  # type: ignore[index]
+
+
+def test_resolve_known_repos() -> None:
+    """Test that a listed repository wins over prefix rules and others do not exist."""
+    rules = RepoMap.from_dict(RULES)
+    listed = RepoMap(rules.services, rules.prefixes, rules.globs, repos=frozenset({"report-ui"}))
+
+    assert listed.resolve("report-ui") == "report-ui"
+    assert listed.resolve("report-loader-db") == "rtbmedia"
+    assert listed.exists("Report-UI")
+    assert not listed.exists("reports")
+
+
+def test_from_dict_invalid() -> None:
+    """Test that rules must map names to names."""
+    with pytest.raises(ValueError, match='"prefixes"'):
+        RepoMap.from_dict({"prefixes": ["report-"]})
+    with pytest.raises(ValueError, match='"services"'):
+        RepoMap.from_dict({"services": {"report": 1}})
+
+
+def test_shipped_rules() -> None:
+    """Test that the mapping file shipped in conf/ loads and keeps the original entry."""
+    store = RepoMapStore(str(Path(__file__).parents[3] / "conf" / "repo-map.json"))
+
+    assert store.resolve("report-loader-db") == "rtbmedia"
+    assert store.resolve("billing") == "billing"
+
+
+def test_store_reload(tmp_path: Path) -> None:
+    """Test that the file is reloaded on change and a broken one keeps the rules."""
+    path = tmp_path / "repo-map.json"
+    write_rules(path, RULES)
+    store = RepoMapStore(str(path))
+    assert store.resolve("report-loader-db") == "rtbmedia"
+    assert not store.reload()
+
+    write_rules(path, {"services": {"report-loader-db": "report-loader"}})
+    assert store.reload()
+    assert store.resolve("report-loader-db") == "report-loader"
+    assert store.resolve("billing-worker") == "billing-worker"
+
+    write_rules(path, {"services": []})
+    assert not store.reload()
+    path.write_text("{")
+    assert not store.reload()
+    path.unlink()
+    assert not store.reload()
+    assert store.resolve("report-loader-db") == "report-loader"
+    assert store.stats()["reloads"] == 2
+    assert store.stats()["errors"] == 3
+
+
+@pytest.mark.asyncio
+async def test_store_prepopulate(stub_github: StubGitHub, tmp_path: Path) -> None:
+    """Test that listed repositories survive reloads and unknown ones do not exist."""
+    path = tmp_path / "repo-map.json"
+    write_rules(path, RULES)
+    store = RepoMapStore(str(path))
+
+    assert await store.prepopulate("token", "improvado", stub_github.url) == 2
+    assert store.exists("report-loader")
+    assert not store.exists("report-loader-db")
+
+    write_rules(path, {})
+    assert store.reload()
+    assert store.stats()["repos"] == 2
+    assert store.resolve("report-loader-db") == "report-loader-db"
+
+    assert await store.prepopulate("token", "tekliner", stub_github.url) == 0
+    assert store.stats()["repos"] == 2
+
+
+@pytest.mark.asyncio
+async def test_store_keep_listed(stub_github: StubGitHub) -> None:
+    """Test that repositories created after the first listing are found later."""
+    store = RepoMapStore()
+    task = asyncio.create_task(store.keep_listed("token", "improvado", stub_github.url, interval=0.05))
+    try:
+        for _ in range(100):
+            if store.stats()["repos"] is not None:
+                break
+            await asyncio.sleep(0.01)
+        assert not store.exists("billing")
+
+        stub_github.routes["/orgs/improvado/repos"] = [{"name": "rtbmedia"}, {"name": "billing"}]
+        for _ in range(100):
+            if store.exists("billing"):
+                break
+            await asyncio.sleep(0.01)
+        assert store.exists("billing")
+    finally:
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+
+
+@pytest.mark.asyncio
+async def test_unknown_repo_not_fetched(
+    stub_github: StubGitHub, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Test that the alert service resolves by the rules and a missing repo costs no request."""
+    store = RepoMapStore()
+    store.current = RepoMap.from_dict(RULES)
+    store.set_repos(["rtbmedia"])
+    monkeypatch.setattr("utils.alert_parser.repo_map", store)
+    monkeypatch.setattr("services.github.base.repo_map", store)
+
+    description = "URL https://report.improvado.io/-/health/report-loader-db/, crashed"
+    assert parse_alert(description).service_name == "rtbmedia"
+
+    service = AsyncGitHubService(token="token", base_url=stub_github.url, http2=False)
+    result = await service.check_recent_changes("billing")
+    await service.close()
+    assert result["status"] == "error"
+    assert result["message"] == "Repository billing not found"
+    assert stub_github.requests == []
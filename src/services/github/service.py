@@ -1,15 +1,21 @@
 from datetime import datetime, timedelta
-from typing import Optional
+from typing import Any, Optional
 
 import structlog
 from github import Github, Auth
 from github.Repository import Repository
 
+from core.cache import TTLCache
+from core.config import settings
+from core.executor import executor
+from core.tracing import tracer
+from services.github.base import BaseGitHubService
+
 logger = structlog.get_logger()
 
 
-class GitHubService:
-    """Service for interacting with GitHub."""
+class GitHubService(BaseGitHubService):
+    """Service for interacting with GitHub through PyGithub."""
     
     def __init__(self, token: str, org: str = "improvado") -> None:
         """Initialize GitHub service.
@@ -18,10 +24,15 @@ class GitHubService:
             token: GitHub access token
             org: GitHub organization name
         """
+        super().__init__()
         self._token = token
         self._org_name = org
         self._github: Optional[Github] = None
         self._org_instance = None
+        self._repo_cache: TTLCache[str, Repository] = TTLCache(
+            max_size=settings.github_cache_max_size,
+            ttl=settings.github_repo_cache_ttl,
+        )
         logger.info("github_service.initialized", org=org)
     
     def _ensure_initialized(self) -> None:
@@ -31,6 +42,7 @@ class GitHubService:
             self._github = Github(auth=auth)
             self._org_instance = self._github.get_organization(self._org_name)
     
+    @tracer.traced("github.get_repository")
     def _get_repository(self, service_name: str) -> Optional[Repository]:
         """Get repository by service name.
         
@@ -51,12 +63,13 @@ class GitHubService:
             )
             return None
     
-    async def check_recent_changes(
+    @tracer.traced("github.fetch_recent_changes")
+    async def _fetch_recent_changes(
         self,
         service_name: str,
-        hours: int = 24
+        hours: int
     ) -> dict[str, Optional[str]]:
-        """Check if there were any changes in the repository in the last N hours.
+        """Fetch recent changes from GitHub.
         
         Args:
             service_name: Name of the service/repository
@@ -65,7 +78,10 @@ class GitHubService:
         Returns:
             Dictionary with change information
         """
-        repo = self._get_repository(service_name)
+        repo = await self._repo_cache.get_or_load(
+            service_name,
+            lambda: executor.run("github", self._get_repository, service_name),
+        )
         if not repo:
             return {
                 "status": "error",
@@ -74,6 +90,27 @@ class GitHubService:
                 "last_commit_url": None
             }
         
+        return await executor.run(
+            "github", self._get_recent_commits, repo, service_name, hours
+        )
+    
+    @tracer.traced("github.get_recent_commits")
+    def _get_recent_commits(
+        self,
+        repo: Repository,
+        service_name: str,
+        hours: int
+    ) -> dict[str, Optional[str]]:
+        """Get latest commit and commit count of the last N hours.
+        
+        Args:
+            repo: Repository to inspect
+            service_name: Name of the service/repository
+            hours: Number of hours to look back
+            
+        Returns:
+            Dictionary with change information
+        """
         try:
             # Get commits from the last N hours
             since = datetime.now() - timedelta(hours=hours)
@@ -107,4 +144,17 @@ class GitHubService:
                 "message": f"Error checking changes: {str(e)}",
                 "last_commit": None,
                 "last_commit_url": None
-            } 
\ No newline at end of file
+            } 
+    
+    def invalidate(self, service_name: Optional[str] = None) -> None:
+        """Drop cached repositories and results for a service or for all services.
+        
+        Args:
+            service_name: Name of the service/repository
+        """
+        super().invalidate(service_name)
+        self._repo_cache.invalidate(service_name)
+    
+    def cache_stats(self) -> dict[str, Any]:
+        """Get cache statistics."""
+        return {**super().cache_stats(), "repos": self._repo_cache.stats()}
@@ -0,0 +1,40 @@
+from core.config import settings
+from handlers.low_disk_space_handler import LowDiskSpaceHandler
+from services.kubernetes.pool import KubernetesClusterPool
+from services.kubernetes.resizer import PVCResizer
+
+
+def create_pvc_resizer() -> PVCResizer:
+    """Create PVC resizer with the cluster pool configured in settings.
+
+    Config of every cluster is loaded here.
+
+    Returns:
+        Resizer over a started cluster pool
+    """
+    clusters = KubernetesClusterPool(
+        config_file=settings.kubernetes_config_file,
+        cluster_contexts=settings.kubernetes_cluster_contexts,
+        in_cluster_name=settings.kubernetes_in_cluster_name,
+        idle_timeout=settings.kubernetes_idle_timeout,
+        pool_maxsize=settings.kubernetes_pool_maxsize,
+        connect_timeout=settings.kubernetes_connect_timeout,
+        read_timeout=settings.kubernetes_read_timeout,
+    )
+    clusters.start()
+    return PVCResizer(
+        clusters=clusters,
+        increment=settings.kubernetes_resize_increment,
+        window=settings.kubernetes_resize_window,
+        max_concurrency=settings.kubernetes_resize_concurrency,
+        cooldown=settings.kubernetes_resize_cooldown,
+    )
+
+
+def create_low_disk_space_handler() -> LowDiskSpaceHandler:
+    """Create low disk space handler with a PVC resizer configured in settings.
+
+    Returns:
+        Handler owning the resizer
+    """
+    return LowDiskSpaceHandler(create_pvc_resizer())
@@ -0,0 +1,149 @@
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Iterator
+
+import pytest
+from kubernetes.client.exceptions import ApiException
+
+from services.kubernetes.service import KubernetesService
+
+
+class StubKubernetes:
+    """Local Kubernetes API stub serving PersistentVolumeClaims."""
+
+    def __init__(self) -> None:
+        self.requests: list[tuple[str, str]] = []
+        self.sizes = {("data", "pvc-0"): "20Gi"}
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def _pvc(self) -> None:
+                # /api/v1/namespaces/{namespace}/persistentvolumeclaims[/{name}]
+                parts = self.path.split("?")[0].strip("/").split("/")
+                stub.requests.append((self.command, self.path))
+                if len(parts) == 5:
+                    self._send(200, {
+                        "apiVersion": "v1",
+                        "kind": "PersistentVolumeClaimList",
+                        "metadata": {},
+                        "items": [
+                            self._claim(key) for key in sorted(stub.sizes) if key[0] == parts[3]
+                        ],
+                    })
+                    return
+                key = (parts[3], parts[5])
+                if self.command == "PATCH":
+                    length = int(self.headers.get("Content-Length", 0))
+                    patch = json.loads(self.rfile.read(length))
+                if key not in stub.sizes:
+                    self._send(404, {"kind": "Status", "code": 404, "reason": "NotFound"})
+                    return
+                if self.command == "PATCH":
+                    stub.sizes[key] = patch["spec"]["resources"]["requests"]["storage"]
+                self._send(200, self._claim(key))
+
+            def _claim(self, key: tuple[str, str]) -> dict[str, Any]:
+                return {
+                    "apiVersion": "v1",
+                    "kind": "PersistentVolumeClaim",
+                    "metadata": {"name": key[1], "namespace": key[0]},
+                    "spec": {"resources": {"requests": {"storage": stub.sizes[key]}}},
+                }
+
+            def _send(self, status: int, payload: dict[str, Any]) -> None:
+                body = json.dumps(payload).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            do_GET = do_PATCH = _pvc
+
+            def log_message(self, format: str, *args: Any) -> None:
+                pass
+
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self._server.server_address[1]}"
+        self._thread = threading.Thread(
+            target=self._server.serve_forever, kwargs={"poll_interval": 0.05}, daemon=True
+        )
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+
+def write_kubeconfig(path: Path, server: str) -> str:
+    """Write a kubeconfig with a single context pointing at the server."""
+    path.write_text(json.dumps({
+        "apiVersion": "v1",
+        "kind": "Config",
+        "clusters": [{"name": "stub", "cluster": {"server": server}}],
+        "users": [{"name": "stub", "user": {"token": "test-token"}}],
+        "contexts": [{"name": "stub", "context": {"cluster": "stub", "user": "stub"}}],
+        "current-context": "stub",
+    }))
+    return str(path)
+
+
+@pytest.fixture
+def stub_kubernetes() -> Iterator[StubKubernetes]:
+    """Running Kubernetes API stub."""
+    stub = StubKubernetes()
+    stub.start()
+    yield stub
+    stub.stop()
+
+
+@pytest.fixture
+def service(stub_kubernetes: StubKubernetes, tmp_path: Path) -> Iterator[KubernetesService]:
+    """Started Kubernetes service pointing at the stub."""
+    service = KubernetesService(
+        config_file=write_kubeconfig(tmp_path / "kubeconfig", stub_kubernetes.url),
+    )
+    service.start()
+    yield service
+    service.close()
+
+
+@pytest.mark.asyncio
+async def test_list_pvcs(service: KubernetesService, stub_kubernetes: StubKubernetes) -> None:
+    """Test that the claims of a namespace are listed with one request."""
+    stub_kubernetes.sizes[("data", "pvc-1")] = "50Gi"
+    stub_kubernetes.sizes[("logs", "pvc-0")] = "5Gi"
+
+    claims = await service.list_pvcs("data")
+
+    assert [pvc.metadata.name for pvc in claims] == ["pvc-0", "pvc-1"]
+    assert claims[0].spec.resources.requests["storage"] == "20Gi"
+    assert len(stub_kubernetes.requests) == 1
+
+
+@pytest.mark.asyncio
+async def test_patch_pvc(service: KubernetesService, stub_kubernetes: StubKubernetes) -> None:
+    """Test that a patched claim is returned from the patch response."""
+    pvc = await service.patch_pvc(
+        "data", "pvc-0", {"spec": {"resources": {"requests": {"storage": "30Gi"}}}}
+    )
+
+    assert pvc.spec.resources.requests["storage"] == "30Gi"
+    assert [method for method, _ in stub_kubernetes.requests] == ["PATCH"]
+
+
+@pytest.mark.asyncio
+async def test_missing_pvc(service: KubernetesService) -> None:
+    """Test that API errors are raised."""
+    with pytest.raises(ApiException) as error:
+        await service.patch_pvc(
+            "data", "missing", {"spec": {"resources": {"requests": {"storage": "30Gi"}}}}
+        )
+
+    assert error.value.status == 404
@@ -0,0 +1,178 @@
+import os
+import time
+from typing import Any, Callable, Optional
+
+import structlog
+from kubernetes import client, config
+
+from services.kubernetes.service import KubernetesService
+
+logger = structlog.get_logger()
+
+
+class UnknownClusterError(LookupError):
+    """Raised when no config is loaded for a cluster."""
+
+
+class KubernetesClusterPool:
+    """Kubernetes services of all known clusters, keyed by cluster name.
+
+    Cluster names are the `k8s_cluster_name` alert label. Config of every
+    kubeconfig context (and of the cluster the app runs in) is loaded once at
+    startup; API clients are created on first use, so their connections stay
+    warm while a cluster is busy, and closed once unused for `idle_timeout`
+    by `evict_idle`, which the app runs periodically.
+    """
+
+    def __init__(
+        self,
+        config_file: Optional[str] = None,
+        cluster_contexts: Optional[dict[str, str]] = None,
+        in_cluster_name: Optional[str] = None,
+        idle_timeout: float = 600.0,
+        clock: Callable[[], float] = time.monotonic,
+        **service_options: Any,
+    ) -> None:
+        """Initialize cluster pool.
+
+        Args:
+            config_file: Kubeconfig path, None for the default location
+            cluster_contexts: Cluster name to kubeconfig context, contexts
+                not listed are reachable by their own name
+            in_cluster_name: Cluster name of the cluster the app runs in
+            idle_timeout: Seconds after which an unused cluster client is closed
+            clock: Monotonic time source
+            **service_options: Options of every `KubernetesService`
+        """
+        self._config_file = config_file
+        self._cluster_contexts = cluster_contexts or {}
+        self._in_cluster_name = in_cluster_name
+        self._idle_timeout = idle_timeout
+        self._clock = clock
+        self._service_options = service_options
+        self._configurations: dict[str, client.Configuration] = {}
+        self._default_cluster: Optional[str] = None
+        self._services: dict[str, KubernetesService] = {}
+        self._last_used: dict[str, float] = {}
+        self._last_sweep = clock()
+        self.created = 0
+        self.evicted = 0
+
+    @property
+    def clusters(self) -> list[str]:
+        """Names of clusters with a loaded config."""
+        return sorted(self._configurations)
+
+    def start(self) -> None:
+        """Load config of every cluster.
+
+        Unavailable configs are logged instead of failing startup.
+        """
+        if os.environ.get("KUBERNETES_SERVICE_HOST") and self._config_file is None:
+            configuration = client.Configuration()
+            try:
+                config.load_incluster_config(client_configuration=configuration)
+            except config.ConfigException as e:
+                logger.warning("kubernetes_pool.in_cluster_config_unavailable", error=str(e))
+            else:
+                name = self._in_cluster_name or "in-cluster"
+                self._configurations[name] = configuration
+                self._default_cluster = name
+
+        try:
+            contexts, active = config.list_kube_config_contexts(config_file=self._config_file)
+        except config.ConfigException as e:
+            contexts, active = [], None
+            if not self._configurations:
+                logger.warning("kubernetes_pool.kubeconfig_unavailable", error=str(e))
+
+        names = {context: cluster for cluster, context in self._cluster_contexts.items()}
+        for context in contexts or []:
+            name = names.get(context["name"], context["name"])
+            configuration = client.Configuration()
+            try:
+                config.load_kube_config(
+                    config_file=self._config_file,
+                    context=context["name"],
+                    client_configuration=configuration,
+                )
+            except config.ConfigException as e:
+                logger.warning("kubernetes_pool.context_unavailable", context=context["name"], error=str(e))
+                continue
+            self._configurations[name] = configuration
+            if self._default_cluster is None and active and active["name"] == context["name"]:
+                self._default_cluster = name
+
+        logger.info(
+            "kubernetes_pool.started",
+            clusters=self.clusters,
+            default_cluster=self._default_cluster,
+        )
+
+    def get(self, cluster: Optional[str] = None) -> KubernetesService:
+        """Get the service of a cluster, creating its client on first use.
+
+        Args:
+            cluster: Cluster name, None for the default cluster
+
+        Returns:
+            Kubernetes service of the cluster
+
+        Raises:
+            UnknownClusterError: If no config is loaded for the cluster
+        """
+        now = self._clock()
+        if now - self._last_sweep >= self._idle_timeout / 2:
+            self.evict_idle()
+
+        name = cluster or self._default_cluster
+        if name is None or name not in self._configurations:
+            raise UnknownClusterError(f"No Kubernetes config for cluster {cluster or '(default)'}")
+
+        service = self._services.get(name)
+        if service is None:
+            service = self._services[name] = KubernetesService(
+                configuration=self._configurations[name],
+                **self._service_options,
+            )
+            self.created += 1
+            logger.info("kubernetes_pool.client_created", cluster=name)
+        self._last_used[name] = now
+        return service
+
+    def evict_idle(self) -> int:
+        """Close clients of clusters unused for the idle timeout.
+
+        Returns:
+            Number of closed clients
+        """
+        now = self._clock()
+        self._last_sweep = now
+        idle = [
+            name for name, last_used in self._last_used.items()
+            if now - last_used >= self._idle_timeout
+        ]
+        for name in idle:
+            self._services.pop(name).close()
+            del self._last_used[name]
+            logger.info("kubernetes_pool.client_evicted", cluster=name)
+        self.evicted += len(idle)
+        return len(idle)
+
+    def close(self) -> None:
+        """Close all cluster clients."""
+        for service in self._services.values():
+            service.close()
+        self._services.clear()
+        self._last_used.clear()
+
+    def stats(self) -> dict[str, Any]:
+        """Get pool statistics."""
+        return {
+            "clusters": self.clusters,
+            "default_cluster": self._default_cluster,
+            "active_clients": sorted(self._services),
+            "created": self.created,
+            "evicted": self.evicted,
+            "services": {name: service.stats() for name, service in self._services.items()},
+        }
@@ -0,0 +1,97 @@
+import json
+from pathlib import Path
+from typing import Iterator
+
+import pytest
+
+from services.kubernetes.kubernetes_service_test import StubKubernetes
+from services.kubernetes.pool import KubernetesClusterPool, UnknownClusterError
+
+
+class FakeClock:
+    """Manually advanced clock."""
+
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def stubs() -> Iterator[dict[str, StubKubernetes]]:
+    """Kubernetes API stubs of two clusters."""
+    stubs = {"lisbon": StubKubernetes(), "porto": StubKubernetes()}
+    for stub in stubs.values():
+        stub.start()
+    yield stubs
+    for stub in stubs.values():
+        stub.stop()
+
+
+@pytest.fixture
+def kubeconfig(stubs: dict[str, StubKubernetes], tmp_path: Path) -> str:
+    """Kubeconfig with a context per cluster, porto under a provider-style name."""
+    contexts = {"lisbon": "lisbon", "porto": "gke_project_europe_porto"}
+    path = tmp_path / "kubeconfig"
+    path.write_text(json.dumps({
+        "apiVersion": "v1",
+        "kind": "Config",
+        "clusters": [
+            {"name": name, "cluster": {"server": stub.url}} for name, stub in stubs.items()
+        ],
+        "users": [{"name": "stub", "user": {"token": "test-token"}}],
+        "contexts": [
+            {"name": contexts[name], "context": {"cluster": name, "user": "stub"}}
+            for name in stubs
+        ],
+        "current-context": "lisbon",
+    }))
+    return str(path)
+
+
+@pytest.mark.asyncio
+async def test_routes_by_cluster(kubeconfig: str, stubs: dict[str, StubKubernetes]) -> None:
+    """Test that calls reach the cluster named by the label."""
+    pool = KubernetesClusterPool(
+        config_file=kubeconfig,
+        cluster_contexts={"porto": "gke_project_europe_porto"},
+    )
+    pool.start()
+
+    await pool.get("porto").list_pvcs("data")
+    await pool.get().list_pvcs("data")
+
+    assert pool.clusters == ["lisbon", "porto"]
+    assert pool.get("porto") is pool.get("porto")
+    assert len(stubs["porto"].requests) == 1
+    assert len(stubs["lisbon"].requests) == 1
+    with pytest.raises(UnknownClusterError):
+        pool.get("faro")
+    pool.close()
+
+
+def test_idle_clients_evicted(kubeconfig: str) -> None:
+    """Test that clients unused for the idle timeout are closed and recreated on use."""
+    clock = FakeClock()
+    pool = KubernetesClusterPool(config_file=kubeconfig, idle_timeout=60, clock=clock)
+    pool.start()
+
+    lisbon = pool.get("lisbon")
+    clock.now = 40
+    pool.get("gke_project_europe_porto")
+    clock.now = 70
+
+    assert pool.evict_idle() == 1
+    assert pool.stats()["active_clients"] == ["gke_project_europe_porto"]
+    assert pool.get("lisbon") is not lisbon
+    assert pool.stats()["created"] == 3
+
+
+def test_missing_kubeconfig(tmp_path: Path) -> None:
+    """Test that a missing kubeconfig leaves the pool without clusters."""
+    pool = KubernetesClusterPool(config_file=str(tmp_path / "missing"))
+    pool.start()
+
+    with pytest.raises(UnknownClusterError):
+        pool.get()
@@ -0,0 +1,249 @@
+import asyncio
+import math
+from decimal import Decimal
+from typing import Any, Optional
+
+import structlog
+from kubernetes.client.exceptions import ApiException
+from kubernetes.utils import parse_quantity
+
+from core.cache import TTLCache
+from services.kubernetes.pool import KubernetesClusterPool, UnknownClusterError
+
+logger = structlog.get_logger()
+
+# Binary suffixes from the largest, sizes are formatted with the largest exact one
+BINARY_SUFFIXES = (("Ei", 2 ** 60), ("Pi", 2 ** 50), ("Ti", 2 ** 40), ("Gi", 2 ** 30), ("Mi", 2 ** 20), ("Ki", 2 ** 10))
+GI = 2 ** 30
+
+# Resize key: (cluster, namespace, pvc name), batch key: (cluster, namespace)
+ResizeKey = tuple[Optional[str], str, str]
+BatchKey = tuple[Optional[str], str]
+
+
+def format_quantity(value: int) -> str:
+    """Format a number of bytes as a Kubernetes quantity.
+
+    Args:
+        value: Number of bytes
+
+    Returns:
+        Quantity with the largest binary suffix dividing it exactly, e.g. "30Gi"
+    """
+    for suffix, size in BINARY_SUFFIXES:
+        if value >= size and value % size == 0:
+            return f"{value // size}{suffix}"
+    return str(value)
+
+
+def grow_quantity(current: str, increment: str) -> str:
+    """Compute the size of a volume grown by an increment.
+
+    Args:
+        current: Current size, any Kubernetes quantity ("20Gi", "500M", "1.5Ti")
+        increment: Size to add
+
+    Returns:
+        New size rounded up to a whole Gi
+
+    Raises:
+        ValueError: If a quantity cannot be parsed
+    """
+    total: Decimal = parse_quantity(current) + parse_quantity(increment)
+    return format_quantity(math.ceil(total / GI) * GI)
+
+
+class _Batch:
+    """Resize requests of one namespace waiting for the window to close."""
+
+    __slots__ = ("futures", "timer")
+
+    def __init__(self) -> None:
+        self.futures: dict[str, asyncio.Future[dict[str, Any]]] = {}
+        self.timer: Optional[asyncio.TimerHandle] = None
+
+
+class PVCResizer:
+    """Grows PersistentVolumeClaims, batching alerts of one namespace.
+
+    Low disk alerts of a StatefulSet's replicas arrive together, so requests
+    of a namespace are collected over a short window, read with one list
+    request and patched concurrently up to a limit. Requests for a claim
+    being resized share that resize, and a finished resize is reused for a
+    cooldown, so one volume is not grown twice by the same burst of alerts.
+    """
+
+    def __init__(
+        self,
+        clusters: KubernetesClusterPool,
+        increment: str = "10Gi",
+        window: float = 1.0,
+        max_concurrency: int = 4,
+        cooldown: float = 300.0,
+    ) -> None:
+        """Initialize resizer.
+
+        Args:
+            clusters: Kubernetes clients of all clusters
+            increment: Size added to a claim per resize
+            window: Seconds to collect requests of a namespace
+            max_concurrency: Maximum number of concurrent patches
+            cooldown: Seconds a finished resize answers new requests for the claim
+        """
+        parse_quantity(increment)
+        self._clusters = clusters
+        self._increment = increment
+        self._window = window
+        self._max_concurrency = max_concurrency
+        self._batches: dict[BatchKey, _Batch] = {}
+        self._inflight: dict[ResizeKey, asyncio.Future[dict[str, Any]]] = {}
+        self._recent: TTLCache[ResizeKey, dict[str, Any]] = TTLCache(ttl=cooldown)
+        self._flushing: set[asyncio.Task[None]] = set()
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self.batches = 0
+        self.resized = 0
+        self.deduplicated = 0
+
+    @property
+    def clusters(self) -> KubernetesClusterPool:
+        """Kubernetes clients the resizer patches claims with."""
+        return self._clusters
+
+    def _get_semaphore(self) -> asyncio.Semaphore:
+        """Get patch semaphore bound to the running event loop."""
+        loop = asyncio.get_running_loop()
+        if self._semaphore is None or self._loop is not loop:
+            self._semaphore = asyncio.Semaphore(self._max_concurrency)
+            self._loop = loop
+        return self._semaphore
+
+    async def resize(self, cluster: Optional[str], namespace: str, name: str) -> dict[str, Any]:
+        """Grow a claim by the increment.
+
+        Args:
+            cluster: Cluster name, None for the default cluster
+            namespace: Namespace of the claim
+            name: Name of the claim
+
+        Returns:
+            Resize result with "status" "resized" or "error", marked with
+            `deduplicated` when it was shared with another request
+        """
+        key: ResizeKey = (cluster, namespace, name)
+        recent = self._recent.get(key)
+        if recent is not None:
+            self.deduplicated += 1
+            return {**recent, "deduplicated": True}
+
+        future = self._inflight.get(key)
+        if future is not None:
+            self.deduplicated += 1
+            return {**await asyncio.shield(future), "deduplicated": True}
+
+        loop = asyncio.get_running_loop()
+        future = self._inflight[key] = loop.create_future()
+        batch_key: BatchKey = (cluster, namespace)
+        batch = self._batches.get(batch_key)
+        if batch is None:
+            batch = self._batches[batch_key] = _Batch()
+            batch.timer = loop.call_later(self._window, self._flush_batch, batch_key)
+        batch.futures[name] = future
+
+        return await asyncio.shield(future)
+
+    def _flush_batch(self, batch_key: BatchKey) -> None:
+        """Start resizing the claims of a batch."""
+        batch = self._batches.pop(batch_key, None)
+        if batch is None:
+            return
+        if batch.timer is not None:
+            batch.timer.cancel()
+
+        task = asyncio.ensure_future(self._resize_batch(batch_key, batch))
+        self._flushing.add(task)
+        task.add_done_callback(self._flushing.discard)
+
+    async def _resize_batch(self, batch_key: BatchKey, batch: _Batch) -> None:
+        """Read the claims of a namespace once and patch them concurrently."""
+        cluster, namespace = batch_key
+        self.batches += 1
+        try:
+            service = self._clusters.get(cluster)
+            claims = {pvc.metadata.name: pvc for pvc in await service.list_pvcs(namespace)}
+        except (UnknownClusterError, ApiException) as e:
+            error = str(e) if isinstance(e, UnknownClusterError) else f"{e.status} {e.reason}"
+            logger.error("pvc_resizer.list_failed", cluster=cluster, namespace=namespace, error=error)
+            self._fail_batch(batch_key, batch, error)
+            return
+        except Exception as e:
+            logger.exception("pvc_resizer.list_failed", cluster=cluster, namespace=namespace)
+            self._fail_batch(batch_key, batch, str(e) or type(e).__name__)
+            return
+
+        async def resize_one(name: str) -> None:
+            key: ResizeKey = (cluster, namespace, name)
+            try:
+                result = await self._patch(service, namespace, name, claims.get(name))
+            except Exception as e:
+                logger.exception("pvc_resizer.resize_error", cluster=cluster, namespace=namespace, pvc=name)
+                result = {"status": "error", "error": str(e)}
+            self._finish(key, result)
+
+        logger.info("pvc_resizer.batch", cluster=cluster, namespace=namespace, claims=len(batch.futures))
+        await asyncio.gather(*(resize_one(name) for name in batch.futures))
+
+    def _fail_batch(self, batch_key: BatchKey, batch: _Batch, error: str) -> None:
+        """Resolve every claim of a batch with an error."""
+        cluster, namespace = batch_key
+        for name in batch.futures:
+            self._finish((cluster, namespace, name), {"status": "error", "error": error})
+
+    async def _patch(self, service: Any, namespace: str, name: str, pvc: Any) -> dict[str, Any]:
+        """Patch one claim to its grown size."""
+        if pvc is None:
+            return {"status": "error", "error": f"PVC {namespace}/{name} not found"}
+
+        current_size = pvc.spec.resources.requests["storage"]
+        new_size = grow_quantity(current_size, self._increment)
+        patch = {"spec": {"resources": {"requests": {"storage": new_size}}}}
+        try:
+            async with self._get_semaphore():
+                await service.patch_pvc(namespace=namespace, name=name, body=patch)
+        except ApiException as e:
+            return {"status": "error", "error": f"Failed to increase PVC size: {e.status} {e.reason}"}
+
+        self.resized += 1
+        logger.info(
+            "pvc_resizer.resized",
+            namespace=namespace,
+            pvc=name,
+            old_size=current_size,
+            new_size=new_size,
+        )
+        return {"status": "resized", "old_size": current_size, "new_size": new_size}
+
+    def _finish(self, key: ResizeKey, result: dict[str, Any]) -> None:
+        """Resolve waiters of a claim and remember a successful resize."""
+        future = self._inflight.pop(key, None)
+        if result["status"] == "resized":
+            self._recent.set(key, result)
+        if future is not None and not future.done():
+            future.set_result(result)
+
+    async def flush(self) -> None:
+        """Resize all collected claims now and wait for running resizes."""
+        for batch_key in list(self._batches):
+            self._flush_batch(batch_key)
+        if self._flushing:
+            await asyncio.gather(*list(self._flushing), return_exceptions=True)
+
+    def stats(self) -> dict[str, int]:
+        """Get resizer statistics."""
+        return {
+            "pending_batches": len(self._batches),
+            "in_flight": len(self._inflight),
+            "batches": self.batches,
+            "resized": self.resized,
+            "deduplicated": self.deduplicated,
+        }
@@ -0,0 +1,161 @@
+import asyncio
+from pathlib import Path
+from typing import Iterator
+
+import pytest
+
+from services.kubernetes.kubernetes_service_test import StubKubernetes, write_kubeconfig
+from services.kubernetes.pool import KubernetesClusterPool
+from services.kubernetes.resizer import PVCResizer, format_quantity, grow_quantity
+
+
+@pytest.mark.parametrize(
+    ("current", "expected"),
+    [
+        ("20Gi", "30Gi"),
+        ("1Ti", "1034Gi"),
+        ("1.5Ti", "1546Gi"),
+        ("512Mi", "11Gi"),
+        ("100G", "104Gi"),
+    ],
+)
+def test_grow_quantity(current: str, expected: str) -> None:
+    """Test that sizes in any unit grow by 10Gi, rounded up to a whole Gi."""
+    assert grow_quantity(current, "10Gi") == expected
+
+
+def test_format_quantity() -> None:
+    """Test that the largest exact binary unit is used."""
+    assert format_quantity(2 ** 40) == "1Ti"
+    assert format_quantity(3 * 2 ** 30) == "3Gi"
+    assert format_quantity(1000) == "1000"
+
+
+def test_invalid_quantity() -> None:
+    """Test that unparsable sizes are rejected."""
+    with pytest.raises(ValueError):
+        grow_quantity("lots", "10Gi")
+
+
+@pytest.fixture
+def stub_kubernetes() -> Iterator[StubKubernetes]:
+    """Kubernetes API stub with the claims of a three replica StatefulSet."""
+    stub = StubKubernetes()
+    stub.sizes = {("data", f"pvc-{i}"): "20Gi" for i in range(3)}
+    stub.start()
+    yield stub
+    stub.stop()
+
+
+@pytest.fixture
+def clusters(stub_kubernetes: StubKubernetes, tmp_path: Path) -> Iterator[KubernetesClusterPool]:
+    """Cluster pool with the stub as its default cluster."""
+    pool = KubernetesClusterPool(
+        config_file=write_kubeconfig(tmp_path / "kubeconfig", stub_kubernetes.url)
+    )
+    pool.start()
+    yield pool
+    pool.close()
+
+
+@pytest.mark.asyncio
+async def test_batches_namespace(
+    clusters: KubernetesClusterPool, stub_kubernetes: StubKubernetes
+) -> None:
+    """Test that claims of a namespace are read with one list request."""
+    resizer = PVCResizer(clusters, window=0.05)
+
+    results = await asyncio.gather(*(resizer.resize(None, "data", f"pvc-{i}") for i in range(3)))
+
+    assert [result["new_size"] for result in results] == ["30Gi"] * 3
+    assert stub_kubernetes.sizes == {("data", f"pvc-{i}"): "30Gi" for i in range(3)}
+    methods = [method for method, _ in stub_kubernetes.requests]
+    assert methods == ["GET", "PATCH", "PATCH", "PATCH"]
+    assert resizer.stats()["batches"] == 1
+
+
+@pytest.mark.asyncio
+async def test_dedupes_same_pvc(
+    clusters: KubernetesClusterPool, stub_kubernetes: StubKubernetes
+) -> None:
+    """Test that repeated alerts for one claim grow it once."""
+    resizer = PVCResizer(clusters, window=0.05)
+
+    first, second = await asyncio.gather(
+        resizer.resize(None, "data", "pvc-0"),
+        resizer.resize(None, "data", "pvc-0"),
+    )
+    third = await resizer.resize(None, "data", "pvc-0")
+
+    assert first["new_size"] == second["new_size"] == third["new_size"] == "30Gi"
+    assert second["deduplicated"] and third["deduplicated"]
+    assert stub_kubernetes.sizes[("data", "pvc-0")] == "30Gi"
+    assert resizer.stats()["resized"] == 1
+
+
+@pytest.mark.asyncio
+async def test_missing_pvc(clusters: KubernetesClusterPool) -> None:
+    """Test that a claim absent from the namespace is reported and not cached."""
+    resizer = PVCResizer(clusters, window=0.01)
+
+    result = await resizer.resize(None, "data", "missing")
+
+    assert result["status"] == "error"
+    assert "data/missing" in result["error"]
+    assert resizer.stats()["in_flight"] == 0
+
+
+@pytest.mark.asyncio
+async def test_unknown_cluster(clusters: KubernetesClusterPool) -> None:
+    """Test that claims of a cluster without config fail."""
+    resizer = PVCResizer(clusters, window=0.01)
+
+    result = await resizer.resize("porto", "data", "pvc-0")
+
+    assert result["status"] == "error"
+    assert "porto" in result["error"]
+
+
+@pytest.mark.asyncio
+async def test_flush(clusters: KubernetesClusterPool, stub_kubernetes: StubKubernetes) -> None:
+    """Test that flush resizes collected claims without waiting for the window."""
+    resizer = PVCResizer(clusters, window=60)
+
+    task = asyncio.ensure_future(resizer.resize(None, "data", "pvc-1"))
+    await asyncio.sleep(0)
+    await resizer.flush()
+
+    assert (await task)["status"] == "resized"
+    assert stub_kubernetes.sizes[("data", "pvc-1")] == "30Gi"
+
+
+class _UnreachableCluster:
+    """Kubernetes service whose API server cannot be reached."""
+
+    async def list_pvcs(self, namespace: str) -> list:
+        raise ConnectionError("connection refused")
+
+
+class _UnreachablePool:
+    """Cluster pool returning an unreachable service for every cluster."""
+
+    def get(self, cluster: object) -> _UnreachableCluster:
+        return _UnreachableCluster()
+
+
+@pytest.mark.asyncio
+async def test_list_connection_error() -> None:
+    """Test that claims fail instead of hanging when listing raises a non-API error."""
+    resizer = PVCResizer(_UnreachablePool(), window=0.01)  # type: ignore[arg-type]
+
+    results = await asyncio.wait_for(
+        asyncio.gather(
+            resizer.resize(None, "data", "pvc-0"),
+            resizer.resize(None, "data", "pvc-1"),
+        ),
+        timeout=1,
+    )
+
+    assert [result["status"] for result in results] == ["error", "error"]
+    assert "connection refused" in results[0]["error"]
+    assert resizer.stats()["in_flight"] == 0
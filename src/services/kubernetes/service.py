@@ -0,0 +1,153 @@
+import os
+from typing import Any, Optional
+
+import structlog
+from kubernetes import client, config
+from kubernetes.client import ApiClient, CoreV1Api, V1PersistentVolumeClaim
+
+from core.executor import executor
+from core.metrics import track_call
+
+logger = structlog.get_logger()
+
+
+class KubernetesService:
+    """Service for Kubernetes cluster operations.
+
+    Cluster config is loaded once (in-cluster when running in a pod, from the
+    kubeconfig otherwise) into one `ApiClient`, whose urllib3 pool keeps TLS
+    connections to the API server warm. Blocking client calls run on the
+    shared executor. Call `start` and `close` from the application lifespan.
+    """
+
+    def __init__(
+        self,
+        config_file: Optional[str] = None,
+        context: Optional[str] = None,
+        configuration: Optional[client.Configuration] = None,
+        pool_maxsize: int = 8,
+        connect_timeout: float = 5.0,
+        read_timeout: float = 15.0,
+    ) -> None:
+        """Initialize Kubernetes service.
+
+        Args:
+            config_file: Kubeconfig path, None for the default location
+            context: Kubeconfig context, None for the current one
+            configuration: Already loaded cluster config, used instead of loading one
+            pool_maxsize: Maximum number of connections kept to the API server
+            connect_timeout: Connection timeout in seconds
+            read_timeout: Read timeout in seconds
+        """
+        self._config_file = config_file
+        self._context = context
+        self._configuration = configuration
+        self._pool_maxsize = pool_maxsize
+        self._request_timeout = (connect_timeout, read_timeout)
+        self._api_client: Optional[ApiClient] = None
+        self._core_api: Optional[CoreV1Api] = None
+
+    def start(self) -> None:
+        """Load cluster config and create the API client.
+
+        A missing config is logged instead of failing startup, the service
+        then retries on first use.
+        """
+        try:
+            self._ensure_initialized()
+        except config.ConfigException as e:
+            logger.warning("kubernetes_service.config_unavailable", error=str(e))
+
+    def _load_configuration(self) -> client.Configuration:
+        """Load in-cluster config in a pod, kubeconfig otherwise."""
+        configuration = client.Configuration()
+        if os.environ.get("KUBERNETES_SERVICE_HOST") and self._config_file is None:
+            config.load_incluster_config(client_configuration=configuration)
+        else:
+            config.load_kube_config(
+                config_file=self._config_file,
+                context=self._context,
+                client_configuration=configuration,
+            )
+        return configuration
+
+    def _ensure_initialized(self) -> CoreV1Api:
+        """Ensure API client is initialized.
+
+        Raises:
+            ConfigException: If no cluster config can be loaded
+        """
+        if self._core_api is None:
+            configuration = self._configuration or self._load_configuration()
+            configuration.connection_pool_maxsize = self._pool_maxsize
+            self._api_client = ApiClient(configuration)
+            self._core_api = CoreV1Api(self._api_client)
+            logger.info(
+                "kubernetes_service.initialized",
+                host=configuration.host,
+                context=self._context,
+            )
+        return self._core_api
+
+    def close(self) -> None:
+        """Close API client connections."""
+        if self._api_client is not None:
+            self._api_client.close()
+        self._api_client = None
+        self._core_api = None
+
+    @track_call("kubernetes", "list_pvcs")
+    async def list_pvcs(self, namespace: str) -> list[V1PersistentVolumeClaim]:
+        """List PersistentVolumeClaims of a namespace with one request.
+
+        Args:
+            namespace: Namespace of the claims
+
+        Returns:
+            The claims
+
+        Raises:
+            ApiException: If the API request fails
+        """
+        core_api = self._ensure_initialized()
+        claims = await executor.run(
+            "kubernetes",
+            core_api.list_namespaced_persistent_volume_claim,
+            namespace=namespace,
+            _request_timeout=self._request_timeout,
+        )
+        return claims.items
+
+    @track_call("kubernetes", "patch_pvc")
+    async def patch_pvc(
+        self,
+        namespace: str,
+        name: str,
+        body: dict[str, Any],
+    ) -> V1PersistentVolumeClaim:
+        """Patch a PersistentVolumeClaim.
+
+        Args:
+            namespace: Namespace of the claim
+            name: Name of the claim
+            body: Strategic merge patch
+
+        Returns:
+            The patched claim
+
+        Raises:
+            ApiException: If the API request fails
+        """
+        core_api = self._ensure_initialized()
+        return await executor.run(
+            "kubernetes",
+            core_api.patch_namespaced_persistent_volume_claim,
+            name=name,
+            namespace=namespace,
+            body=body,
+            _request_timeout=self._request_timeout,
+        )
+
+    def stats(self) -> dict[str, Any]:
+        """Get client statistics."""
+        return {"initialized": self._core_api is not None}
@@ -0,0 +1,191 @@
+import asyncio
+import random
+from typing import Any, Optional
+
+import structlog
+
+from core.cache import TTLCache
+from core.tracing import tracer
+from services.opsgenie.service import OpsgenieService
+
+logger = structlog.get_logger()
+
+
+def is_retryable(result: dict[str, Any]) -> bool:
+    """Check whether a failed note write should be retried.
+
+    Args:
+        result: Result returned by `OpsgenieService.add_note`
+
+    Returns:
+        True for rate limiting (429) and server errors (5xx)
+    """
+    if result.get("status") != "error":
+        return False
+    status_code = result.get("status_code")
+    if status_code is None:
+        return False
+    status_code = int(status_code)
+    return status_code == 429 or status_code >= 500
+
+
+class _PendingNotes:
+    """Notes buffered for one alert."""
+
+    __slots__ = ("notes", "future", "timer")
+
+    def __init__(self, future: asyncio.Future[dict[str, Any]]) -> None:
+        self.notes: list[str] = []
+        self.future = future
+        self.timer: Optional[asyncio.TimerHandle] = None
+
+
+class NoteWriter:
+    """Buffers notes per alert and writes them to Opsgenie in batches.
+
+    The first note of an alert is written at once; notes following a write
+    to the alert within the window are held until the window ends and merged
+    into one note. Writes run concurrently up to a connection limit and are
+    retried with jittered exponential backoff on 429 and 5xx responses.
+    """
+
+    def __init__(
+        self,
+        service: OpsgenieService,
+        user: str,
+        window: float = 0.5,
+        max_concurrency: int = 4,
+        max_retries: int = 3,
+        backoff_base: float = 0.5,
+        backoff_max: float = 10.0,
+    ) -> None:
+        """Initialize note writer.
+
+        Args:
+            service: Opsgenie service used for writes
+            user: User the notes are added as
+            window: Seconds after a write to an alert its next notes are merged
+            max_concurrency: Maximum number of concurrent writes
+            max_retries: Maximum number of retries of a write
+            backoff_base: Base delay of exponential backoff in seconds
+            backoff_max: Maximum backoff delay in seconds
+        """
+        self._service = service
+        self._user = user
+        self._window = window
+        self._max_concurrency = max_concurrency
+        self._max_retries = max_retries
+        self._backoff_base = backoff_base
+        self._backoff_max = backoff_max
+        self._pending: dict[str, _PendingNotes] = {}
+        # Loop time of the last write per alert, notes within the window wait for it to end
+        self._last_write: TTLCache[str, float] = TTLCache(ttl=window)
+        self._sending: set[asyncio.Task[None]] = set()
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self.written = 0
+        self.merged = 0
+        self.retries = 0
+
+    def _get_semaphore(self) -> asyncio.Semaphore:
+        """Get write semaphore bound to the running event loop."""
+        loop = asyncio.get_running_loop()
+        if self._semaphore is None or self._loop is not loop:
+            self._semaphore = asyncio.Semaphore(self._max_concurrency)
+            self._loop = loop
+        return self._semaphore
+
+    @tracer.traced("note_writer.add_note")
+    async def add_note(self, alert_id: str, note: str) -> dict[str, Any]:
+        """Add a note to an alert, merging it with other notes in the window.
+
+        Args:
+            alert_id: ID of the alert
+            note: Note text to add
+
+        Returns:
+            Result of the write that carried the note
+        """
+        loop = asyncio.get_running_loop()
+        pending = self._pending.get(alert_id)
+        if pending is None:
+            pending = self._pending[alert_id] = _PendingNotes(loop.create_future())
+            last_write = self._last_write.get(alert_id)
+            delay = 0.0 if last_write is None else max(0.0, last_write + self._window - loop.time())
+            # Notes added in the same loop iteration still share the write
+            pending.timer = loop.call_later(delay, self._flush_alert, alert_id)
+        else:
+            self.merged += 1
+        pending.notes.append(note)
+
+        return await asyncio.shield(pending.future)
+
+    def _flush_alert(self, alert_id: str) -> None:
+        """Start writing buffered notes of an alert."""
+        pending = self._pending.pop(alert_id, None)
+        if pending is None:
+            return
+        if pending.timer is not None:
+            pending.timer.cancel()
+        self._last_write.set(alert_id, asyncio.get_event_loop().time())
+
+        task = asyncio.ensure_future(self._write(alert_id, pending))
+        self._sending.add(task)
+        task.add_done_callback(self._sending.discard)
+
+    async def _write(self, alert_id: str, pending: _PendingNotes) -> None:
+        """Write merged notes and resolve waiting callers."""
+        try:
+            result = await self._write_with_retries(alert_id, "\n\n".join(pending.notes))
+        except Exception as e:
+            logger.exception("note_writer.write_error", alert_id=alert_id, error=str(e))
+            result = {"status": "error", "error": str(e)}
+
+        if result.get("status") == "success":
+            self.written += 1
+        if not pending.future.done():
+            pending.future.set_result({**result, "merged_notes": len(pending.notes)})
+
+    @tracer.traced("note_writer.write")
+    async def _write_with_retries(self, alert_id: str, note: str) -> dict[str, Any]:
+        """Write a note, retrying rate limited and failed requests."""
+        attempt = 0
+        while True:
+            async with self._get_semaphore():
+                result = await self._service.add_note(
+                    alert_id=alert_id,
+                    note=note,
+                    user=self._user,
+                )
+            if not is_retryable(result) or attempt >= self._max_retries:
+                return result
+
+            # Full jitter keeps retries of a storm from synchronizing
+            delay = random.uniform(0, min(self._backoff_max, self._backoff_base * 2 ** attempt))
+            attempt += 1
+            self.retries += 1
+            logger.warning(
+                "note_writer.retrying",
+                alert_id=alert_id,
+                attempt=attempt,
+                delay=round(delay, 3),
+                status_code=result.get("status_code"),
+            )
+            await asyncio.sleep(delay)
+
+    async def flush(self) -> None:
+        """Write all buffered notes now and wait for in-flight writes."""
+        for alert_id in list(self._pending):
+            self._flush_alert(alert_id)
+        if self._sending:
+            await asyncio.gather(*list(self._sending), return_exceptions=True)
+
+    def stats(self) -> dict[str, int]:
+        """Get note writer statistics."""
+        return {
+            "pending_alerts": len(self._pending),
+            "in_flight": len(self._sending),
+            "written": self.written,
+            "merged": self.merged,
+            "retries": self.retries,
+        }
@@ -0,0 +1,138 @@
+import asyncio
+from typing import Any
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from services.opsgenie.note_writer import NoteWriter, is_retryable
+from services.opsgenie.service import OpsgenieService
+
+
+SUCCESS = {"status": "success", "request_id": "req-1"}
+
+
+@pytest.fixture
+def service() -> MagicMock:
+    """Opsgenie service with mocked note writes."""
+    service = MagicMock(spec=OpsgenieService)
+    service.add_note = AsyncMock(return_value=SUCCESS)
+    return service
+
+
+@pytest.mark.parametrize(
+    "result,expected",
+    [
+        (SUCCESS, False),
+        ({"status": "error", "error": "boom", "status_code": None}, False),
+        ({"status": "error", "error": "bad request", "status_code": 400}, False),
+        ({"status": "error", "error": "rate limited", "status_code": 429}, True),
+        ({"status": "error", "error": "unavailable", "status_code": 503}, True),
+    ],
+)
+def test_is_retryable(result: dict[str, Any], expected: bool) -> None:
+    """Test which failures are retried."""
+    assert is_retryable(result) == expected
+
+
+@pytest.mark.asyncio
+async def test_notes_merged_per_alert(service: MagicMock) -> None:
+    """Test that notes within the window are written as one note."""
+    writer = NoteWriter(service, user="bot", window=0.01)
+
+    results = await asyncio.gather(
+        writer.add_note("alert-1", "first"),
+        writer.add_note("alert-1", "second"),
+        writer.add_note("alert-2", "other"),
+    )
+
+    assert service.add_note.await_count == 2
+    service.add_note.assert_any_await(alert_id="alert-1", note="first\n\nsecond", user="bot")
+    service.add_note.assert_any_await(alert_id="alert-2", note="other", user="bot")
+    assert results[0] == {**SUCCESS, "merged_notes": 2}
+    assert results[2] == {**SUCCESS, "merged_notes": 1}
+    assert writer.stats()["merged"] == 1
+
+
+@pytest.mark.asyncio
+async def test_first_note_written_at_once(service: MagicMock) -> None:
+    """Test that only notes following a write to the alert wait for the window."""
+    writer = NoteWriter(service, user="bot", window=0.2)
+    loop = asyncio.get_running_loop()
+
+    start = loop.time()
+    first = await writer.add_note("alert-1", "first")
+    first_elapsed = loop.time() - start
+    second, third = await asyncio.gather(
+        writer.add_note("alert-1", "second"),
+        writer.add_note("alert-1", "third"),
+    )
+
+    assert first_elapsed < 0.1
+    assert loop.time() - start >= 0.19
+    assert first == {**SUCCESS, "merged_notes": 1}
+    assert second == third == {**SUCCESS, "merged_notes": 2}
+    service.add_note.assert_any_await(alert_id="alert-1", note="second\n\nthird", user="bot")
+
+
+@pytest.mark.asyncio
+async def test_retry_on_rate_limit(service: MagicMock) -> None:
+    """Test that rate limited writes are retried."""
+    service.add_note.side_effect = [
+        {"status": "error", "error": "rate limited", "status_code": 429},
+        {"status": "error", "error": "unavailable", "status_code": 502},
+        SUCCESS,
+    ]
+    writer = NoteWriter(service, user="bot", window=0, backoff_base=0.001)
+
+    result = await writer.add_note("alert-1", "note")
+
+    assert result["status"] == "success"
+    assert service.add_note.await_count == 3
+    assert writer.stats()["retries"] == 2
+
+
+@pytest.mark.asyncio
+async def test_retries_exhausted(service: MagicMock) -> None:
+    """Test that the last error is returned after all retries."""
+    service.add_note.return_value = {"status": "error", "error": "unavailable", "status_code": 503}
+    writer = NoteWriter(service, user="bot", window=0, max_retries=2, backoff_base=0.001)
+
+    result = await writer.add_note("alert-1", "note")
+
+    assert result["status"] == "error"
+    assert service.add_note.await_count == 3
+
+
+@pytest.mark.asyncio
+async def test_flush_writes_pending_notes(service: MagicMock) -> None:
+    """Test that flush writes buffered notes without waiting for the window."""
+    writer = NoteWriter(service, user="bot", window=60)
+
+    task = asyncio.create_task(writer.add_note("alert-1", "note"))
+    await asyncio.sleep(0)
+    await writer.flush()
+
+    assert (await task)["status"] == "success"
+    assert writer.stats()["pending_alerts"] == 0
+
+
+@pytest.mark.asyncio
+async def test_concurrency_limit(service: MagicMock) -> None:
+    """Test that writes do not exceed the connection limit."""
+    active = 0
+    peak = 0
+
+    async def add_note(**kwargs: Any) -> dict[str, Any]:
+        nonlocal active, peak
+        active += 1
+        peak = max(peak, active)
+        await asyncio.sleep(0.01)
+        active -= 1
+        return SUCCESS
+
+    service.add_note.side_effect = add_note
+    writer = NoteWriter(service, user="bot", window=0, max_concurrency=2)
+
+    await asyncio.gather(*(writer.add_note(f"alert-{i}", "note") for i in range(6)))
+
+    assert peak == 2
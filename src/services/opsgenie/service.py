@@ -1,36 +1,153 @@
-from typing import Any, Optional
+import socket
+import threading
+from typing import TYPE_CHECKING, Any, Optional
 import structlog
-from opsgenie_sdk import (
-    AlertApi,
-    Configuration,
-    ApiClient,
-    AddNoteToAlertPayload,
-)
+import tenacity
+import urllib3
+from urllib3.connection import HTTPConnection
+
+from core.executor import executor
+from core.metrics import track_call
+from core.tracing import tracer
+
+if TYPE_CHECKING:
+    from opsgenie_sdk import AlertApi, ApiClient
 
 logger = structlog.get_logger()
 
 
+def _unwrap_error(error: Exception) -> BaseException:
+    """Get the original exception of an SDK call wrapped by its retry layer."""
+    if isinstance(error, tenacity.RetryError):
+        return error.last_attempt.exception() or error
+    return error
+
+
 class OpsgenieService:
-    """Service for interacting with Opsgenie API."""
+    """Service for interacting with Opsgenie API.
+    
+    One `ApiClient` with a tuned urllib3 connection pool is shared by all
+    requests. The SDK is imported when the client is created, by `start`
+    from a thread at startup or by the first note; `close` it from the
+    application lifespan.
+    """
     
-    def __init__(self, api_key: str) -> None:
+    def __init__(
+        self,
+        api_key: str,
+        host: str = "https://api.opsgenie.com",
+        pool_maxsize: int = 8,
+        pool_block: bool = True,
+        connect_timeout: float = 5.0,
+        read_timeout: float = 15.0,
+        tcp_keepalive: bool = True,
+        sdk_retries: int = 0,
+    ) -> None:
         """Initialize Opsgenie service.
         
         Args:
             api_key: Opsgenie API key
+            host: Opsgenie API URL
+            pool_maxsize: Maximum number of connections kept to the API host
+            pool_block: Wait for a free connection instead of opening extra ones
+            connect_timeout: Connection timeout in seconds
+            read_timeout: Read timeout in seconds
+            tcp_keepalive: Enable TCP keep-alive on pooled connections
+            sdk_retries: Number of SDK retries, 0 leaves retries to the caller
         """
         self._api_key = api_key
-        self._alert_api: Optional[AlertApi] = None
+        self._host = host
+        self._pool_maxsize = pool_maxsize
+        self._pool_block = pool_block
+        self._request_timeout = (connect_timeout, read_timeout)
+        self._tcp_keepalive = tcp_keepalive
+        self._sdk_retries = sdk_retries
+        self._api_client: Optional["ApiClient"] = None
+        self._alert_api: Optional["AlertApi"] = None
+        self._init_lock = threading.Lock()
         logger.info("opsgenie_service.initialized")
     
+    def start(self) -> None:
+        """Create API client and its connection pool, blocking on the SDK import."""
+        self._ensure_initialized()
+    
     def _ensure_initialized(self) -> None:
         """Ensure Opsgenie client is initialized."""
-        if self._alert_api is None:
+        if self._alert_api is not None:
+            return
+        # `start` may run in a thread while the first note initializes too
+        with self._init_lock:
+            if self._alert_api is not None:
+                return
+            from opsgenie_sdk import AlertApi, ApiClient, Configuration
+            
             configuration = Configuration()
+            configuration.host = self._host
             configuration.api_key['Authorization'] = self._api_key
+            configuration.connection_pool_maxsize = self._pool_maxsize
+            # Retries are done by NoteWriter without holding a pool thread
+            configuration.retry_enabled = self._sdk_retries > 0
+            configuration.retry_count = self._sdk_retries
             api_client = ApiClient(configuration=configuration)
+            
+            # The SDK does not expose pool blocking or socket options,
+            # so the pool manager is replaced with a tuned one
+            socket_options = list(HTTPConnection.default_socket_options)
+            if self._tcp_keepalive:
+                socket_options.append((socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1))
+            api_client.rest_client.pool_manager.clear()
+            api_client.rest_client.pool_manager = urllib3.PoolManager(
+                num_pools=4,
+                maxsize=self._pool_maxsize,
+                block=self._pool_block,
+                socket_options=socket_options,
+                retries=False,
+            )
+            
+            self._api_client = api_client
             self._alert_api = AlertApi(api_client=api_client)
+            logger.info(
+                "opsgenie_service.client_created",
+                host=self._host,
+                pool_maxsize=self._pool_maxsize,
+            )
+    
+    def close(self) -> None:
+        """Close pooled connections."""
+        if self._api_client is not None:
+            self._api_client.rest_client.pool_manager.clear()
+            self._api_client = None
+            self._alert_api = None
+            logger.info("opsgenie_service.closed")
+    
+    def pool_stats(self) -> dict[str, Any]:
+        """Get connection pool usage.
+        
+        Returns:
+            Pool size and per-host connection usage
+        """
+        hosts: dict[str, dict[str, int]] = {}
+        if self._api_client is not None:
+            pool_manager = self._api_client.rest_client.pool_manager
+            for key in list(pool_manager.pools.keys()):
+                pool = pool_manager.pools.get(key)
+                if pool is None or pool.pool is None:
+                    continue
+                available = pool.pool.qsize()
+                hosts[f"{pool.scheme}://{pool.host}:{pool.port}"] = {
+                    "in_use": self._pool_maxsize - available,
+                    "available": available,
+                    "opened_connections": pool.num_connections,
+                    "requests": pool.num_requests,
+                }
+        return {
+            "initialized": self._api_client is not None,
+            "maxsize": self._pool_maxsize,
+            "hosts": hosts,
+        }
     
+    @tracer.traced("opsgenie.add_note")
+    @track_call("opsgenie", "add_note")
     async def add_note(self, alert_id: str, note: str, user: str) -> dict[str, Any]:
         """Add a note to an alert.
         
@@ -47,16 +164,20 @@ class OpsgenieService:
         """
         try:
             self._ensure_initialized()
+            from opsgenie_sdk import AddNoteToAlertPayload
             
             payload = AddNoteToAlertPayload(
                 user=user,
                 note=note,
             )
             
-            response = self._alert_api.add_note_to_alert(
+            response = await executor.run(
+                "opsgenie",
+                self._alert_api.add_note,
                 identifier=alert_id,
                 identifier_type="id",
                 add_note_to_alert_payload=payload,
+                _request_timeout=self._request_timeout,
             )
             
             logger.info(
@@ -71,12 +192,14 @@ class OpsgenieService:
             }
             
         except Exception as e:
+            error = _unwrap_error(e)
             logger.exception(
                 "opsgenie_service.add_note_error",
                 alert_id=alert_id,
-                error=str(e),
+                error=str(error),
             )
             return {
                 "status": "error",
-                "error": str(e),
+                "error": str(error),
+                "status_code": getattr(error, "status", None),
             } 
\ No newline at end of file
@@ -0,0 +1,104 @@
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Iterator
+
+import pytest
+
+from services.opsgenie.service import OpsgenieService
+
+
+class StubOpsgenie:
+    """Local Opsgenie API stub accepting notes."""
+
+    def __init__(self) -> None:
+        self.status = 202
+        self.notes: list[dict[str, Any]] = []
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_POST(self) -> None:
+                length = int(self.headers.get("Content-Length", 0))
+                stub.notes.append(json.loads(self.rfile.read(length)))
+                payload = json.dumps(
+                    {"result": "Request will be processed", "took": 0.01, "requestId": "req-1"}
+                ).encode()
+                self.send_response(stub.status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def log_message(self, format: str, *args: Any) -> None:
+                pass
+
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self._server.server_address[1]}"
+        self._thread = threading.Thread(
+            target=self._server.serve_forever, kwargs={"poll_interval": 0.05}, daemon=True
+        )
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+
+@pytest.fixture
+def stub_opsgenie() -> Iterator[StubOpsgenie]:
+    """Running Opsgenie API stub."""
+    stub = StubOpsgenie()
+    stub.start()
+    yield stub
+    stub.stop()
+
+
+@pytest.fixture
+def service(stub_opsgenie: StubOpsgenie) -> Iterator[OpsgenieService]:
+    """Started Opsgenie service pointing at the stub."""
+    service = OpsgenieService(api_key="test-key", host=stub_opsgenie.url, pool_maxsize=2)
+    service.start()
+    yield service
+    service.close()
+
+
+@pytest.mark.asyncio
+async def test_add_note_reuses_connection(
+    service: OpsgenieService, stub_opsgenie: StubOpsgenie
+) -> None:
+    """Test that sequential notes are sent over one pooled connection."""
+    for i in range(3):
+        result = await service.add_note(alert_id="alert-1", note=f"note {i}", user="bot")
+        assert result == {"status": "success", "request_id": "req-1"}
+
+    assert [n["note"] for n in stub_opsgenie.notes] == ["note 0", "note 1", "note 2"]
+    stats = service.pool_stats()
+    assert stats["initialized"] is True
+    host = stats["hosts"][stub_opsgenie.url]
+    assert host["opened_connections"] == 1
+    assert host["requests"] == 3
+    assert host["in_use"] == 0
+
+
+@pytest.mark.asyncio
+async def test_add_note_error_status(
+    service: OpsgenieService, stub_opsgenie: StubOpsgenie
+) -> None:
+    """Test that HTTP errors are reported with status code."""
+    stub_opsgenie.status = 429
+
+    result = await service.add_note(alert_id="alert-1", note="note", user="bot")
+
+    assert result["status"] == "error"
+    assert result["status_code"] == 429
+
+
+def test_close_releases_client(service: OpsgenieService) -> None:
+    """Test that close drops the client."""
+    service.close()
+
+    assert service.pool_stats() == {"initialized": False, "maxsize": 2, "hosts": {}}
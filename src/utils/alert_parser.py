@@ -1,32 +1,39 @@
 import re
-from typing import Optional
+from dataclasses import dataclass, field
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Mapping, Optional
 from urllib.parse import urlparse
 
 import structlog
 
+from services.github.repo_map import repo_map
+
 logger = structlog.get_logger()
 
 
-service_name_to_repo_map = {
-    'report-laoder-db': 'rtbmedia'
-}
+# Patterns are compiled once at import instead of being looked up per call
+URL_PATTERN = re.compile(r'URL (https?://[^\s,]+)')
+# Matches /-/health/service-name/, /health/service-name/ and /_health/service-name/
+HEALTH_PATH_PATTERN = re.compile(r'/(?:-/|_)?health/([^/]+)/?$')
+
+# Header of the labels section and the first line after it not starting with "- "
+LABELS_HEADER_PATTERN = re.compile(r'^[ \t]*Labels:[ \t\r]*(?:\n|$)', re.MULTILINE)
+LABELS_END_PATTERN = re.compile(r'\n(?!- )')
+# Splits label lines on " = ", lines without it are skipped
+LABEL_PATTERN = re.compile(r'^- ([^\s=]+) = (.*)$', re.MULTILINE)
 
+
+@dataclass(frozen=True, slots=True)
 class AlertInfo:
     """Structured information extracted from alert."""
-    
-    def __init__(
-        self,
-        service_name: str,
-        environment: str,
-        domain: str,
-        health_endpoint: str,
-        cluster: str,
-    ) -> None:
-        self.service_name = service_name
-        self.environment = environment
-        self.domain = domain
-        self.health_endpoint = health_endpoint
-        self.cluster = cluster
+
+    service_name: str
+    environment: str
+    domain: str
+    health_endpoint: str
+    cluster: str
+    labels: Mapping[str, str] = field(default_factory=dict, hash=False)
 
     def __str__(self) -> str:
         return (
@@ -40,68 +47,118 @@ class AlertInfo:
 
 def extract_service_from_url(url: str) -> Optional[str]:
     """Extract service name from health check URL.
-    
+
     Args:
         url: Health check URL
-        
+
     Returns:
         Service name if found, None otherwise
     """
     # Remove trailing slash if exists
     url = url.rstrip('/')
-    
+
     # Extract path from URL
     path = urlparse(url).path
-    
-    # Look for health check patterns
-    patterns = [
-        r'/-/health/([^/]+)/?$',  # Matches /-/health/service-name/
-        r'/health/([^/]+)/?$',    # Matches /health/service-name/
-        r'/_health/([^/]+)/?$',   # Matches /_health/service-name/
-    ]
-    
-    for pattern in patterns:
-        if match := re.search(pattern, path):
-            return match.group(1)
-    
+
+    if match := HEALTH_PATH_PATTERN.search(path):
+        return match.group(1)
+
     return None
 
 
-def parse_alert_info(description: str, labels: dict[str, str]) -> AlertInfo:
-    """Parse alert information from description and labels.
-    
+@lru_cache(maxsize=256)
+def scan_description(description: str) -> tuple[Optional[str], Mapping[str, str]]:
+    """Extract the health check URL and labels from description.
+
+    Sections are located with precompiled patterns instead of a per-line
+    loop. Results are cached by description, so routing and the handler
+    share one parse of the same event.
+
     Args:
         description: Alert description
-        labels: Alert labels
-        
+
     Returns:
-        AlertInfo object with extracted information
-        
-    Raises:
-        ValueError: If required information cannot be extracted
+        First health check URL (None if missing) and read-only labels of
+        the first `Labels:` section
     """
-    # Extract URL from description
-    url_match = re.search(r'URL (https?://[^\s,]+)', description)
-    if not url_match:
+    url_match = URL_PATTERN.search(description)
+    url = url_match.group(1) if url_match else None
+
+    labels: dict[str, str] = {}
+    if header := LABELS_HEADER_PATTERN.search(description):
+        start = header.end()
+        end_match = LABELS_END_PATTERN.search(description, start)
+        end = end_match.start() if end_match else len(description)
+        for key, value in LABEL_PATTERN.findall(description, start, end):
+            labels[key] = value.strip()
+
+    return url, MappingProxyType(labels)
+
+
+def extract_labels(description: Optional[str]) -> Mapping[str, str]:
+    """Extract labels from the `Labels:` section of alert description.
+
+    Args:
+        description: Alert description
+
+    Returns:
+        Read-only mapping of label names to values
+    """
+    if not description:
+        return MappingProxyType({})
+    return scan_description(description)[1]
+
+
+def _build_alert_info(url: Optional[str], labels: Mapping[str, str]) -> AlertInfo:
+    """Build AlertInfo from the health check URL and labels."""
+    if url is None:
         raise ValueError("Could not find URL in description")
-    
-    url = url_match.group(1)
+
     service_name = extract_service_from_url(url)
 
     if not service_name:
         raise ValueError(f"Could not extract service name from URL: {url}")
-    
-    service_name = service_name_to_repo_map.get(service_name, service_name)
-    
-    # Extract other information from labels
-    environment = labels.get('group', 'unknown')
-    domain = labels.get('host', 'unknown')
-    cluster = labels.get('k8s_cluster_name', 'unknown')
-    
+
+    service_name = repo_map.resolve(service_name)
+
     return AlertInfo(
         service_name=service_name,
-        environment=environment,
-        domain=domain,
+        environment=labels.get('group', 'unknown'),
+        domain=labels.get('host', 'unknown'),
         health_endpoint=url,
-        cluster=cluster,
-    ) 
\ No newline at end of file
+        cluster=labels.get('k8s_cluster_name', 'unknown'),
+        labels=labels,
+    )
+
+
+def parse_alert(description: str) -> AlertInfo:
+    """Parse alert information and all labels from description.
+
+    Args:
+        description: Alert description
+
+    Returns:
+        AlertInfo object with extracted information and all labels
+
+    Raises:
+        ValueError: If required information cannot be extracted
+    """
+    url, labels = scan_description(description)
+    return _build_alert_info(url, labels)
+
+
+def parse_alert_info(description: str, labels: dict[str, str]) -> AlertInfo:
+    """Parse alert information from description and labels.
+
+    Args:
+        description: Alert description
+        labels: Alert labels
+
+    Returns:
+        AlertInfo object with extracted information
+
+    Raises:
+        ValueError: If required information cannot be extracted
+    """
+    url_match = URL_PATTERN.search(description)
+    return _build_alert_info(url_match.group(1) if url_match else None, labels)
@@ -0,0 +1,111 @@
+"""Micro-benchmark of alert description parsing.
+
+Compares the precompiled parser with the previous implementation (label loop
+from the handler followed by `parse_alert_info` re-scanning the description
+with patterns looked up at call time) on large Grafana descriptions. The
+"cold" run bypasses the description cache, the "cached" run is what the
+second parse of the same event (routing, then handler) costs.
+
+Run from `src/`:
+
+    python -m utils.alert_parser_bench
+"""
+import argparse
+import re
+import timeit
+from typing import Optional
+from urllib.parse import urlparse
+
+from utils.alert_parser import AlertInfo, _build_alert_info, parse_alert, scan_description
+
+
+def legacy_extract_service_from_url(url: str) -> Optional[str]:
+    """Previous service extraction with three patterns per call."""
+    url = url.rstrip('/')
+    path = urlparse(url).path
+    patterns = [
+        r'/-/health/([^/]+)/?$',
+        r'/health/([^/]+)/?$',
+        r'/_health/([^/]+)/?$',
+    ]
+    for pattern in patterns:
+        if match := re.search(pattern, path):
+            return match.group(1)
+    return None
+
+
+def legacy_parse(description: str) -> tuple[str, dict[str, str]]:
+    """Previous label loop and URL parsing."""
+    labels_section = False
+    labels: dict[str, str] = {}
+    for line in description.split('\n'):
+        if line.strip() == "Labels:":
+            labels_section = True
+            continue
+        if labels_section and line.startswith("- "):
+            try:
+                key, value = line.replace("- ", "").split(" = ")
+                labels[key.strip()] = value.strip()
+            except ValueError:
+                continue
+        elif labels_section and not line.startswith("- "):
+            break
+
+    url_match = re.search(r'URL (https?://[^\s,]+)', description)
+    if not url_match:
+        raise ValueError("Could not find URL in description")
+    service_name = legacy_extract_service_from_url(url_match.group(1))
+    if not service_name:
+        raise ValueError("Could not extract service name")
+    return service_name, labels
+
+
+def cold_parse(description: str) -> AlertInfo:
+    """Parse without the description cache."""
+    url, labels = scan_description.__wrapped__(description)
+    return _build_alert_info(url, labels)
+
+
+def make_description(labels_count: int, annotations_count: int) -> str:
+    """Build a Grafana-like description with many labels and annotations."""
+    lines = [
+        "Alerts Firing:",
+        "",
+        "- Message: URL https://report.improvado.io/-/health/report-loader-db/, already crashed for 10m",
+        "",
+        "Labels:",
+        "- alertname = HealthCheckIsNot200",
+        "- group = production",
+        "- host = report.improvado.io",
+        "- k8s_cluster_name = lisbon",
+    ]
+    lines.extend(f"- label_{i} = value-{i}-{'x' * 20}" for i in range(labels_count))
+    lines.append("Annotations:")
+    lines.extend(f"- annotation_{i} = {'lorem ipsum ' * 8}" for i in range(annotations_count))
+    lines.append("Source: https://grafana.ops.improvado.io/alerting/grafana/abc/view")
+    return "\n".join(lines)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--labels", type=int, default=200, help="Number of extra labels")
+    parser.add_argument("--annotations", type=int, default=50, help="Number of annotations")
+    parser.add_argument("--number", type=int, default=2000, help="Parses per measurement")
+    parser.add_argument("--repeat", type=int, default=5, help="Measurements, best one is used")
+    args = parser.parse_args()
+
+    description = make_description(args.labels, args.annotations)
+    info = parse_alert(description)
+    assert legacy_parse(description) == (info.service_name, dict(info.labels))
+
+    print(f"{len(description)} bytes, {args.labels + 4} labels")
+    results = {}
+    for name, func in (("legacy", legacy_parse), ("cold", cold_parse), ("cached", parse_alert)):
+        best = min(timeit.repeat(lambda: func(description), number=args.number, repeat=args.repeat))
+        results[name] = best / args.number * 1e6
+        speedup = results["legacy"] / results[name]
+        print(f"{name:>8}: {results[name]:8.2f} us/parse {speedup:8.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -2,7 +2,13 @@ from typing import Any
 
 import pytest
 
-from alert_parser import AlertInfo, extract_service_from_url, parse_alert_info
+from alert_parser import (
+    AlertInfo,
+    extract_labels,
+    extract_service_from_url,
+    parse_alert,
+    parse_alert_info,
+)
 
 
 # Test data constants
@@ -182,4 +188,66 @@ def test_parse_alert_info_missing_labels(empty_labels: dict[str, str]) -> None:
 @pytest.mark.parametrize("url,service", URL_VARIATIONS)
 def test_url_format_variations(url: str, service: str) -> None:
     """Test different URL format variations."""
-    assert extract_service_from_url(url) == service 
\ No newline at end of file
+    assert extract_service_from_url(url) == service 
+
+
+def test_alert_info_is_frozen(alert_info: AlertInfo) -> None:
+    """Test that AlertInfo cannot be modified."""
+    with pytest.raises(AttributeError):
+        alert_info.service_name = "other"  # type: ignore
+
+
+def test_parse_alert_single_pass(sample_description: str) -> None:
+    """Test parsing of URL, service and all labels from description."""
+    info = parse_alert(sample_description)
+
+    assert info.service_name == "report-loader-db"
+    assert info.environment == "production"
+    assert info.domain == "report.improvado.io"
+    assert info.health_endpoint == "https://report.improvado.io/-/health/report-loader-db/"
+    assert info.cluster == "lisbon"
+    assert len(info.labels) == 15
+    assert info.labels["alertname"] == "HealthCheckIsNot200"
+    assert info.labels["doc"] == "https://www.notion.so/improvado-home/Health-Check-Devs-ae872f0f8fd448ad98879f86efd81b57"
+    assert info.labels["tags"] == "lisbon,production,report.improvado.io"
+    with pytest.raises(TypeError):
+        info.labels["group"] = "staging"  # type: ignore
+
+
+def test_parse_alert_matches_parse_alert_info(
+    sample_description: str, sample_labels: dict[str, str]
+) -> None:
+    """Test that both parsers extract the same information."""
+    single_pass = parse_alert(sample_description)
+    with_labels = parse_alert_info(sample_description, extract_labels(sample_description))
+
+    assert str(single_pass) == str(with_labels)
+    assert single_pass.labels == with_labels.labels
+
+
+def test_parse_alert_url_after_labels() -> None:
+    """Test that URL after the labels section is found."""
+    description = "Labels:\n- group = staging\n\nURL https://example.com/health/late-service/"
+    info = parse_alert(description)
+
+    assert info.service_name == "late-service"
+    assert info.environment == "staging"
+
+
+def test_parse_alert_missing_url() -> None:
+    """Test handling of description without URL."""
+    with pytest.raises(ValueError, match="Could not find URL in description"):
+        parse_alert("Labels:\n- group = production")
+
+
+def test_extract_labels_skips_malformed_lines() -> None:
+    """Test that label lines without separator are skipped."""
+    description = "Labels:\n- alertname = Disk\n- broken line\n- team = devops\nAnnotations:\n- summary = x"
+
+    assert extract_labels(description) == {"alertname": "Disk", "team": "devops"}
+
+
+def test_extract_labels_empty() -> None:
+    """Test that empty description has no labels."""
+    assert extract_labels(None) == {}
+    assert extract_labels("") == {}
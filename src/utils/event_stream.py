@@ -0,0 +1,225 @@
+import codecs
+import json
+import re
+from typing import Any, AsyncIterable, AsyncIterator, Optional, Union
+
+WHITESPACE = " \t\r\n"
+# Characters that change the nesting of an object outside and inside strings
+STRUCTURAL_PATTERN = re.compile(r'["{}\[\]]')
+STRING_END_PATTERN = re.compile(r'["\\]')
+# Characters ending a number or literal array item
+SCALAR_END_PATTERN = re.compile(r'[,\]\s]')
+
+
+class StreamFormatError(ValueError):
+    """Raised when a stream is neither a JSON array nor NDJSON."""
+
+
+class _ObjectScanner:
+    """Finds where a JSON object, array or string ends, resuming the last scan.
+
+    Only brackets and strings are tracked, so an object arriving in many
+    chunks is scanned once in total instead of being decoded again from its
+    start on every chunk.
+    """
+
+    __slots__ = ("pos", "depth", "in_string")
+
+    def __init__(self, start: int) -> None:
+        self.pos = start
+        self.depth = 0
+        self.in_string = False
+
+    def scan(self, buffer: str) -> Optional[int]:
+        """Get the end of the value, None if the buffer ends before it."""
+        while True:
+            if self.in_string:
+                match = STRING_END_PATTERN.search(buffer, self.pos)
+                if match is None:
+                    self.pos = len(buffer)
+                    return None
+                if match.group() == "\\":
+                    if match.end() == len(buffer):
+                        # Escaped character is in the next chunk
+                        self.pos = match.start()
+                        return None
+                    self.pos = match.end() + 1
+                    continue
+                self.in_string = False
+                self.pos = match.end()
+                if self.depth == 0:
+                    return self.pos
+                continue
+
+            match = STRUCTURAL_PATTERN.search(buffer, self.pos)
+            if match is None:
+                self.pos = len(buffer)
+                return None
+            self.pos = match.end()
+            char = match.group()
+            if char == '"':
+                self.in_string = True
+            elif char in "{[":
+                self.depth += 1
+            else:
+                self.depth -= 1
+                if self.depth == 0:
+                    return self.pos
+
+
+async def iter_json_documents(
+    chunks: AsyncIterable[bytes],
+    max_document_size: int = 1024 * 1024,
+) -> AsyncIterator[Union[bytes, Any]]:
+    """Yield documents of a JSON array or NDJSON stream as soon as they are complete.
+
+    Only the document being decoded is kept in memory. NDJSON lines are
+    yielded as raw bytes, so they can be validated without an intermediate
+    copy; JSON array items are yielded decoded. An array item that is not
+    valid JSON is yielded as raw bytes too, so validation reports it like a
+    malformed NDJSON line and the items after it are still read; items that
+    are not objects are left to validation the same way.
+
+    Args:
+        chunks: Body chunks
+        max_document_size: Maximum size of a single document
+
+    Yields:
+        Raw NDJSON lines or decoded array items
+
+    Raises:
+        StreamFormatError: If the array structure is malformed or a document
+            is too large
+    """
+    iterator = chunks.__aiter__()
+    head = b""
+    async for chunk in iterator:
+        head += chunk
+        if head.lstrip(b" \t\r\n\xef\xbb\xbf"):
+            break
+
+    head = head.lstrip(b" \t\r\n\xef\xbb\xbf")
+    if not head:
+        return
+
+    if head.startswith(b"["):
+        async for document in _iter_array(head, iterator, max_document_size):
+            yield document
+    else:
+        async for line in _iter_lines(head, iterator, max_document_size):
+            yield line
+
+
+async def _iter_lines(
+    head: bytes,
+    chunks: AsyncIterator[bytes],
+    max_document_size: int,
+) -> AsyncIterator[bytes]:
+    """Yield non-empty lines of an NDJSON stream."""
+    buffer = head
+    while True:
+        start = 0
+        while (end := buffer.find(b"\n", start)) != -1:
+            line = buffer[start:end].strip()
+            if line:
+                yield line
+            start = end + 1
+        buffer = buffer[start:]
+
+        if len(buffer) > max_document_size:
+            raise StreamFormatError(f"Document exceeds {max_document_size} bytes")
+
+        try:
+            buffer += await chunks.__anext__()
+        except StopAsyncIteration:
+            break
+
+    line = buffer.strip()
+    if line:
+        yield line
+
+
+async def _iter_array(
+    head: bytes,
+    chunks: AsyncIterator[bytes],
+    max_document_size: int,
+) -> AsyncIterator[Any]:
+    """Yield items of a JSON array."""
+    decoder = json.JSONDecoder()
+    text_decoder = codecs.getincrementaldecoder("utf-8")()
+    buffer = text_decoder.decode(head)[1:]  # drop "["
+    expect_value = True
+    first = True
+    finished = False
+    scanner: Optional[_ObjectScanner] = None
+
+    while True:
+        pos = 0
+        while True:
+            while pos < len(buffer) and buffer[pos] in WHITESPACE:
+                pos += 1
+            if pos == len(buffer):
+                break
+
+            char = buffer[pos]
+            if expect_value:
+                if first and char == "]":
+                    finished = True
+                    pos += 1
+                    break
+                if char in '{["':
+                    if scanner is None:
+                        scanner = _ObjectScanner(pos)
+                    end = scanner.scan(buffer)
+                    if end is None:
+                        # Item is not complete yet, wait for more data
+                        break
+                    scanner = None
+                else:
+                    match = SCALAR_END_PATTERN.search(buffer, pos)
+                    if match is None:
+                        # Number or literal may continue in the next chunk
+                        break
+                    end = match.start()
+                    if end == pos:
+                        raise StreamFormatError("Missing array item")
+                try:
+                    document, parsed_end = decoder.raw_decode(buffer, pos)
+                    if parsed_end != end:
+                        raise ValueError("Object ends before its closing bracket")
+                except ValueError:
+                    # Complete but malformed, the next item starts after its closing bracket
+                    document = buffer[pos:end].encode()
+                yield document
+                pos = end
+                expect_value = False
+                first = False
+            elif char == ",":
+                expect_value = True
+                pos += 1
+            elif char == "]":
+                finished = True
+                pos += 1
+                break
+            else:
+                raise StreamFormatError(f"Unexpected character {char!r} between array items")
+
+        buffer = buffer[pos:]
+        if scanner is not None:
+            scanner.pos -= pos
+        if finished:
+            async for chunk in chunks:
+                buffer += text_decoder.decode(chunk)
+                if buffer.strip(WHITESPACE):
+                    break
+                buffer = ""
+            if buffer.strip(WHITESPACE):
+                raise StreamFormatError("Unexpected data after the end of array")
+            return
+        if len(buffer) > max_document_size:
+            raise StreamFormatError(f"Document exceeds {max_document_size} bytes")
+
+        try:
+            buffer += text_decoder.decode(await chunks.__anext__())
+        except StopAsyncIteration:
+            raise StreamFormatError("Unexpected end of JSON array") from None
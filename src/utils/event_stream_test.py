@@ -0,0 +1,98 @@
+import json
+from typing import Any, AsyncIterator, Iterable
+
+import pytest
+
+from utils.event_stream import StreamFormatError, iter_json_documents
+
+
+async def chunked(data: bytes, size: int) -> AsyncIterator[bytes]:
+    """Yield data in chunks of the given size."""
+    for start in range(0, len(data), size):
+        yield data[start:start + size]
+
+
+async def collect(chunks: AsyncIterator[bytes], **kwargs: Any) -> list[Any]:
+    """Collect all documents of a stream."""
+    return [document async for document in iter_json_documents(chunks, **kwargs)]
+
+
+DOCUMENTS = [{"id": i, "text": "ü, ] }" * i} for i in range(5)]
+
+
+@pytest.mark.parametrize("size", [1, 3, 1024])
+@pytest.mark.asyncio
+async def test_array(size: int) -> None:
+    """Test that array items are decoded across chunk boundaries."""
+    data = json.dumps(DOCUMENTS, ensure_ascii=False, indent=1).encode()
+
+    assert await collect(chunked(data, size)) == DOCUMENTS
+
+
+@pytest.mark.parametrize("size", [1, 7, 1024])
+@pytest.mark.asyncio
+async def test_ndjson(size: int) -> None:
+    """Test that NDJSON lines are yielded raw, skipping blank lines."""
+    lines: Iterable[bytes] = (json.dumps(d, ensure_ascii=False).encode() for d in DOCUMENTS)
+    data = b"\n\n".join(lines)
+
+    documents = await collect(chunked(data, size))
+
+    assert [json.loads(d) for d in documents] == DOCUMENTS
+
+
+@pytest.mark.parametrize("data", [b"", b"  \n", b"[]", b" [ ] "])
+@pytest.mark.asyncio
+async def test_empty(data: bytes) -> None:
+    """Test empty streams."""
+    assert await collect(chunked(data, 1)) == []
+
+
+@pytest.mark.parametrize("data", [
+    b'[{"id": 1}',
+    b'[{"id": 1} {"id": 2}]',
+    b'[{"id": 1},]',
+    b'[1, 2',
+    b'[{"id": 1}] trailing',
+])
+@pytest.mark.asyncio
+async def test_malformed_array(data: bytes) -> None:
+    """Test that malformed arrays stop the stream."""
+    with pytest.raises(StreamFormatError):
+        await collect(chunked(data, 4))
+
+
+@pytest.mark.asyncio
+async def test_document_too_large() -> None:
+    """Test that a document over the size limit stops the stream."""
+    data = json.dumps([{"text": "x" * 100}]).encode()
+
+    with pytest.raises(StreamFormatError):
+        await collect(chunked(data, 8), max_document_size=50)
+
+
+@pytest.mark.parametrize("size", [1, 5, 1024])
+@pytest.mark.asyncio
+async def test_array_malformed_item(size: int) -> None:
+    """Test that a malformed item is yielded raw and the items after it decoded."""
+    data = b'[{"id": 1}, {"id": 2 "text": "}, \\" ]"}, {"id": tru, "x": [1]}, {"id": 3}]'
+
+    documents = await collect(chunked(data, size))
+
+    assert documents == [
+        {"id": 1},
+        b'{"id": 2 "text": "}, \\" ]"}',
+        b'{"id": tru, "x": [1]}',
+        {"id": 3},
+    ]
+
+
+@pytest.mark.parametrize("size", [1, 5, 1024])
+@pytest.mark.asyncio
+async def test_array_non_object_items(size: int) -> None:
+    """Test that items other than objects are yielded for validation to reject."""
+    data = b'[1, {"id": 1}, "a, ]\\"", [2, {"x": "]"}], null, tru, -1.5e3, {"id": 2}]'
+
+    documents = await collect(chunked(data, size))
+
+    assert documents == [1, {"id": 1}, 'a, ]"', [2, {"x": "]"}], None, b"tru", -1500.0, {"id": 2}]